@@ -1,6 +1,10 @@
-﻿import streamlit as st
+﻿from contextlib import nullcontext
+
+import streamlit as st
 from src.styles import inject_styles
 from src.dashboard import main
+from src.config import MEMORY_PROFILE
+from src.metrics import track_rerun
 
 st.set_page_config(
     page_title="Opponent Difficulty Dashboard",
@@ -10,4 +14,10 @@ st.set_page_config(
 )
 
 inject_styles()
-main()
+if MEMORY_PROFILE:
+    from src.memory_profile import profile_memory
+else:
+    profile_memory = nullcontext
+
+with track_rerun(), profile_memory():
+    main()
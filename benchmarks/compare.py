@@ -0,0 +1,48 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+
+import argparse
+import json
+
+import pandas as pd
+
+
+def load_results(path):
+    with open(path) as f:
+        payload = json.load(f)
+    return pd.DataFrame(payload["results"]).assign(commit=payload["commit"])
+
+
+def compare_results(base_path, head_path):
+    """
+    Join two result files on function and scale.
+
+    Returns:
+        DataFrame with base/head time and peak memory and their ratios
+        (head / base, so values above 1 are regressions)
+    """
+    base = load_results(base_path)
+    head = load_results(head_path)
+    merged = base.merge(head, on=["function", "scale"], suffixes=("_base", "_head"))
+
+    merged["time_ratio"] = merged["seconds_head"] / merged["seconds_base"]
+    merged["memory_ratio"] = merged["peak_mb_head"] / merged["peak_mb_base"]
+
+    return merged[[
+        "function", "scale",
+        "seconds_base", "seconds_head", "time_ratio",
+        "peak_mb_base", "peak_mb_head", "memory_ratio"
+    ]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    args = parser.parse_args()
+
+    print(compare_results(args.base, args.head).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
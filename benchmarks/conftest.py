@@ -0,0 +1,152 @@
+"""
+Pytest plumbing for the pipeline benchmarks.
+
+Run with:
+    python -m pytest benchmarks --bench-scales 1x,10x
+
+Rerun budgets are read from `--budget-file` (default `benchmarks/budgets.json`)
+and can be loosened for slower machines with `--budget-factor`.
+
+Each benchmark records its best wall time over `--bench-repeat` runs and the
+peak traced memory of one extra run. Results are printed at the end of the
+session and written to `<bench-output>/<commit>.json` for comparison with
+`python -m benchmarks.compare`.
+"""
+
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import SCALES, write_synthetic_data
+
+RESULTS_KEY = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-scales",
+        default="1x",
+        help=f"Comma-separated synthetic data scales to run ({', '.join(SCALES)})"
+    )
+    group.addoption(
+        "--bench-repeat",
+        type=int,
+        default=3,
+        help="Timed runs per benchmark (the fastest is reported)"
+    )
+    group.addoption(
+        "--budget-file",
+        default=str(Path(__file__).parent / "budgets.json"),
+        help="JSON file with per-interaction latency and memory budgets"
+    )
+    group.addoption(
+        "--budget-factor",
+        type=float,
+        default=1.0,
+        help="Multiplier applied to every budget (e.g. 2 on slower machines)"
+    )
+    group.addoption(
+        "--bench-output",
+        default="benchmarks/results",
+        help="Directory for the JSON results file"
+    )
+
+
+def pytest_configure(config):
+    config.stash[RESULTS_KEY] = []
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        scales = [s.strip() for s in metafunc.config.getoption("--bench-scales").split(",") if s.strip()]
+        unknown = set(scales) - set(SCALES)
+        if unknown:
+            raise pytest.UsageError(f"Unknown benchmark scale(s): {', '.join(sorted(unknown))}")
+        metafunc.parametrize("scale", scales, scope="session")
+
+
+@pytest.fixture(scope="session")
+def data_paths(scale, tmp_path_factory):
+    """Synthetic fixture and player CSV paths for the scale."""
+    return write_synthetic_data(tmp_path_factory.mktemp(f"data-{scale}"), scale)
+
+
+@pytest.fixture
+def measure(request, scale):
+    """
+    Time a call and record its peak memory.
+
+    Returns a function `measure(name, func, *args, **kwargs)` that returns the
+    result of the last call.
+    """
+    repeat = max(1, request.config.getoption("--bench-repeat"))
+    results = request.config.stash[RESULTS_KEY]
+
+    def run(name, func, *args, **kwargs):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Pivot stages return tuples of frames; report the first frame's size
+        sized = result[0] if isinstance(result, tuple) else result
+        results.append({
+            "function": name,
+            "scale": scale,
+            "seconds": min(timings),
+            "mean_seconds": sum(timings) / len(timings),
+            "peak_mb": peak / 2**20,
+            "rows": len(sized) if hasattr(sized, "__len__") else None
+        })
+        return result
+
+    return run
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash.get(RESULTS_KEY, [])
+    if not results:
+        return
+
+    table = pd.DataFrame(results)[["function", "scale", "seconds", "peak_mb", "rows"]]
+    terminalreporter.section("pipeline benchmarks")
+    terminalreporter.write_line(table.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    commit = _git_commit()
+    out_dir = Path(config.getoption("--bench-output"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{commit}.json"
+    out_path.write_text(json.dumps({
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "results": results
+    }, indent=2))
+    terminalreporter.write_line(f"Results written to {out_path}")
@@ -0,0 +1,65 @@
+"""
+Cold import cost of the dashboard, measured with `python -X importtime`.
+
+Usage:
+    python -m benchmarks.import_time            # import src.dashboard
+    python -m benchmarks.import_time --top 20   # show the 20 slowest modules
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure_import(module="src.dashboard"):
+    """
+    Import a module in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        Dictionary mapping each imported module to a
+        (self_seconds, cumulative_seconds) tuple
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+
+    return timings
+
+
+def imported_modules(module="src.dashboard"):
+    """Set of module names loaded after importing `module` in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return set(completed.stdout.split())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold import time")
+    parser.add_argument("--module", default="src.dashboard")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    timings = measure_import(args.module)
+    print(f"{args.module}: {timings[args.module][1] * 1000:.0f} ms cumulative")
+    print(f"{'module':<60}{'self ms':>10}{'cumulative ms':>15}")
+    for name, (self_s, cumulative_s) in sorted(timings.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{name:<60}{self_s * 1000:>10.1f}{cumulative_s * 1000:>15.1f}")
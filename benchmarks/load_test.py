@@ -0,0 +1,214 @@
+"""
+Concurrent-session load test for the dashboard.
+
+Drives `app.py` through Streamlit's AppTest in many parallel simulated
+sessions, all inside one process so they share the data caches like sessions
+on a single Streamlit server do. Each session runs a scripted interaction
+(change competition, select gameweeks, pick a cohesion team, change cohesion
+positions, save a new SOI weight) and every rerun is timed.
+
+AgGrid row selection and `st.dataframe` row selection cannot be driven by
+AppTest, so the scripts cover the widgets that can.
+
+Usage:
+    python -m benchmarks.load_test --sessions 8 --iterations 3
+    python -m benchmarks.load_test --data synthetic --scale 10x --sessions 16
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_data import SCALES, write_synthetic_data
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+BUNDLED_DATA_PATH = APP_PATH.parent / "data" / "Calculated Opponent Difficulty.csv"
+BUNDLED_PLAYER_DATA_PATH = APP_PATH.parent / "data" / "Player_Metrics.csv"
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # ru_maxrss is KB on Linux and bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 2**20 if os.uname().sysname == "Darwin" else rss / 2**10
+
+
+class RssSampler(threading.Thread):
+    """Background thread recording the peak RSS while the load test runs."""
+
+    def __init__(self, interval=0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_mb = current_rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _widget(at, kind, label=None, key=None):
+    """Find a widget by label or key, or None if it is not rendered."""
+    for widget in getattr(at, kind):
+        if (key is not None and widget.key == key) or (label is not None and widget.label == label):
+            return widget
+    return None
+
+
+def run_session(session_id, iterations, timeout):
+    """
+    Run one simulated scout session.
+
+    Returns:
+        List of (step, seconds) tuples, one per rerun
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    timings = []
+
+    def timed(step, action=None):
+        start = time.perf_counter()
+        if action is not None:
+            action()
+        at.run(timeout=timeout)
+        timings.append((step, time.perf_counter() - start))
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    timed("initial_load")
+
+    for _ in range(iterations):
+        competition = _widget(at, "selectbox", label="🏆 Sorare Competition")
+        if competition is not None:
+            timed("change_competition", lambda: competition.select(rng.choice(competition.options)))
+
+        gameweeks = _widget(at, "multiselect", label="📅 Gameweeks")
+        if gameweeks is not None and gameweeks.options:
+            # Options are the formatted "GW <n>" labels; the widget values are ints
+            options = [int(option.split()[-1]) for option in gameweeks.options]
+            start = rng.randrange(len(options))
+            selection = options[start:start + rng.randint(1, 8)]
+            timed("select_gameweeks", lambda: gameweeks.set_value(selection))
+
+        primary_team = _widget(at, "selectbox", key="cohesion_primary_team")
+        if primary_team is not None and primary_team.options:
+            timed("pick_cohesion_team", lambda: primary_team.select(rng.choice(primary_team.options)))
+
+        positions = _widget(at, "multiselect", key="cohesion_positions")
+        if positions is not None and positions.options:
+            chosen = rng.sample(positions.options, rng.randint(1, len(positions.options)))
+            timed("change_cohesion_positions", lambda: positions.set_value(chosen))
+
+        weight = _widget(at, "slider", label="L5 Form Weight")
+        save = _widget(at, "button", label="💾 Save Weights")
+        if weight is not None and save is not None:
+            value = rng.choice([0.0, 0.1, 0.2, 0.3, 0.4])
+            timed("move_soi_slider", lambda: (weight.set_value(value), save.click()))
+
+    if at.exception:
+        raise RuntimeError(f"Session {session_id} raised: {at.exception[0].value}")
+
+    return timings
+
+
+def summarize(timings):
+    """Latency percentiles in milliseconds per step and overall."""
+    by_step = {}
+    for step, seconds in timings:
+        by_step.setdefault(step, []).append(seconds * 1000)
+    by_step["all"] = [seconds * 1000 for _, seconds in timings]
+
+    return {
+        step: {
+            "count": len(values),
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "p99_ms": float(np.percentile(values, 99)),
+            "max_ms": float(np.max(values))
+        }
+        for step, values in by_step.items()
+    }
+
+
+def run_load_test(sessions, iterations, timeout=300):
+    """
+    Run simulated sessions in parallel against the configured data files.
+
+    Returns:
+        Dictionary with per-step latency percentiles and RSS figures
+    """
+    sampler = RssSampler()
+    sampler.start()
+    start_rss = current_rss_mb()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda i: run_session(i, iterations, timeout), range(sessions)))
+
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "wall_seconds": elapsed,
+        "rss_start_mb": start_rss,
+        "rss_peak_mb": sampler.peak_mb,
+        "rss_end_mb": current_rss_mb(),
+        "latency": summarize([t for session in results for t in session])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard")
+    parser.add_argument("--sessions", type=int, default=8, help="Parallel simulated sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="Interaction rounds per session")
+    parser.add_argument("--data", choices=["bundled", "synthetic"], default="bundled")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1x", help="Synthetic data scale")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per rerun")
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    # config.py reads the data paths from the environment at import time
+    if args.data == "synthetic":
+        fixture_path, player_path = write_synthetic_data(tempfile.mkdtemp(prefix="soiboy-load-"), args.scale)
+    else:
+        fixture_path, player_path = BUNDLED_DATA_PATH, BUNDLED_PLAYER_DATA_PATH
+    os.environ["DATA_PATH"] = str(fixture_path)
+    os.environ["PLAYER_DATA_PATH"] = str(player_path)
+
+    report = run_load_test(args.sessions, args.iterations, args.timeout)
+
+    print(f"{report['sessions']} sessions x {report['iterations']} iterations in {report['wall_seconds']:.1f}s")
+    print(f"RSS: start {report['rss_start_mb']:.0f} MB, peak {report['rss_peak_mb']:.0f} MB, end {report['rss_end_mb']:.0f} MB")
+    print(f"{'step':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for step, stats in report["latency"].items():
+        print(
+            f"{step:<28}{stats['count']:>7}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}"
+            f"{stats['p99_ms']:>10.0f}{stats['max_ms']:>10.0f}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Deterministic synthetic data for benchmarking the dashboard pipeline.
+
+Generates CSVs with the same schema as `Calculated Opponent Difficulty.csv`
+and `Player_Metrics.csv` for a configurable number of leagues, teams and
+gameweeks. The same arguments and seed always produce identical files.
+
+Usage:
+    python -m benchmarks.synthetic_data --scale 10x --out data/synthetic
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import SORARE_COMPETITION_MAPPING
+
+POSITIONS = ["Goalkeeper", "Defender", "Midfielder", "Forward"]
+
+# Scale presets relative to the bundled dataset (~26k fixture rows)
+SCALES = {
+    "1x": {"n_leagues": 16, "teams_per_league": 18, "n_gameweeks": 24},
+    "10x": {"n_leagues": 160, "teams_per_league": 18, "n_gameweeks": 24},
+    "100x": {"n_leagues": 1600, "teams_per_league": 18, "n_gameweeks": 24},
+}
+
+FIRST_GAME_WEEK = 659
+START_DATE = pd.Timestamp("2026-02-20 15:00", tz="UTC")  # A Friday
+PLAYERS_PER_POSITION = 6
+
+
+def generate_fixture_data(n_leagues, teams_per_league, n_gameweeks, seed=0):
+    """
+    Generate fixture difficulty rows matching the real CSV schema.
+
+    Each league plays a shuffled round of fixtures every gameweek, so every
+    team has one fixture per gameweek and one row per position.
+
+    Args:
+        n_leagues: Number of leagues (competitions are reused cyclically)
+        teams_per_league: Number of teams per league (rounded down to even)
+        n_gameweeks: Number of gameweeks in the horizon
+        seed: Random seed
+
+    Returns:
+        DataFrame with the fixture CSV columns
+    """
+    rng = np.random.default_rng(seed)
+    teams_per_league -= teams_per_league % 2
+    competitions = list(SORARE_COMPETITION_MAPPING)
+
+    # Pair teams within each league for every gameweek
+    shuffled = rng.random((n_leagues, n_gameweeks, teams_per_league)).argsort(axis=2)
+    home = shuffled[:, :, 0::2]
+    away = shuffled[:, :, 1::2]
+
+    league_idx, gw_idx, _ = np.indices(home.shape)
+    league_idx = np.repeat(league_idx.ravel(), 2)
+    gw_idx = np.repeat(gw_idx.ravel(), 2)
+    team_idx = np.column_stack([home.ravel(), away.ravel()]).ravel()
+    opponent_idx = np.column_stack([away.ravel(), home.ravel()]).ravel()
+    is_home = np.tile([True, False], home.size)
+
+    team_ids = league_idx * teams_per_league + team_idx
+    opponent_ids = league_idx * teams_per_league + opponent_idx
+    team_names = np.array([f"Team {i:05d}" for i in range(n_leagues * teams_per_league)], dtype=object)
+    comp_names = np.array([competitions[i % len(competitions)] for i in range(n_leagues)], dtype=object)
+    comp_slugs = np.array([f"synthetic-league-{i}" for i in range(n_leagues)], dtype=object)
+
+    # Gameweeks alternate 4 and 3 days; matches kick off the day after the boundary
+    gw_offsets = np.cumsum([0] + [4 if g % 2 == 0 else 3 for g in range(n_gameweeks - 1)])
+    kickoff_hours = rng.integers(0, 48, size=len(team_ids) // 2).repeat(2)
+    dates = START_DATE + pd.to_timedelta(gw_offsets[gw_idx] + 1, unit="D") + pd.to_timedelta(kickoff_hours, unit="h")
+
+    ranking = (team_idx + 1).astype(float)
+    fixtures = pd.DataFrame({
+        "Name": team_names[team_ids],
+        "name (upcomingGames.competition)": comp_names[league_idx],
+        "Comp_Slug": comp_slugs[league_idx],
+        "Game Week": (FIRST_GAME_WEEK + gw_idx).astype(float),
+        "Date": dates.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "Domestic League Ranking": ranking,
+        "Location": np.where(is_home, "Home", "Away"),
+        "Opponent": team_names[opponent_ids],
+        "MaxDomesticLeagueRanking": float(teams_per_league),
+    })
+
+    # One row per position; stronger opponents concede lower scores, like the real data
+    fixtures = fixtures.loc[fixtures.index.repeat(len(POSITIONS))].reset_index(drop=True)
+    fixtures["Position"] = np.tile(POSITIONS, len(fixtures) // len(POSITIONS))
+
+    opponent_strength = (teams_per_league - opponent_idx.repeat(len(POSITIONS))) / teams_per_league
+    base = 60 - 25 * opponent_strength + 3 * is_home.repeat(len(POSITIONS))
+    fixtures["Score_mean"] = base + rng.normal(0, 4, len(fixtures))
+    fixtures["Score_median"] = fixtures["Score_mean"] - rng.gamma(2, 1.5, len(fixtures))
+
+    return fixtures
+
+
+def generate_player_data(fixture_df, seed=0):
+    """
+    Generate player metrics rows matching the real player CSV schema.
+
+    Args:
+        fixture_df: Output of generate_fixture_data (provides clubs)
+        seed: Random seed
+
+    Returns:
+        DataFrame with the player metrics CSV columns
+    """
+    rng = np.random.default_rng(seed + 1)
+    clubs = np.sort(fixture_df["Name"].unique())
+
+    club = np.repeat(clubs, len(POSITIONS) * PLAYERS_PER_POSITION)
+    position = np.tile(np.repeat(POSITIONS, PLAYERS_PER_POSITION), len(clubs))
+    n_players = len(club)
+
+    l15_avg = rng.uniform(20, 70, n_players)
+    l15_mins = rng.uniform(0, 1350, n_players)
+
+    return pd.DataFrame({
+        "displayName": [f"Player {i:07d}" for i in range(n_players)],
+        "Club": club,
+        "Position": position,
+        "averageScore": l15_avg + rng.normal(0, 3, n_players),
+        "Mean_Opp_Score": rng.uniform(35, 60, n_players),
+        "Median_Opp_Score": rng.uniform(35, 60, n_players),
+        "Count": rng.integers(1, 6, n_players),
+        "Last_5_Score_Running_Avg": np.clip(l15_avg + rng.normal(0, 8, n_players), 0, 100),
+        "Last_15_Score_Running_Avg": l15_avg,
+        "Last_5_Mins_Played_Running_Sum": np.clip(l15_mins / 3 + rng.normal(0, 60, n_players), 0, 450),
+        "Last_15_Mins_Played_Running_Sum": l15_mins,
+    })
+
+
+def write_synthetic_data(out_dir, scale="1x", seed=0):
+    """
+    Write a fixture CSV and a player metrics CSV for a scale preset.
+
+    Args:
+        out_dir: Directory to write into (created if missing)
+        scale: Key of SCALES
+        seed: Random seed
+
+    Returns:
+        Tuple of (fixture_path, player_path)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    fixture_df = generate_fixture_data(seed=seed, **SCALES[scale])
+    player_df = generate_player_data(fixture_df, seed=seed)
+
+    fixture_path = out_dir / "Calculated Opponent Difficulty.csv"
+    player_path = out_dir / "Player_Metrics.csv"
+    fixture_df.to_csv(fixture_path, index=False)
+    player_df.to_csv(player_path, index=False)
+
+    return fixture_path, player_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic dashboard data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1x")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="data/synthetic")
+    args = parser.parse_args()
+
+    for path in write_synthetic_data(args.out, args.scale, args.seed):
+        print(path)
@@ -0,0 +1,90 @@
+"""
+Background refresh of the data files: the watcher warms the cache entries
+sessions read, so the first session after a refresh hits the cache.
+"""
+
+from functools import partial
+
+import pytest
+
+import src.shards
+from benchmarks.synthetic_data import generate_fixture_data, generate_player_data
+from src.competitions import default_sorare_competition, load_competition_mapping
+from src.config import COMPETITION_MAPPING_PATH
+from src.data_refresh import get_data_version, refresh_changed_files, start_data_watcher
+from src.metrics import render_metrics
+from src.shards import (
+    competition_sources,
+    load_fixture_shard,
+    load_fixture_shard_index,
+    load_player_shard,
+    refresh_fixture_shards,
+    refresh_player_shards
+)
+
+
+def _misses(function):
+    sample = f'dashboard_cache_misses_total{{function="{function}"}} '
+    for line in render_metrics().splitlines():
+        if line.startswith(sample):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def _session_load(fixture_path, player_path):
+    """Load the shards of the default competition the way a session does, with the published versions."""
+    version, player_version = get_data_version(fixture_path), get_data_version(player_path)
+    mapping_version = get_data_version(COMPETITION_MAPPING_PATH)
+    index = load_fixture_shard_index(fixture_path, version)
+    mapping = load_competition_mapping(COMPETITION_MAPPING_PATH, mapping_version)
+    sorare_competition = default_sorare_competition(sorted(competition_sources(index, mapping)))
+
+    load_fixture_shard(fixture_path, version, sorare_competition, mapping_version=mapping_version)
+    load_player_shard(player_path, player_version, fixture_path, version, sorare_competition, mapping_version=mapping_version)
+    return version
+
+
+LOADERS = ["load_fixture_shard_index", "load_player_shard_index", "load_fixture_shard", "load_player_shard"]
+
+
+@pytest.fixture
+def data_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.shards, "SHARD_CACHE_DIR", tmp_path / "shards")
+    fixture_df = generate_fixture_data(n_leagues=2, teams_per_league=4, n_gameweeks=4)
+    fixture_path = tmp_path / "Calculated Opponent Difficulty.csv"
+    player_path = tmp_path / "Player_Metrics.csv"
+    fixture_df.to_csv(fixture_path, index=False)
+    generate_player_data(fixture_df).to_csv(player_path, index=False)
+    return fixture_df, fixture_path, player_path
+
+
+def test_refresh_warms_the_entries_sessions_read(data_files):
+    fixture_df, fixture_path, player_path = data_files
+    old_version = _session_load(fixture_path, player_path)
+
+    # Registered with str paths; sessions pass Path objects
+    start_data_watcher(
+        {
+            str(fixture_path): partial(refresh_fixture_shards, player_path=player_path),
+            str(player_path): partial(refresh_player_shards, file_path=fixture_path)
+        },
+        interval=3600
+    )
+
+    pending = {}
+    fixture_df.iloc[:-8].to_csv(fixture_path, index=False)
+    # The first poll waits for the file to settle, the second publishes it
+    assert refresh_changed_files(pending) == []
+    assert refresh_changed_files(pending) == [fixture_path]
+
+    misses = {function: _misses(function) for function in LOADERS}
+    assert _session_load(fixture_path, player_path) != old_version
+    assert {function: _misses(function) for function in LOADERS} == misses
+
+    generate_player_data(fixture_df, seed=1).iloc[:-4].to_csv(player_path, index=False)
+    refresh_changed_files(pending)
+    assert refresh_changed_files(pending) == [player_path]
+
+    misses = {function: _misses(function) for function in LOADERS}
+    _session_load(fixture_path, player_path)
+    assert {function: _misses(function) for function in LOADERS} == misses
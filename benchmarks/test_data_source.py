@@ -0,0 +1,135 @@
+"""
+Downloads from an HTTP data source, against a local stand-in server.
+
+The server serves in-memory files with ETag and Last-Modified validators and
+records every response, so the tests can check that unchanged files are
+never downloaded again.
+"""
+
+import hashlib
+import os
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.data_source import FIXTURE_COLUMNS, download_data_file, refresh_from_source
+
+FIXTURE_CSV = (
+    ",".join(FIXTURE_COLUMNS) + "\n"
+    + "Team A,League,league-a,659.0,2026-02-21T16:00:00Z,3.0,Home,Team B,Defender,46.6,44.9\n"
+).encode()
+
+
+class StandInSource(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        body = server.files.get(self.path)
+        if body is None:
+            self._respond(404, b"")
+            return
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if server.validators and self.headers.get("If-None-Match") == etag:
+            self._respond(304, b"")
+            return
+
+        headers = {"ETag": etag, "Last-Modified": formatdate(usegmt=True)} if server.validators else {}
+        self._respond(200, body, headers)
+
+    def _respond(self, status, body, headers=()):
+        self.server.log.append((status, len(body), self.client_address[1]))
+        self.send_response(status)
+        for name, value in dict(headers).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def source():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSource)
+    server.files = {"/fixtures.csv": FIXTURE_CSV}
+    server.validators = True
+    server.log = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, name):
+    return f"http://127.0.0.1:{server.server_port}/{name}"
+
+
+def test_unchanged_file_is_not_downloaded(source, tmp_path):
+    path = tmp_path / "fixtures.csv"
+    assert download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    assert path.read_bytes() == FIXTURE_CSV
+    mtime = path.stat().st_mtime_ns
+
+    assert not download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    assert path.stat().st_mtime_ns == mtime
+    assert [(status, size) for status, size, _ in source.log] == [(200, len(FIXTURE_CSV)), (304, 0)]
+    # Both requests went over the same pooled connection
+    assert len({port for _, _, port in source.log}) == 1
+
+
+def test_changed_file_replaces_local_file(source, tmp_path):
+    path = tmp_path / "fixtures.csv"
+    download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+
+    changed = FIXTURE_CSV + FIXTURE_CSV.splitlines(keepends=True)[1].replace(b"Team A", b"Team C")
+    source.files["/fixtures.csv"] = changed
+    assert download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    assert path.read_bytes() == changed
+
+
+def test_same_content_without_validators_keeps_local_file(source, tmp_path):
+    source.validators = False
+    path = tmp_path / "fixtures.csv"
+    download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    mtime = path.stat().st_mtime_ns
+
+    assert not download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_file_replaced_by_hand_is_downloaded_again(source, tmp_path):
+    path = tmp_path / "fixtures.csv"
+    download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    path.write_bytes(b"edited by hand\n")
+
+    assert download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    assert path.read_bytes() == FIXTURE_CSV
+    assert [status for status, _, _ in source.log] == [200, 200]
+
+
+def test_invalid_file_keeps_local_file(source, tmp_path):
+    path = tmp_path / "fixtures.csv"
+    download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+
+    source.files["/fixtures.csv"] = b"Name,Date\nTeam A,2026-02-21\n"
+    with pytest.raises(ValueError, match="missing columns"):
+        download_data_file(_url(source, "fixtures.csv"), path, FIXTURE_COLUMNS)
+    assert path.read_bytes() == FIXTURE_CSV
+    # No temporary file is left behind
+    assert sorted(os.listdir(tmp_path)) == [".fixtures.csv.source.json", "fixtures.csv"]
+
+
+def test_refresh_from_source_skips_failures(source, tmp_path):
+    sources = {
+        tmp_path / "fixtures.csv": (_url(source, "fixtures.csv"), FIXTURE_COLUMNS),
+        tmp_path / "missing.csv": (_url(source, "missing.csv"), FIXTURE_COLUMNS)
+    }
+    assert refresh_from_source(sources) == [tmp_path / "fixtures.csv"]
+    assert not (tmp_path / "missing.csv").exists()
@@ -0,0 +1,68 @@
+"""
+Incremental reload of a refreshed fixture file against a full load.
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import generate_fixture_data
+from src.competitions import COMPETITION_NAME_COLUMN
+from src.data import (
+    load_fixture_data,
+    load_and_prepare_data,
+    calculate_gameweeks,
+    calculate_congestion,
+    prepare_ranking_display
+)
+
+
+@pytest.fixture
+def fixture_df():
+    return generate_fixture_data(n_leagues=3, teams_per_league=4, n_gameweeks=5)
+
+
+def _full_load(file_path):
+    return calculate_congestion(prepare_ranking_display(calculate_gameweeks(load_and_prepare_data(file_path))))
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def _reload(file_path, old_df, new_df, caplog):
+    old_df.to_csv(file_path, index=False)
+    load_fixture_data.__wrapped__(file_path, "old")
+    new_df.to_csv(file_path, index=False)
+    with caplog.at_level(logging.INFO, logger="src.data"):
+        return load_fixture_data.__wrapped__(file_path, "new")
+
+
+def test_patched_rows_match_full_load(fixture_df, tmp_path, caplog):
+    file_path = tmp_path / "fixtures.csv"
+    new_df = fixture_df.copy()
+    # Changed scores, a new competition and a team whose fixtures disappear
+    new_df.loc[new_df.index[10:20], "Score_mean"] += 5
+    new_df.loc[new_df.index[40:44], [COMPETITION_NAME_COLUMN, "Comp_Slug"]] = ["Cup", "cup-xx"]
+    new_df = new_df[new_df["Name"] != new_df["Name"].iloc[-1]]
+    extra = fixture_df.iloc[-4:].assign(Date="2026-03-30T18:00:00Z", Opponent="Team X")
+
+    patched = _reload(file_path, fixture_df, pd.concat([new_df, extra]), caplog)
+
+    assert "Prepared 18 changed fixture rows" in caplog.text
+    pd.testing.assert_frame_equal(_sorted(patched), _sorted(_full_load(file_path)))
+    assert isinstance(patched[COMPETITION_NAME_COLUMN].dtype, pd.CategoricalDtype)
+    assert isinstance(patched["Comp_Slug"].dtype, pd.CategoricalDtype)
+
+
+def test_patch_renumbers_gameweeks_when_the_earliest_fixture_changes(fixture_df, tmp_path, caplog):
+    file_path = tmp_path / "fixtures.csv"
+    earliest = fixture_df["Date"].min()
+    new_df = fixture_df[fixture_df["Date"] != earliest]
+    new_df.loc[new_df.index[:4], "Score_mean"] += 5
+
+    patched = _reload(file_path, fixture_df, new_df, caplog)
+
+    assert "Prepared 4 changed fixture rows" in caplog.text
+    pd.testing.assert_frame_equal(_sorted(patched), _sorted(_full_load(file_path)))
@@ -0,0 +1,112 @@
+"""
+Fixture run and swing analysis against naive per-window references.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fixture_runs import build_difficulty_matrix, calculate_window_difficulty, calculate_fixture_swings
+
+GAMEWEEKS = list(range(1, 8))
+
+
+@pytest.fixture
+def fixtures():
+    rows = [
+        # Plays every gameweek, with a double gameweek in GW 3
+        *[("Team A", "Defender", gw, score) for gw, score in zip(GAMEWEEKS, [50, 40, 60, 45, 45, 55, 30])],
+        ("Team A", "Defender", 3, 40),
+        # Ties: every run of the same length has the same average
+        *[("Team B", "Defender", gw, 50) for gw in GAMEWEEKS],
+        # Blanks in GW 2, 4 and 5
+        *[("Team C", "Defender", gw, score) for gw, score in [(1, 35), (3, 65), (6, 40), (7, 50)]],
+        # Fewer fixtures than the longer windows
+        ("Team D", "Defender", 4, 30),
+        ("Team D", "Forward", 1, 70),
+        ("Team D", "Forward", 2, 20)
+    ]
+    return pd.DataFrame(rows, columns=["Name", "Position", "Game Week", "Score_mean"])
+
+
+def _naive_windows(df, windows, min_coverage):
+    matrix = build_difficulty_matrix(df, "Score_mean", GAMEWEEKS)
+    rows = []
+    for (name, position), values in matrix.iterrows():
+        values = values.to_numpy()
+        for window in windows:
+            best = None
+            for start in range(len(values) - window + 1):
+                run = values[start:start + window]
+                played = run[~np.isnan(run)]
+                if len(played) == 0 or len(played) < min_coverage * window:
+                    continue
+                if best is None or played.mean() > best[1]:
+                    best = (start, played.mean(), len(played))
+            if best is None:
+                rows.append((name, position, window, np.nan, np.nan, np.nan, np.nan))
+            else:
+                start, avg, played = best
+                rows.append((name, position, window, GAMEWEEKS[start], GAMEWEEKS[start + window - 1], avg, played))
+    return pd.DataFrame(rows, columns=["Name", "Position", "Window", "Start_GW", "End_GW", "Window_Avg", "Played_GWs"])
+
+
+def _naive_swings(df, block, threshold):
+    matrix = build_difficulty_matrix(df, "Score_mean", GAMEWEEKS)
+    rows = []
+    for (name, position), values in matrix.iterrows():
+        values = values.to_numpy()
+        best = None
+        for boundary in range(block, len(values) - block + 1):
+            before, after = values[boundary - block:boundary], values[boundary:boundary + block]
+            before_avg = np.nanmean(before) if (~np.isnan(before)).any() else np.nan
+            after_avg = np.nanmean(after) if (~np.isnan(after)).any() else np.nan
+            swing = after_avg - before_avg
+            if not np.isnan(swing) and (best is None or abs(swing) > abs(best[3])):
+                best = (GAMEWEEKS[boundary], before_avg, after_avg, swing)
+        rows.append((name, position, *(best or (np.nan,) * 4)))
+    result = pd.DataFrame(rows, columns=["Name", "Position", "Swing_GW", "Before_Avg", "After_Avg", "Swing"])
+    result["Is_Swing"] = result["Swing"].abs() >= threshold
+    return result
+
+
+def _sorted(df, keys):
+    return df.sort_values(keys).reset_index(drop=True).astype({"Played_GWs": float} if "Played_GWs" in df else {})
+
+
+@pytest.mark.parametrize("min_coverage", [0.5, 1.0])
+def test_window_difficulty_matches_naive_reference(fixtures, min_coverage):
+    windows = [1, 3, 5, 8]
+    result = calculate_window_difficulty(fixtures, "Score_mean", GAMEWEEKS, windows, min_coverage)
+    # Windows longer than the horizon are dropped
+    expected = _naive_windows(fixtures, [1, 3, 5], min_coverage)
+
+    keys = ["Name", "Position", "Window"]
+    pd.testing.assert_frame_equal(_sorted(result, keys), _sorted(expected, keys), check_dtype=False)
+
+
+def test_window_difficulty_ties_and_short_teams(fixtures):
+    result = calculate_window_difficulty(fixtures, "Score_mean", GAMEWEEKS, [3]).set_index(["Name", "Position"])
+
+    # Higher difficulty scores are easier fixtures, as in the grid colours
+    assert result.loc[("Team A", "Defender"), "Start_GW"] == 4
+    assert result.loc[("Team A", "Defender"), "Window_Avg"] == pytest.approx(145 / 3)
+    # Ties go to the earliest run
+    assert result.loc[("Team B", "Defender"), "Start_GW"] == 1
+    assert result.loc[("Team B", "Defender"), "Window_Avg"] == 50
+    # One fixture cannot cover half of a three-gameweek run
+    assert result.loc[("Team D", "Defender")].isna()[["Start_GW", "Window_Avg", "Played_GWs"]].all()
+    assert result.loc[("Team D", "Forward"), "Window_Avg"] == 45
+
+
+@pytest.mark.parametrize("block", [1, 2, 3])
+def test_fixture_swings_match_naive_reference(fixtures, block):
+    result = calculate_fixture_swings(fixtures, "Score_mean", GAMEWEEKS, block, threshold=10)
+    expected = _naive_swings(fixtures, block, threshold=10)
+
+    keys = ["Name", "Position"]
+    pd.testing.assert_frame_equal(_sorted(result, keys), _sorted(expected, keys), check_dtype=False)
+
+
+def test_fixture_swings_short_horizon(fixtures):
+    assert calculate_fixture_swings(fixtures, "Score_mean", GAMEWEEKS, block=4, threshold=10).empty
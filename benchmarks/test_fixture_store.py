@@ -0,0 +1,55 @@
+"""
+Snapshots of the partitioned fixture store: ids, the cached manifest and
+gameweek partition pruning.
+"""
+
+import pytest
+
+from benchmarks.synthetic_data import generate_fixture_data
+from src.data import load_and_prepare_data, calculate_gameweeks
+from src.fixture_store import format_snapshot, load_fixture_snapshot, read_manifest, snapshot_id, write_snapshot
+
+
+@pytest.fixture(scope="module")
+def fixture_df(tmp_path_factory):
+    file_path = tmp_path_factory.mktemp("store-data") / "fixtures.csv"
+    generate_fixture_data(n_leagues=3, teams_per_league=4, n_gameweeks=5).to_csv(file_path, index=False)
+    return calculate_gameweeks(load_and_prepare_data(file_path))
+
+
+def test_snapshot_ids_within_a_second_are_distinct():
+    first, second = snapshot_id((1_771_000_000_100_000_000, 10)), snapshot_id((1_771_000_000_900_000_000, 10))
+    assert first < second
+    assert format_snapshot(first) == format_snapshot(second) == "Feb 13, 2026 16:26 UTC"
+    # Stores written before nanosecond ids
+    assert format_snapshot("20260213T162640") == "Feb 13, 2026 16:26 UTC"
+
+
+def test_manifest_is_parsed_again_only_when_it_changes(fixture_df, tmp_path):
+    assert read_manifest(tmp_path) == {"snapshots": []}
+
+    write_snapshot(fixture_df, tmp_path, "20260101T000000000000000")
+    manifest = read_manifest(tmp_path)
+    assert read_manifest(tmp_path) is manifest
+
+    assert not write_snapshot(fixture_df, tmp_path, "20260101T000000000000000")
+    write_snapshot(fixture_df, tmp_path, "20260101T000000500000000")
+    assert [entry["id"] for entry in read_manifest(tmp_path)["snapshots"]] == [
+        "20260101T000000000000000", "20260101T000000500000000"
+    ]
+    # The shared manifest read earlier is left as it was
+    assert len(manifest["snapshots"]) == 1
+
+
+def test_gameweek_range_reads_only_its_partitions(fixture_df, tmp_path):
+    write_snapshot(fixture_df, tmp_path, "20260101T000000000000000")
+    competition = fixture_df["Sorare_Competition"].iloc[0]
+    gameweeks = sorted(fixture_df["Game Week"].unique())
+
+    df = load_fixture_snapshot.__wrapped__(tmp_path, competition, "20260101T000000000000000", (gameweeks[1], gameweeks[2]))
+
+    expected = fixture_df[
+        (fixture_df["Sorare_Competition"] == competition) & fixture_df["Game Week"].isin(gameweeks[1:3])
+    ]
+    assert sorted(df["Game Week"].unique()) == gameweeks[1:3]
+    assert len(df) == len(expected)
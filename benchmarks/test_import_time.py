@@ -0,0 +1,51 @@
+"""
+Cold import budget for the dashboard.
+
+Importing `src.dashboard` must stay within the "import_dashboard" budget and
+must not load the modules that are deferred until their section renders.
+"""
+
+import json
+
+import pytest
+
+from benchmarks.conftest import RESULTS_KEY
+from benchmarks.import_time import measure_import, imported_modules
+
+DEFERRED_MODULES = [
+    "st_aggrid",
+    "src.grid",
+    "src.fixture_runs",
+    "src.player_data",
+    "src.player_grid",
+    "src.matchup_cohesion",
+    "src.rotation_planner"
+]
+
+
+@pytest.fixture(scope="module")
+def import_budget(request):
+    with open(request.config.getoption("--budget-file")) as f:
+        budget = json.load(f)["import_dashboard"]
+    return budget["seconds"] * request.config.getoption("--budget-factor")
+
+
+def test_dashboard_import_time(request, import_budget):
+    # Best of three fresh interpreters to smooth out disk cache noise
+    seconds = min(measure_import("src.dashboard")["src.dashboard"][1] for _ in range(3))
+
+    request.config.stash[RESULTS_KEY].append({
+        "function": "import:src.dashboard",
+        "scale": "-",
+        "seconds": seconds,
+        "mean_seconds": seconds,
+        "peak_mb": None,
+        "rows": None
+    })
+
+    assert seconds <= import_budget, f"import src.dashboard took {seconds:.2f}s (budget {import_budget:.2f}s)"
+
+
+def test_dashboard_import_defers_section_modules():
+    loaded = imported_modules("src.dashboard")
+    assert not [module for module in DEFERRED_MODULES if module in loaded]
@@ -0,0 +1,72 @@
+"""
+Lineup builder search against brute force over every lineup.
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import LINEUP_SLOTS
+from src.lineup_builder import find_best_lineups
+
+CLUBS = [f"Club {club}" for club in range(5)]
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(11)
+    rows = []
+    for club in CLUBS:
+        for position, count in [("Goalkeeper", 1), ("Defender", 2), ("Midfielder", 2), ("Forward", 1), ("Coach", 1)]:
+            for _ in range(count):
+                rows.append((f"Player {len(rows)}", club, position, rng.uniform(20, 80)))
+    players = pd.DataFrame(rows, columns=["displayName", "Club", "Position", "SOI_Score"])
+    # Unscored players are never picked
+    players.loc[players.index[3], "SOI_Score"] = np.nan
+    return players.set_index(players.index * 10)
+
+
+def _brute_force(players, max_per_club, clubs=None):
+    pool = players[players["SOI_Score"].notna()]
+    if clubs is not None:
+        pool = pool[pool["Club"].isin(clubs)]
+    slot_players = [pool.index[pool["Position"].isin(positions)] for positions in LINEUP_SLOTS.values()]
+    club, score = pool["Club"].to_dict(), pool["SOI_Score"].to_dict()
+
+    totals = {}
+    for chosen in product(*slot_players):
+        clubs_picked = [club[player] for player in chosen]
+        if len(set(chosen)) < len(chosen) or max(map(clubs_picked.count, clubs_picked)) > max_per_club:
+            continue
+        # The same players picked into swapped slots are one lineup
+        totals[frozenset(chosen)] = sum(score[player] for player in chosen)
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+@pytest.mark.parametrize("max_per_club, clubs", [(1, None), (2, None), (3, None), (2, CLUBS[1:]), (5, CLUBS[:1])])
+def test_top_lineups_match_brute_force(players, max_per_club, clubs):
+    top_n = 5
+    result = find_best_lineups(players, max_per_club=max_per_club, clubs=clubs, top_n=top_n)
+    expected = _brute_force(players, max_per_club, clubs)
+    totals = dict(expected)
+
+    # A single club only fills one lineup once its unscored player is left out
+    assert list(result["rank"]) == list(range(1, min(top_n, len(expected)) + 1))
+    np.testing.assert_allclose(result["total_soi"], [total for _, total in expected[:top_n]])
+    # Each lineup is a valid pick of distinct players with the total reported
+    lineups = [frozenset(chosen) for chosen in result["players"]]
+    assert len(set(lineups)) == len(result)
+    for (_, row), lineup in zip(result.iterrows(), lineups):
+        assert row["total_soi"] == pytest.approx(totals[lineup])
+        for slot, label in zip(LINEUP_SLOTS, row["players"]):
+            player = players.loc[label]
+            assert player["Position"] in LINEUP_SLOTS[slot]
+            assert row[slot] == f"{player['displayName']} ({player['Club']})"
+
+
+def test_no_lineup_within_the_club_limit(players):
+    # Fewer clubs playing in the gameweek than slots, one player per club
+    assert _brute_force(players, 1, CLUBS[:4]) == []
+    assert find_best_lineups(players, max_per_club=1, clubs=CLUBS[:4]).empty
@@ -0,0 +1,50 @@
+"""
+Matchup detail grid of the cohesion dashboard.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.matchup_cohesion import create_matchup_detail_grid
+
+
+def _fixtures(rows):
+    return pd.DataFrame(rows, columns=["Name", "Position", "Game Week", "Opponent", "HA", "Score_mean"])
+
+
+def test_detail_grid_ties_go_to_the_last_team():
+    df = _fixtures([
+        ("Primary", "Defender", 1, "X", "H", 40.0),
+        ("Partner", "Defender", 1, "Y", "H", 40.0),
+        ("Primary", "Defender", 2, "Z", "A", 30.0),
+        ("Partner", "Defender", 2, "W", "H", 50.0),
+        ("Partner", "Defender", 3, "V", "A", 45.0)
+    ])
+    detail = create_matchup_detail_grid(df, ["Primary", "Partner"], [1, 2, 3, 4], "Score_mean", ["Defender"])
+
+    expected = pd.DataFrame({
+        "gameweek": [1, 2, 3, 4],
+        "team1_opponent": ["X", "Z", "-", "-"],
+        "team1_location": ["H", "A", "-", "-"],
+        "team1_difficulty": [40.0, 30.0, np.nan, np.nan],
+        "team2_opponent": ["Y", "W", "V", "-"],
+        "team2_location": ["H", "H", "A", "-"],
+        "team2_difficulty": [40.0, 50.0, 45.0, np.nan],
+        "all_home": [True, False, False, False],
+        "best_choice": ["Partner", "Primary", "Partner", "-"],
+        "best_difficulty": [40.0, 30.0, 45.0, np.nan]
+    })
+    pd.testing.assert_frame_equal(detail, expected, check_dtype=False)
+
+
+def test_detail_grid_ties_among_several_teams():
+    df = _fixtures([
+        ("A", "Defender", 1, "X", "H", 35.0),
+        ("B", "Defender", 1, "Y", "H", 35.0),
+        ("C", "Defender", 1, "Z", "H", 50.0)
+    ])
+    detail = create_matchup_detail_grid(df, ["A", "B", "C"], [1], "Score_mean", ["Defender"])
+
+    assert detail.loc[0, "best_choice"] == "B"
+    assert detail.loc[0, "best_difficulty"] == 35.0
+    assert detail.loc[0, "all_home"]
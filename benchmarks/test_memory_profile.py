@@ -0,0 +1,62 @@
+"""
+Per-stage memory profiles of src.memory_profile.
+"""
+
+import tracemalloc
+
+import pytest
+
+from src.memory_profile import format_report, last_report, profile_memory
+from src.metrics import mark_section, track_rerun
+
+SIZE = 8 * 2 ** 20
+
+_retained = []
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    # Tracing slows down every allocation, so it must not leak into other tests
+    yield
+    tracemalloc.stop()
+    _retained.clear()
+
+
+def test_stages_report_retained_and_peak_memory():
+    with track_rerun(), profile_memory():
+        _retained.append(bytearray(SIZE))
+        mark_section("retain")
+        intermediate = bytearray(SIZE)
+        del intermediate
+        mark_section("intermediate")
+
+    report = last_report()
+    retain, intermediate = report["stages"]
+    assert retain["stage"] == "retain" and intermediate["stage"] == "intermediate"
+
+    assert retain["net_bytes"] >= SIZE
+    assert retain["top_lines"][0]["line"].startswith(f"{__file__}:")
+    assert retain["top_lines"][0]["net_bytes"] >= SIZE
+    assert abs(intermediate["net_bytes"]) < SIZE / 8
+    # Less the few bytes freed along the way
+    assert intermediate["peak_bytes"] >= SIZE * 0.99
+
+    assert report["net_bytes"] == retain["net_bytes"] + intermediate["net_bytes"]
+    assert "retain: retained +8." in format_report(report)
+
+
+def test_session_retained_memory_adds_up_and_early_stop_reports_rest():
+    with track_rerun(), profile_memory():
+        mark_section("retain")
+    first = last_report()
+
+    with pytest.raises(RuntimeError):
+        with track_rerun(), profile_memory():
+            mark_section("retain")
+            _retained.append(bytearray(SIZE))
+            raise RuntimeError("stopped")
+
+    report = last_report()
+    assert [stage["stage"] for stage in report["stages"]] == ["retain", "rest"]
+    assert report["stages"][1]["net_bytes"] >= SIZE
+    assert report["session_retained_bytes"] == first["session_retained_bytes"] + report["net_bytes"]
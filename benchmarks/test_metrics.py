@@ -0,0 +1,114 @@
+"""
+Metrics recorded by src.metrics and their Prometheus text export.
+
+Metrics are process-wide, so each test reads the change of the samples it
+caused rather than absolute values.
+"""
+
+import socket
+import urllib.request
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+import src.metrics
+from src.metrics import mark_section, render_metrics, start_metrics_exporter, track_cache, track_rerun
+
+
+def _sample(name, text=None):
+    """Value of one sample (name with labels) in the rendered metrics, 0 if absent."""
+    for line in (text or render_metrics()).splitlines():
+        if line.startswith(f"{name} "):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_track_cache_counts_hits_misses_and_evictions():
+    @track_cache(st.cache_resource(max_entries=1))
+    def metrics_test_loader(rows, _unhashed=None):
+        return pd.DataFrame({"value": range(rows)})
+
+    labels = '{function="metrics_test_loader"}'
+    assert metrics_test_loader.__wrapped__(2).shape == (2, 1)
+
+    metrics_test_loader(3)
+    metrics_test_loader(3, _unhashed=object())
+    metrics_test_loader(4)  # evicts rows=3 (max_entries=1)
+    metrics_test_loader(3)
+    metrics_test_loader.clear()
+    metrics_test_loader(3)
+
+    text = render_metrics()
+    assert _sample(f"dashboard_cache_calls_total{labels}", text) == 5
+    assert _sample(f"dashboard_cache_misses_total{labels}", text) == 4
+    assert _sample(f"dashboard_cache_hits_total{labels}", text) == 1
+    assert _sample(f"dashboard_cache_evictions_total{labels}", text) == 2
+    assert _sample(f"dashboard_cache_compute_seconds_count{labels}", text) == 4
+    assert _sample('dashboard_cache_compute_seconds_bucket{function="metrics_test_loader",le="+Inf"}', text) == 4
+    assert _sample(f"dashboard_cache_result_rows{labels}", text) == 3
+
+
+def test_track_cache_remembers_recent_keys_only(monkeypatch):
+    monkeypatch.setattr(src.metrics, "COMPUTED_KEY_HISTORY", 2)
+
+    @track_cache(st.cache_resource(max_entries=1))
+    def metrics_history_loader(rows):
+        return rows
+
+    labels = '{function="metrics_history_loader"}'
+    for rows in [1, 2, 1, 3, 4, 1]:
+        metrics_history_loader(rows)
+
+    # 1 is evicted and computed again twice, but only the first is within
+    # the last two computations
+    assert _sample(f"dashboard_cache_misses_total{labels}") == 6
+    assert _sample(f"dashboard_cache_evictions_total{labels}") == 1
+    assert list(src.metrics._computed_keys["metrics_history_loader"]) == ["[4]", "[1]"]
+
+
+def test_track_rerun_records_outcomes_and_sections():
+    completed = _sample('dashboard_reruns_total{outcome="completed"}')
+    errors = _sample('dashboard_reruns_total{outcome="error"}')
+    sections = _sample('dashboard_section_seconds_count{section="metrics_test"}')
+
+    with track_rerun():
+        mark_section("metrics_test")
+    with pytest.raises(ValueError):
+        with track_rerun():
+            raise ValueError("failed rerun")
+    # Outside a rerun marks are ignored
+    mark_section("metrics_test")
+
+    text = render_metrics()
+    assert _sample('dashboard_reruns_total{outcome="completed"}', text) == completed + 1
+    assert _sample('dashboard_reruns_total{outcome="error"}', text) == errors + 1
+    assert _sample('dashboard_section_seconds_count{section="metrics_test"}', text) == sections + 1
+
+
+def test_render_metrics_format():
+    text = render_metrics()
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("#"):
+            assert line.split()[1] in ("HELP", "TYPE")
+        else:
+            name, value = line.rsplit(" ", 1)
+            float(value)
+            assert name.split("{")[0].replace("_", "").isalnum()
+    assert "# TYPE dashboard_rerun_seconds histogram" in text
+    assert _sample("process_resident_memory_bytes", text) > 0
+
+
+def test_exporter_serves_endpoint_and_file(tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    file_path = tmp_path / "dashboard.prom"
+
+    start_metrics_exporter(port, file_path, interval=3600)
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE dashboard_cache_calls_total counter" in response.read().decode()
+    assert "# TYPE process_resident_memory_bytes gauge" in file_path.read_text()
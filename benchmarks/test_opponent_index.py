@@ -0,0 +1,62 @@
+"""
+Opponent index lookups against a plain filter of the fixture frame, and the
+order fixtures against the selected opponents are shown in.
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import generate_fixture_data
+from src.data import load_and_prepare_data, calculate_gameweeks
+from src.opponent_index import INDEX_COLUMNS, build_opponent_index, find_teams_facing, prepare_opponent_display_df
+
+
+@pytest.fixture(scope="module")
+def fixture_df(tmp_path_factory):
+    file_path = tmp_path_factory.mktemp("opponent-data") / "fixtures.csv"
+    generate_fixture_data(n_leagues=3, teams_per_league=4, n_gameweeks=5).to_csv(file_path, index=False)
+    return calculate_gameweeks(load_and_prepare_data(file_path))
+
+
+def _naive_facing(df, opponents, gameweeks=None, competitions=None, positions=None):
+    mask = df["Opponent"].isin(opponents)
+    if gameweeks is not None:
+        mask &= df["Game Week"].isin(gameweeks)
+    if competitions is not None:
+        mask &= df["Competition_Display"].isin(competitions)
+    if positions is not None:
+        mask &= df["Position"].isin(positions)
+    return df.loc[mask, INDEX_COLUMNS].sort_values(["Game Week", "Date", "Name"], kind="stable")
+
+
+def test_lookups_match_a_filter_of_the_frame(fixture_df):
+    index = build_opponent_index(fixture_df)
+    opponents = sorted(fixture_df["Opponent"].dropna().unique())
+    gameweeks = sorted(fixture_df["Game Week"].unique())
+    competitions = sorted(fixture_df["Competition_Display"].unique())
+
+    for selected, filters in [
+        (opponents[:1], {}),
+        (opponents[:3], {"gameweeks": gameweeks[1:3]}),
+        (opponents[2:6], {"competitions": competitions[:1], "positions": ["Defender", "Forward"]}),
+        (opponents, {"gameweeks": gameweeks[-1:], "competitions": competitions, "positions": ["Goalkeeper"]}),
+        (opponents[:2] + ["Unknown FC"], {"positions": ["Midfielder"]}),
+        (["Unknown FC"], {}),
+        (opponents[:2], {"gameweeks": []})
+    ]:
+        pd.testing.assert_frame_equal(
+            find_teams_facing(index, selected, **filters).reset_index(drop=True),
+            _naive_facing(fixture_df, selected, **filters).reset_index(drop=True)
+        )
+
+
+def test_display_lists_easiest_fixtures_first(fixture_df):
+    index = build_opponent_index(fixture_df)
+    fixtures = find_teams_facing(index, sorted(index["opponents"])[:4], positions=["Defender"])
+
+    display_df = prepare_opponent_display_df(fixtures, "Score_mean")
+
+    assert len(display_df) == len(fixtures)
+    for _, gameweek in display_df.groupby("GW", sort=False):
+        # A higher difficulty score is an easier fixture, as in the grid
+        assert gameweek["Difficulty"].is_monotonic_decreasing
@@ -0,0 +1,231 @@
+"""
+Benchmarks for the data pipeline stages behind the dashboard.
+
+Inputs mirror the dashboard defaults: the "Contender" Sorare competition with
+all of its competitions and gameweeks selected. Query stages run on every
+installed query engine (pandas, and DuckDB when available).
+"""
+
+import pandas as pd
+import pytest
+
+from src.competitions import DEFAULT_COMPETITION_MAPPING, apply_competition_mapping
+from src.config import DEFAULT_SOI_WEIGHTS, LINEUP_SLOTS
+from src.data import load_and_prepare_data, calculate_gameweeks, calculate_congestion, prepare_ranking_display
+from src.fixture_store import write_snapshot, load_fixture_snapshot
+from src.opponent_index import build_opponent_index, find_teams_facing
+from src.pivots import create_pivot_tables
+from src.query_engine import QUERY_ENGINES, select_fixtures, team_position_difficulty
+from src.player_data import (
+    load_player_data,
+    calculate_dynamic_fixture_difficulty,
+    normalize_strength_metrics,
+    calculate_soi
+)
+from src.player_grid import page_player_pool
+from src.lineup_builder import find_best_lineups
+from src.simulation import build_score_model, simulate_players, simulate_lineups
+from src.matchup_cohesion import find_best_matchup_cohesions
+
+SORARE_COMPETITION = "Contender"
+POSITION = "Defender"
+
+
+@pytest.fixture(params=QUERY_ENGINES)
+def engine(request):
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def fixture_df(data_paths):
+    df = load_and_prepare_data(data_paths[0])
+    return prepare_ranking_display(calculate_gameweeks(df))
+
+
+@pytest.fixture(scope="session")
+def dashboard_selection(fixture_df):
+    df_sorare = fixture_df[fixture_df["Sorare_Competition"] == SORARE_COMPETITION]
+    return {
+        "df": df_sorare,
+        "competitions": sorted(df_sorare["Competition_Display"].unique()),
+        "gameweeks": sorted(df_sorare["Game Week"].unique()),
+        "metric": "Score_mean"
+    }
+
+
+@pytest.fixture(scope="session")
+def player_df(data_paths, fixture_df, dashboard_selection):
+    players = load_player_data.__wrapped__(data_paths[1])
+    players = players[players["Position"] == POSITION]
+    return calculate_dynamic_fixture_difficulty(
+        players,
+        fixture_df,
+        dashboard_selection["gameweeks"],
+        dashboard_selection["competitions"],
+        dashboard_selection["metric"]
+    )
+
+
+def test_load_and_prepare_data(measure, data_paths):
+    df = measure("load_and_prepare_data", load_and_prepare_data, data_paths[0])
+    assert not df.empty
+
+
+def test_calculate_gameweeks(measure, data_paths):
+    df = load_and_prepare_data(data_paths[0])
+    result = measure("calculate_gameweeks", calculate_gameweeks, df)
+    assert result["Game Week"].notna().all()
+
+
+def test_calculate_congestion(measure, fixture_df):
+    result = measure("calculate_congestion", calculate_congestion, fixture_df)
+    assert result["Rest_Days"].dropna().ge(1).all()
+    assert (result["Matches_7d"] <= result["Matches_14d"]).all()
+
+
+def test_apply_competition_mapping(measure, fixture_df):
+    # Regroup one competition into another Sorare competition
+    mapping = {
+        "competition_names": DEFAULT_COMPETITION_MAPPING["competition_names"],
+        "sorare_competitions": {**DEFAULT_COMPETITION_MAPPING["sorare_competitions"], "Ligue 2": "Ligue 1"}
+    }
+    result = measure("apply_competition_mapping", apply_competition_mapping, fixture_df, mapping)
+    ligue_2 = result["Competition_Display"] == "Ligue 2"
+    assert (result.loc[ligue_2, "Sorare_Competition"] == "Ligue 1").all()
+    assert (result.loc[~ligue_2, "Sorare_Competition"] == fixture_df.loc[~ligue_2, "Sorare_Competition"]).all()
+
+
+def test_load_fixture_snapshot(measure, fixture_df, tmp_path):
+    write_snapshot(fixture_df, tmp_path, "20260101T000000")
+    df = measure("load_fixture_snapshot", load_fixture_snapshot.__wrapped__, tmp_path, SORARE_COMPETITION, "20260101T000000")
+    assert len(df) == (fixture_df["Sorare_Competition"] == SORARE_COMPETITION).sum()
+
+
+def test_select_fixtures(measure, fixture_df, dashboard_selection, engine):
+    df = measure(
+        f"select_fixtures[{engine}]",
+        select_fixtures,
+        fixture_df,
+        engine,
+        SORARE_COMPETITION,
+        dashboard_selection["competitions"],
+        [POSITION],
+        dashboard_selection["gameweeks"]
+    )
+    assert len(df) == (dashboard_selection["df"]["Position"] == POSITION).sum()
+
+
+def test_create_pivot_tables(measure, dashboard_selection, engine):
+    df = dashboard_selection["df"]
+    df = df[df["Position"] == POSITION]
+    value_pivot, _, _, _ = measure(
+        f"create_pivot_tables[{engine}]",
+        create_pivot_tables,
+        df,
+        dashboard_selection["metric"],
+        engine
+    )
+    assert len(value_pivot) == df["Name"].nunique()
+
+
+def test_team_position_difficulty(measure, fixture_df, dashboard_selection, engine):
+    result = measure(
+        f"team_position_difficulty[{engine}]",
+        team_position_difficulty,
+        fixture_df,
+        engine,
+        dashboard_selection["gameweeks"],
+        dashboard_selection["competitions"],
+        dashboard_selection["metric"]
+    )
+    assert not result.empty
+
+
+def test_build_opponent_index(measure, dashboard_selection):
+    index = measure("build_opponent_index", build_opponent_index, dashboard_selection["df"])
+    assert sum(len(rows) for rows in index["opponents"].values()) == len(index["fixtures"])
+
+
+def test_find_teams_facing(measure, dashboard_selection):
+    index = build_opponent_index(dashboard_selection["df"])
+    opponents = sorted(index["opponents"])[:5]
+    result = measure(
+        "find_teams_facing",
+        find_teams_facing,
+        index,
+        opponents,
+        gameweeks=dashboard_selection["gameweeks"],
+        competitions=dashboard_selection["competitions"],
+        positions=[POSITION]
+    )
+    assert set(result["Opponent"]) <= set(opponents)
+
+
+def test_normalize_strength_metrics(measure, player_df):
+    result = measure("normalize_strength_metrics", normalize_strength_metrics, player_df)
+    assert "L15_Form_Strength" in result.columns
+
+
+def test_calculate_soi(measure, player_df):
+    normalized = normalize_strength_metrics(player_df)
+    result = measure("calculate_soi", calculate_soi, normalized, DEFAULT_SOI_WEIGHTS)
+    assert result["SOI_Score"].between(0, 1).all()
+
+
+def test_page_player_pool(measure, player_df):
+    scored = calculate_soi(normalize_strength_metrics(player_df), DEFAULT_SOI_WEIGHTS)
+    result = measure("page_player_pool", page_player_pool, scored, "SOI_Score", 0, 50)
+    expected = scored.sort_values("SOI_Score", ascending=False, kind="stable").head(50)
+    assert list(result.index) == list(expected.index)
+
+
+def test_find_best_lineups(measure, data_paths):
+    players = load_player_data.__wrapped__(data_paths[1])
+    # SOI is normalized within each position's pool, as in the dashboard
+    scored = pd.concat([
+        calculate_soi(normalize_strength_metrics(players[players["Position"] == position]), DEFAULT_SOI_WEIGHTS)
+        for position in players["Position"].unique()
+    ])
+    result = measure("find_best_lineups", find_best_lineups, scored, max_per_club=2, top_n=5)
+    assert len(result) == 5
+    assert result["total_soi"].is_monotonic_decreasing
+    assert list(result.columns[2:2 + len(LINEUP_SLOTS)]) == list(LINEUP_SLOTS)
+
+
+def test_simulate_players(measure, player_df):
+    model = build_score_model(player_df)
+    result = measure("simulate_players", simulate_players, model, 40)
+    assert result.index.equals(player_df.index)
+    assert (result["p10"] <= result["p25"]).all()
+    assert result["prob_threshold"].between(0, 1).all()
+    # Chunks have their own random streams, so workers do not change results
+    pd.testing.assert_frame_equal(simulate_players(model, 40, n_trials=500, workers=1),
+                                  simulate_players(model, 40, n_trials=500, workers=4))
+
+
+def test_simulate_lineups(measure, player_df):
+    model = build_score_model(player_df)
+    lineups = [list(player_df.index[i:i + len(LINEUP_SLOTS)]) for i in range(0, 50, len(LINEUP_SLOTS))]
+    result = measure("simulate_lineups", simulate_lineups, model, lineups, 250)
+    assert len(result) == len(lineups)
+    assert result["expected"].between(0, 100 * len(LINEUP_SLOTS)).all()
+
+
+def test_find_best_matchup_cohesions(measure, dashboard_selection):
+    df = dashboard_selection["df"]
+    positions = sorted(df["Position"].unique())
+    primary_team = sorted(df["Name"].unique())[0]
+    result = measure(
+        "find_best_matchup_cohesions",
+        find_best_matchup_cohesions,
+        df,
+        df,
+        primary_team,
+        dashboard_selection["gameweeks"],
+        dashboard_selection["metric"],
+        positions,
+        top_n=15
+    )
+    assert not result.empty
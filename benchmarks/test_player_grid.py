@@ -0,0 +1,87 @@
+"""
+Player grid options: the SOI value getter, the live weight panel and the
+weights sent to the browser.
+"""
+
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import DEFAULT_SOI_WEIGHTS, STRENGTH_COLORS, STRENGTH_OPACITY
+from src.player_data import calculate_soi
+from src.player_grid import (
+    SOI_WEIGHT_COLUMNS,
+    configure_player_grid,
+    create_soi_value_getter_js,
+    create_soi_weight_panel_js,
+    prepare_player_grid_data
+)
+
+STRENGTHS = ["L5_Form", "L15_Form", "Next_5_Diff", "L5_Mins", "L15_Mins", "Rest"]
+
+
+@pytest.fixture
+def scored_df():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"displayName": [f"Player {i}" for i in range(6)], "Club": "Team A"})
+    for name in STRENGTHS:
+        df[f"{name}_Strength"] = rng.uniform(0, 1, len(df))
+        df[f"{name}_Display"] = df[f"{name}_Strength"].round(2)
+    df.loc[2, "Rest_Strength"] = np.nan
+    return calculate_soi(df, DEFAULT_SOI_WEIGHTS)
+
+
+def _grid_options(scored_df, **kwargs):
+    grid_df, strength_columns = prepare_player_grid_data(scored_df)
+    options = configure_player_grid(grid_df, strength_columns, None, STRENGTH_COLORS, STRENGTH_OPACITY, **kwargs)
+    return grid_df, options
+
+
+def _soi_column(options):
+    return next(column for column in options["columnDefs"] if column["field"] == "SOI_Score")
+
+
+def test_grid_includes_getter_panel_and_weights(scored_df):
+    weights = {**DEFAULT_SOI_WEIGHTS, "rest_days": 0.15}
+    grid_df, options = _grid_options(scored_df, soi_weights=weights)
+
+    assert _soi_column(options)["valueGetter"].js_code == create_soi_value_getter_js().js_code
+    assert _soi_column(options)["sort"] == "desc"
+    assert options["onGridReady"].js_code == create_soi_weight_panel_js().js_code
+    assert options["context"]["soiWeights"] == [
+        {"key": key, "field": field, "label": label, "weight": weights[key]}
+        for key, (field, label) in SOI_WEIGHT_COLUMNS.items()
+    ]
+    # Every weighted field is sent with the rows
+    assert {weight["field"] for weight in options["context"]["soiWeights"]} <= set(grid_df.columns)
+
+
+def test_grid_without_weights_has_no_panel(scored_df):
+    _, options = _grid_options(scored_df, sort_column="L5_Form_Strength")
+
+    assert "context" not in options
+    assert "onGridReady" not in options
+    assert _soi_column(options)["sort"] is None
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the grid JavaScript")
+def test_value_getter_matches_calculate_soi(scored_df):
+    weights = {**DEFAULT_SOI_WEIGHTS, "l5_form": 0.5, "rest_days": 0.3}
+    grid_df, options = _grid_options(scored_df, soi_weights=weights)
+    getter = create_soi_value_getter_js().js_code.replace("::JSCODE::", "")
+    rows = json.loads(grid_df.to_json(orient="records"))
+
+    script = f"""
+        const getter = {getter};
+        const context = {json.dumps(options["context"])};
+        const rows = {json.dumps(rows)};
+        console.log(JSON.stringify(rows.map(data => getter({{data, context}}))));
+    """
+    output = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+
+    expected = calculate_soi(scored_df, weights)["SOI_Score"]
+    np.testing.assert_allclose(json.loads(output), expected)
@@ -0,0 +1,69 @@
+"""
+DuckDB queries against the pandas engine, and the Arrow tables behind them.
+"""
+
+import gc
+
+import pandas as pd
+import pytest
+
+import src.query_engine
+from benchmarks.load_test import BUNDLED_DATA_PATH
+from benchmarks.synthetic_data import generate_fixture_data
+from src.data import load_and_prepare_data, calculate_gameweeks, prepare_ranking_display
+from src.pivots import create_pivot_tables
+from src.query_engine import select_fixtures
+
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def fixture_df(tmp_path):
+    file_path = tmp_path / "fixtures.csv"
+    generate_fixture_data(n_leagues=3, teams_per_league=4, n_gameweeks=5).to_csv(file_path, index=False)
+    return prepare_ranking_display(calculate_gameweeks(load_and_prepare_data(file_path)))
+
+
+def test_select_fixtures_matches_pandas(fixture_df):
+    gameweeks = sorted(fixture_df["Game Week"].unique())[1:3]
+    competitions = sorted(fixture_df["Competition_Display"].unique())[:2]
+    for filters in [
+        {},
+        {"positions": ["Defender"], "gameweeks": gameweeks},
+        {"sorare_competition": fixture_df["Sorare_Competition"].iloc[0], "competitions": competitions},
+        {"positions": ["Coach"]}
+    ]:
+        pd.testing.assert_frame_equal(
+            select_fixtures(fixture_df, "duckdb", **filters),
+            select_fixtures(fixture_df, "pandas", **filters)
+        )
+
+
+def test_frames_are_converted_once(fixture_df):
+    select_fixtures(fixture_df, "duckdb", positions=["Defender"])
+    table = src.query_engine._arrow_tables[id(fixture_df)]
+    for position in ["Forward", "Goalkeeper"]:
+        select_fixtures(fixture_df, "duckdb", positions=[position])
+    assert src.query_engine._arrow_tables[id(fixture_df)] is table
+    assert table.num_rows == len(fixture_df)
+
+    # A frame's table is dropped with it
+    other = fixture_df.copy()
+    select_fixtures(other, "duckdb", positions=["Defender"])
+    key = id(other)
+    assert key in src.query_engine._arrow_tables
+    del other
+    gc.collect()
+    assert key not in src.query_engine._arrow_tables
+
+
+def test_pivot_tables_match_pandas_on_bundled_data():
+    df = prepare_ranking_display(calculate_gameweeks(load_and_prepare_data(BUNDLED_DATA_PATH)))
+    # One Sorare competition and position at a time, as the grid shows them
+    for _, fixtures in df.groupby(["Sorare_Competition", "Position"], observed=True):
+        for metric in ["Score_mean", "Score_median"]:
+            for duckdb_pivot, pandas_pivot in zip(
+                create_pivot_tables(fixtures, metric, engine="duckdb"),
+                create_pivot_tables(fixtures, metric)
+            ):
+                pd.testing.assert_frame_equal(duckdb_pivot, pandas_pivot)
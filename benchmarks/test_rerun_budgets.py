@@ -0,0 +1,124 @@
+"""
+Rerun latency and memory budgets for dashboard interactions.
+
+Each test drives `dashboard.main` through AppTest on the 1x synthetic dataset
+and fails when an interaction exceeds its budget from `--budget-file`. Wall
+time is measured on a normal rerun; peak memory on a repeat of the same rerun
+under tracemalloc, so tracing does not inflate the timing.
+
+The tests share one app session and run in file order.
+"""
+
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import src.dashboard
+import src.shards
+from benchmarks.conftest import RESULTS_KEY
+from benchmarks.synthetic_data import write_synthetic_data
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+TIMEOUT = 300
+
+
+@pytest.fixture(scope="module")
+def budgets(request):
+    factor = request.config.getoption("--budget-factor")
+    with open(request.config.getoption("--budget-file")) as f:
+        return {
+            step: {limit: value * factor for limit, value in limits.items()}
+            for step, limits in json.load(f).items()
+        }
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    fixture_path, player_path = write_synthetic_data(tmp_path_factory.mktemp("budget-data"), "1x")
+
+    # The dashboard binds the data paths at import; point them at the synthetic files
+    patch = pytest.MonkeyPatch()
+    patch.setattr(src.dashboard, "DATA_PATH", fixture_path)
+    patch.setattr(src.dashboard, "PLAYER_DATA_PATH", player_path)
+    patch.setattr(src.shards, "SHARD_CACHE_DIR", tmp_path_factory.mktemp("budget-shards"))
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    yield AppTest.from_file(str(APP_PATH), default_timeout=TIMEOUT)
+
+    patch.undo()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def _widget(at, kind, label=None, key=None):
+    for widget in getattr(at, kind):
+        if (key is not None and widget.key == key) or (label is not None and widget.label == label):
+            return widget
+    pytest.fail(f"{kind} {label or key!r} is not rendered")
+
+
+def _check_budget(request, at, step, budgets, action=None, cold=False):
+    """
+    Run an interaction, then assert its time and memory against the budget.
+    
+    With `cold`, caches are cleared before the traced run so data loading
+    is included in the memory figure.
+    """
+    start = time.perf_counter()
+    if action is not None:
+        action()
+    at.run()
+    seconds = time.perf_counter() - start
+    assert not at.exception, f"{step} raised: {at.exception[0].value}"
+
+    if cold:
+        st.cache_data.clear()
+        st.cache_resource.clear()
+    tracemalloc.start()
+    try:
+        at.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    peak_mb = peak / 2**20
+
+    request.config.stash[RESULTS_KEY].append({
+        "function": f"rerun:{step}",
+        "scale": "1x",
+        "seconds": seconds,
+        "mean_seconds": seconds,
+        "peak_mb": peak_mb,
+        "rows": None
+    })
+
+    budget = budgets[step]
+    assert seconds <= budget["seconds"], f"{step} took {seconds:.2f}s (budget {budget['seconds']:.2f}s)"
+    assert peak_mb <= budget["peak_mb"], f"{step} peaked at {peak_mb:.0f} MB (budget {budget['peak_mb']:.0f} MB)"
+
+
+def test_initial_load(request, app, budgets):
+    _check_budget(request, app, "initial_load", budgets, cold=True)
+
+
+def test_sidebar_filter_change(request, app, budgets):
+    position = _widget(app, "selectbox", label="👤 Position")
+    other = next(option for option in position.options if option != position.value)
+    _check_budget(request, app, "sidebar_filter_change", budgets, lambda: position.select(other))
+
+
+def test_soi_slider_move(request, app, budgets):
+    weight = _widget(app, "slider", label="L5 Form Weight")
+    save = _widget(app, "button", label="💾 Save Weights")
+    _check_budget(request, app, "soi_slider_move", budgets, lambda: (weight.set_value(0.3), save.click()))
+
+
+def test_cohesion_primary_team_change(request, app, budgets):
+    primary_team = _widget(app, "selectbox", key="cohesion_primary_team")
+    other = next(option for option in primary_team.options if option != primary_team.value)
+    _check_budget(request, app, "cohesion_primary_team_change", budgets, lambda: primary_team.select(other))
@@ -0,0 +1,94 @@
+"""
+Rotation planner search against brute force over every team set.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fixture_runs import build_difficulty_matrix
+from src.rotation_planner import find_best_rotation_sets
+
+GAMEWEEKS = list(range(1, 7))
+
+
+@pytest.fixture
+def fixtures():
+    rng = np.random.default_rng(7)
+    rows = []
+    for team in range(9):
+        for gw in GAMEWEEKS:
+            # Some blanks and double gameweeks
+            for _ in range(rng.choice([0, 1, 1, 1, 2])):
+                rows.append((f"Team {team}", "Defender", gw, rng.uniform(20, 80)))
+    return pd.DataFrame(rows, columns=["Name", "Position", "Game Week", "Score_mean"])
+
+
+def _brute_force(df, set_size):
+    matrix = build_difficulty_matrix(df, "Score_mean", GAMEWEEKS, index=("Name",))
+    costs = matrix.to_numpy(dtype=float)
+    costs = np.where(np.isnan(costs), np.nanmax(costs), costs)
+    totals = {
+        ", ".join(matrix.index[list(chosen)]): costs[list(chosen)].min(axis=0).sum()
+        for chosen in combinations(range(len(costs)), set_size)
+    }
+    return sorted(totals.items(), key=lambda item: item[1])
+
+
+@pytest.mark.parametrize("set_size", [2, 3, 4])
+def test_top_sets_match_brute_force(fixtures, set_size):
+    top_n = 5
+    result = find_best_rotation_sets(fixtures, GAMEWEEKS, "Score_mean", ["Defender"], set_size, top_n=top_n)
+    expected = _brute_force(fixtures, set_size)
+    totals = dict(expected)
+
+    assert list(result["rank"]) == list(range(1, top_n + 1))
+    np.testing.assert_allclose(result["total_difficulty"], [total for _, total in expected[:top_n]])
+    # Sets tied on cost may come in any order, but each must have the cost reported
+    assert result["teams"].is_unique
+    for teams, total in zip(result["teams"], result["total_difficulty"]):
+        assert total == pytest.approx(totals[teams])
+    np.testing.assert_allclose(result["avg_difficulty"], result["total_difficulty"] / len(GAMEWEEKS))
+
+
+def test_picks_and_blank_gameweeks(fixtures):
+    result = find_best_rotation_sets(fixtures, GAMEWEEKS, "Score_mean", ["Defender"], 2, top_n=1).iloc[0]
+    matrix = build_difficulty_matrix(fixtures, "Score_mean", GAMEWEEKS, index=("Name",))
+    chosen = matrix.loc[result["teams"].split(", ")]
+
+    for gw in GAMEWEEKS:
+        if chosen[gw].isna().all():
+            assert result[f"GW {gw}"] == "-"
+        else:
+            assert result[f"GW {gw}"] == chosen[gw].idxmin()
+    assert result["blank_gameweeks"] == int(chosen.isna().all().sum())
+
+
+def test_max_nodes_returns_best_sets_found(fixtures):
+    set_size = 3
+    totals = dict(_brute_force(fixtures, set_size))
+
+    # Budget for a single path from the root to one full set
+    result = find_best_rotation_sets(
+        fixtures, GAMEWEEKS, "Score_mean", ["Defender"], set_size, top_n=5, max_nodes=set_size + 1
+    )
+    assert len(result) == 1
+    teams = result.loc[0, "teams"]
+    assert result.loc[0, "total_difficulty"] == pytest.approx(totals[teams])
+    assert totals[teams] >= min(totals.values())
+
+    # A larger budget finds more sets, all with their true cost
+    result = find_best_rotation_sets(
+        fixtures, GAMEWEEKS, "Score_mean", ["Defender"], set_size, top_n=5, max_nodes=20
+    )
+    assert 1 < len(result) <= 5
+    for teams, total in zip(result["teams"], result["total_difficulty"]):
+        assert total == pytest.approx(totals[teams])
+    assert result["total_difficulty"].is_monotonic_increasing
+
+
+def test_too_few_teams(fixtures):
+    teams = ["Team 0", "Team 1"]
+    assert find_best_rotation_sets(fixtures, GAMEWEEKS, "Score_mean", ["Defender"], 3, teams=teams).empty
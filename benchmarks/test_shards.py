@@ -0,0 +1,99 @@
+"""
+Per-competition shards: building, reuse across processes, pruning of old
+versions and regrouping competitions through the mappings.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+import src.shards
+from benchmarks.synthetic_data import generate_fixture_data, generate_player_data
+from src.data import load_fixture_data
+from src.data_refresh import file_version
+from src.player_data import load_player_data
+from src.shards import KEEP_VERSIONS, load_fixture_shard, load_fixture_shard_index, load_player_shard
+
+
+@pytest.fixture
+def data_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.shards, "SHARD_CACHE_DIR", tmp_path / "shards")
+    # Leagues mapped to Challenger, Jupiler Pro League and UEFA
+    fixture_df = generate_fixture_data(n_leagues=3, teams_per_league=4, n_gameweeks=4)
+    fixture_path = tmp_path / "fixtures.csv"
+    player_path = tmp_path / "players.csv"
+    fixture_df.to_csv(fixture_path, index=False)
+    generate_player_data(fixture_df).to_csv(player_path, index=False)
+    return fixture_path, player_path, tmp_path / "mapping.json"
+
+
+def _shard_dirs(tmp_path):
+    return sorted(path.name for path in (tmp_path / "shards").iterdir() if not path.name.startswith("."))
+
+
+def test_shards_match_full_load(data_files):
+    fixture_path, player_path, mapping_path = data_files
+    version, player_version = file_version(fixture_path), file_version(player_path)
+    full = load_fixture_data.__wrapped__(fixture_path, version)
+
+    index = load_fixture_shard_index.__wrapped__(fixture_path, version)
+    assert sum(source["rows"] for source in index["sources"]) == len(full)
+
+    for competition in full["Sorare_Competition"].unique():
+        shard = load_fixture_shard.__wrapped__(fixture_path, version, competition, mapping_path)
+        expected = full[full["Sorare_Competition"] == competition].reset_index(drop=True)
+        pd.testing.assert_frame_equal(shard, expected)
+
+        players = load_player_shard.__wrapped__(player_path, player_version, fixture_path, version, competition, mapping_path)
+        all_players = load_player_data.__wrapped__(player_path, player_version)
+        assert set(players["Club"]) == set(expected["Name"])
+        assert len(players) == all_players["Club"].isin(expected["Name"]).sum()
+
+
+def test_index_is_reused_without_parsing(data_files, monkeypatch):
+    fixture_path, _, _ = data_files
+    version = file_version(fixture_path)
+    index = load_fixture_shard_index.__wrapped__(fixture_path, version)
+
+    # Another process finds the published shards
+    def fail(*args):
+        raise AssertionError("the data file was parsed again")
+
+    monkeypatch.setattr(src.shards, "load_fixture_data", fail)
+    assert load_fixture_shard_index.__wrapped__(fixture_path, version) == index
+
+
+def test_old_versions_are_pruned(data_files, tmp_path):
+    fixture_path, _, _ = data_files
+    directories = []
+    for version in [(1, 1), (2, 1), (3, 1)]:
+        directories.append(load_fixture_shard_index.__wrapped__(fixture_path, version)["directory"].rsplit("/", 1)[-1])
+
+    assert len(directories) == len(set(directories))
+    assert _shard_dirs(tmp_path) == sorted(directories[-KEEP_VERSIONS:])
+
+
+def test_mapping_regroups_without_resharding(data_files, tmp_path):
+    fixture_path, player_path, mapping_path = data_files
+    version, player_version = file_version(fixture_path), file_version(player_path)
+    challenger = load_fixture_shard.__wrapped__(fixture_path, version, "Challenger", mapping_path)
+    jupiler = load_fixture_shard.__wrapped__(fixture_path, version, "Jupiler Pro League", mapping_path)
+    shard_dirs = _shard_dirs(tmp_path)
+
+    mapping_path.write_text(json.dumps({"sorare_competitions": {"First Division A": "Challenger"}}))
+    mapping_version = file_version(mapping_path)
+    regrouped = load_fixture_shard.__wrapped__(fixture_path, version, "Challenger", mapping_path, mapping_version)
+
+    assert len(regrouped) == len(challenger) + len(jupiler)
+    assert (regrouped["Sorare_Competition"] == "Challenger").all()
+    assert _shard_dirs(tmp_path) == shard_dirs
+
+    # A session still holding the competition that no longer exists
+    empty = load_fixture_shard.__wrapped__(fixture_path, version, "Jupiler Pro League", mapping_path, mapping_version)
+    assert empty.empty
+    assert list(empty.columns) == list(regrouped.columns)
+    players = load_player_shard.__wrapped__(
+        player_path, player_version, fixture_path, version, "Jupiler Pro League", mapping_path, mapping_version
+    )
+    assert players.empty
@@ -0,0 +1,123 @@
+"""
+Competition display names and Sorare competition groups.
+
+The mappings in config.py can be overridden by a JSON file at
+COMPETITION_MAPPING_PATH, which is reloaded when it changes:
+
+    {
+        "competition_names": {"laliga-es": "LaLiga"},
+        "sorare_competitions": {"LaLiga": "LaLiga", "Serie B": "Challenger"}
+    }
+
+Mappings are applied to the categories of the competition slug and name
+columns, never row by row: remapping a frame costs one dictionary lookup per
+competition plus an array take, so parsed data is reused as it is when the
+mappings change.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.config import COMPETITION_NAMES, SORARE_COMPETITION_MAPPING
+from src.metrics import track_cache
+
+COMPETITION_NAME_COLUMN = "name (upcomingGames.competition)"
+
+# Sorare competition of competitions without a group
+DEFAULT_SORARE_COMPETITION = "Other"
+
+DEFAULT_COMPETITION_MAPPING = {
+    "competition_names": COMPETITION_NAMES,
+    "sorare_competitions": SORARE_COMPETITION_MAPPING
+}
+
+# Sorare competition selected when a session starts, if it has fixtures
+SELECTED_SORARE_COMPETITION = "Contender"
+
+
+@track_cache(st.cache_resource(max_entries=2))
+def load_competition_mapping(file_path, version=None):
+    """
+    Load the competition mappings, overriding the defaults with the mapping file.
+
+    Args:
+        file_path: Path to the JSON mapping file; a missing file leaves the
+            defaults from config.py
+        version: Cache key for the file contents (see data_refresh.file_version)
+
+    Returns:
+        Dictionary with "competition_names" (competition slug -> display name)
+        and "sorare_competitions" (display name -> Sorare competition)
+
+    Raises:
+        ValueError: If the file is not a JSON object of mappings
+    """
+    mapping = {key: dict(values) for key, values in DEFAULT_COMPETITION_MAPPING.items()}
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return mapping
+
+    if not isinstance(overrides, dict) or set(overrides) - set(mapping):
+        raise ValueError(f"{file_path} must be a JSON object with keys {sorted(mapping)}")
+    for key, values in overrides.items():
+        mapping[key].update(values)
+    return mapping
+
+
+def default_sorare_competition(sorare_competitions):
+    """
+    Pick the Sorare competition a session starts with.
+
+    Args:
+        sorare_competitions: Sorted list of the Sorare competitions on offer
+
+    Returns:
+        SELECTED_SORARE_COMPETITION if on offer, otherwise the first one
+    """
+    if SELECTED_SORARE_COMPETITION in sorare_competitions:
+        return SELECTED_SORARE_COMPETITION
+    return sorare_competitions[0]
+
+
+def apply_competition_mapping(df, mapping=DEFAULT_COMPETITION_MAPPING):
+    """
+    Add competition display names and Sorare competitions.
+
+    A competition's display name is the name of its slug, falling back to the
+    competition name; its Sorare competition is looked up by display name.
+    Both are resolved once per category and then taken by category code.
+
+    Args:
+        df: DataFrame with Comp_Slug and competition name columns (ideally
+            categorical; other dtypes are converted first)
+        mapping: Competition mappings (see `load_competition_mapping`)
+
+    Returns:
+        New DataFrame with Competition_Display and Sorare_Competition columns
+    """
+    slugs = df["Comp_Slug"].astype("category")
+    names = df[COMPETITION_NAME_COLUMN].astype("category")
+
+    slug_displays = pd.Series(slugs.cat.categories, dtype=object).map(mapping["competition_names"])
+    displays = pd.Index(pd.concat([
+        slug_displays.dropna(),
+        pd.Series(names.cat.categories, dtype=object)
+    ]).unique())
+    groups = displays.map(mapping["sorare_competitions"]).fillna(DEFAULT_SORARE_COMPETITION)
+
+    # Category -> display code; the extra last entry serves missing values
+    # (code -1), and slugs without a display name of their own get -1
+    slug_codes = np.append(displays.get_indexer(slug_displays), -1)
+    name_codes = np.append(displays.get_indexer(names.cat.categories), -1)
+    display_codes = slug_codes[slugs.cat.codes.to_numpy()]
+    display_codes = np.where(display_codes >= 0, display_codes, name_codes[names.cat.codes.to_numpy()])
+
+    return df.assign(
+        Competition_Display=np.append(displays.to_numpy(object), np.nan)[display_codes],
+        Sorare_Competition=np.append(groups.to_numpy(object), DEFAULT_SORARE_COMPETITION)[display_codes]
+    )
@@ -13,6 +13,54 @@ import os
 DATA_PATH = Path(os.getenv("DATA_PATH", "data/Calculated Opponent Difficulty.csv"))
 PLAYER_DATA_PATH = Path(os.getenv("PLAYER_DATA_PATH", "data/Player_Metrics.csv"))
 
+# Seconds between checks for updated data files (0 disables background refresh)
+DATA_REFRESH_INTERVAL = float(os.getenv("DATA_REFRESH_INTERVAL", "30"))
+
+# HTTP source the data files are downloaded from, as <url>/<file name> (unset
+# keeps the local files), seconds between conditional requests for changes,
+# and seconds to wait for the source
+DATA_SOURCE_URL = os.getenv("DATA_SOURCE_URL")
+DATA_SOURCE_INTERVAL = float(os.getenv("DATA_SOURCE_INTERVAL", "300"))
+DATA_SOURCE_TIMEOUT = 30
+
+# Per-Sorare-competition shards of the data files: spill directory, shards kept
+# in memory per process, and seconds before an unused shard is evicted
+SHARD_CACHE_DIR = Path(os.getenv("SHARD_CACHE_DIR", "data/.shards"))
+SHARD_CACHE_ENTRIES = 8
+SHARD_CACHE_TTL = 3600
+
+# Scored player pools kept in memory per process, and players per page of the
+# player grids
+PLAYER_POOL_CACHE_ENTRIES = 16
+PLAYER_GRID_PAGE_SIZE = 50
+
+# Engine for the fixture filter and aggregation queries: "pandas" or "duckdb"
+# (DuckDB is optional; pandas is used when it is not installed)
+QUERY_ENGINE = os.getenv("QUERY_ENGINE", "pandas")
+
+# Partitioned history of every fixture data refresh (unset reads the CSV only)
+FIXTURE_STORE_PATH = Path(os.environ["FIXTURE_STORE_PATH"]) if os.getenv("FIXTURE_STORE_PATH") else None
+
+# Optional JSON file overriding the competition mappings below, reloaded when
+# it changes (see src/competitions.py for the format)
+COMPETITION_MAPPING_PATH = Path(os.getenv("COMPETITION_MAPPING_PATH", "data/competition_mapping.json"))
+
+# Prometheus metrics export (see src/metrics.py): local port serving /metrics
+# and/or a file rewritten every METRICS_INTERVAL seconds (unset disables each)
+METRICS_PORT = int(os.environ["METRICS_PORT"]) if os.getenv("METRICS_PORT") else None
+METRICS_FILE = Path(os.environ["METRICS_FILE"]) if os.getenv("METRICS_FILE") else None
+METRICS_INTERVAL = 15
+
+# Debug mode profiling the memory of each dashboard stage with tracemalloc
+# (MEMORY_PROFILE=1; slows every rerun down), stack frames traced per
+# allocation, and source lines listed per stage. With one frame, memory is
+# charged to the line allocating it (often inside pandas); deeper stacks, e.g.
+# 25, charge it to the dashboard line calling pandas, but slow reruns down
+# many times more
+MEMORY_PROFILE = os.getenv("MEMORY_PROFILE", "0") == "1"
+MEMORY_PROFILE_FRAMES = int(os.getenv("MEMORY_PROFILE_FRAMES", "1"))
+MEMORY_PROFILE_TOP_LINES = 10
+
 # Competition display name mappings
 # Maps internal slugs to user-friendly competition names
 COMPETITION_NAMES = {
@@ -78,6 +126,13 @@ DIFFICULTY_COLORS = {
 DIFFICULTY_CENTER = 48    # The neutral difficulty value (center point)
 COLOR_OPACITY = 2         # Multiplier for color intensity (higher = more vibrant)
 
+# Window lengths (in gameweeks) for the easiest fixture run analysis
+FIXTURE_RUN_WINDOWS = [3, 5, 8]
+
+# Fixture swing detection settings
+FIXTURE_SWING_BLOCK = 3         # Gameweeks compared on each side of a swing
+FIXTURE_SWING_THRESHOLD = 5.0   # Minimum change in average difficulty to flag
+
 # Player strength metric normalization settings
 STRENGTH_METRICS = {
     "Last_5_Score_Avg": {
@@ -124,5 +179,22 @@ DEFAULT_SOI_WEIGHTS = {
     "l15_form": 0.4,
     "next_5_diff": 0.2,
     "l5_mins": 0.1,
-    "l15_mins": 0.1
-}
\ No newline at end of file
+    "l15_mins": 0.1,
+    "rest_days": 0.0
+}
+# Lineup builder slots and the positions eligible for each
+# (a Sorare lineup: one per position plus an outfield extra)
+LINEUP_SLOTS = {
+    "Goalkeeper": ["Goalkeeper"],
+    "Defender": ["Defender"],
+    "Midfielder": ["Midfielder"],
+    "Forward": ["Forward"],
+    "Extra": ["Defender", "Midfielder", "Forward"]
+}
+
+# Monte Carlo simulation of gameweek scores: trials, seed, weight of L5 form
+# against L15 form, and score spread as a fraction of the expected score
+SIMULATION_TRIALS = int(os.getenv("SIMULATION_TRIALS", "20000"))
+SIMULATION_SEED = 42
+SIMULATION_FORM_WEIGHT = 0.5
+SIMULATION_SCORE_CV = 0.35
@@ -1,28 +1,50 @@
 import streamlit as st
 import pandas as pd
-from st_aggrid import AgGrid
 
 from src.config import (
     DATA_PATH,
     PLAYER_DATA_PATH,
+    COMPETITION_MAPPING_PATH,
     DIFFICULTY_CENTER,
     DIFFICULTY_COLORS,
     COLOR_OPACITY,
     STRENGTH_CENTER,
     STRENGTH_COLORS,
-    STRENGTH_OPACITY
+    STRENGTH_OPACITY,
+    FIXTURE_RUN_WINDOWS,
+    FIXTURE_SWING_BLOCK,
+    FIXTURE_SWING_THRESHOLD,
+    DATA_REFRESH_INTERVAL,
+    DATA_SOURCE_URL,
+    DATA_SOURCE_INTERVAL,
+    FIXTURE_STORE_PATH,
+    QUERY_ENGINE,
+    PLAYER_GRID_PAGE_SIZE,
+    LINEUP_SLOTS,
+    METRICS_PORT,
+    METRICS_FILE,
+    METRICS_INTERVAL,
+    MEMORY_PROFILE
 )
 
-from src.data import load_and_prepare_data, calculate_gameweeks, prepare_ranking_display
+from src.data_refresh import get_data_version, start_data_watcher
 from src.pivots import create_pivot_tables, prepare_grid_dataframe
-from src.grid import create_cell_style_js, configure_grid
-from src.player_data import load_player_data, normalize_strength_metrics, filter_players_by_gameweeks, calculate_soi, calculate_dynamic_fixture_difficulty
-from src.player_grid import create_strength_cell_style_js, configure_player_grid, prepare_player_grid_data
-from src.matchup_cohesion import (
-    find_best_matchup_cohesions,
-    prepare_cohesion_display_df,
-    create_matchup_detail_grid
+from src.query_engine import resolve_query_engine, select_fixtures
+from src.competitions import default_sorare_competition, load_competition_mapping
+from src.shards import (
+    load_fixture_shard_index,
+    load_fixture_shard,
+    load_player_shard,
+    competition_sources,
+    refresh_fixture_shards,
+    refresh_player_shards
 )
+from src.opponent_index import load_opponent_index
+from src.metrics import mark_section, start_metrics_exporter
+
+# AgGrid builders and section-specific modules (fixture runs, player pipeline,
+# cohesion, rotation planner) are imported where each section first needs
+# them, so importing the dashboard stays cheap on a cold worker.
 
 
 def main():
@@ -42,11 +64,41 @@ def main():
     
     st.markdown("<hr>", unsafe_allow_html=True)
 
-    # Load and prepare fixture data
+    # Filter and aggregation queries run on pandas unless DuckDB is configured and installed
+    engine = resolve_query_engine(QUERY_ENGINE)
+
+    # Download the data files from their HTTP source when one is configured;
+    # the file watcher below reloads them when they change
+    if DATA_SOURCE_URL:
+        from urllib.parse import quote
+        from src.data_source import FIXTURE_COLUMNS, PLAYER_COLUMNS, start_data_source
+        start_data_source(
+            {
+                path: (f"{DATA_SOURCE_URL.rstrip('/')}/{quote(path.name)}", columns)
+                for path, columns in ((DATA_PATH, FIXTURE_COLUMNS), (PLAYER_DATA_PATH, PLAYER_COLUMNS))
+            },
+            DATA_SOURCE_INTERVAL
+        )
+
+    # Load and prepare fixture data - only the shard index here, the selected
+    # Sorare competition is materialized once chosen
+    data_version = get_data_version(DATA_PATH)
+    # Competition mappings are applied per shard when loaded, so editing them
+    # regroups competitions without reparsing or resharding the data
+    mapping_version = get_data_version(COMPETITION_MAPPING_PATH)
     try:
-        df = load_and_prepare_data(DATA_PATH)
-        df = calculate_gameweeks(df)
-        df = prepare_ranking_display(df)
+        if FIXTURE_STORE_PATH is None:
+            shard_index = load_fixture_shard_index(DATA_PATH, data_version)
+            competition_mapping = load_competition_mapping(COMPETITION_MAPPING_PATH, mapping_version)
+        else:
+            from src.fixture_store import (
+                archive_fixture_file,
+                read_manifest,
+                format_snapshot,
+                load_fixture_snapshot
+            )
+            archive_fixture_file(DATA_PATH, data_version, FIXTURE_STORE_PATH)
+            snapshots = read_manifest(FIXTURE_STORE_PATH)["snapshots"]
     except FileNotFoundError:
         st.error(f"❌ Data file not found at: {DATA_PATH}")
         st.info("💡 Please ensure the CSV file is in the correct location.")
@@ -55,27 +107,59 @@ def main():
         st.error(f"❌ Error loading data: {str(e)}")
         st.stop()
 
-    # Load player data
-    try:
-        player_df = load_player_data(PLAYER_DATA_PATH)
-        # Don't normalize yet - will do it after filtering
-    except FileNotFoundError:
-        st.warning(f"⚠️ Player data file not found at: {PLAYER_DATA_PATH}")
-        st.info("💡 Player strength analysis will be unavailable.")
-        player_df = None
-    except Exception as e:
-        st.warning(f"⚠️ Error loading player data: {str(e)}")
-        player_df = None
+    # Reload changed data files in the background; sessions switch once the
+    # shard indexes and the default competition's shards are warm
+    if FIXTURE_STORE_PATH is None:
+        fixture_loader = refresh_fixture_shards
+    else:
+        def fixture_loader(path, version):
+            # Archive every refresh as a new snapshot of the store
+            archive_fixture_file(path, version, FIXTURE_STORE_PATH)
+            refresh_fixture_shards(path, version)
+    start_data_watcher(
+        {
+            DATA_PATH: fixture_loader,
+            PLAYER_DATA_PATH: refresh_player_shards,
+            COMPETITION_MAPPING_PATH: load_competition_mapping
+        },
+        DATA_REFRESH_INTERVAL
+    )
+    # Cache, rerun and memory metrics for Prometheus, when an export is configured
+    start_metrics_exporter(METRICS_PORT, METRICS_FILE, METRICS_INTERVAL)
 
     # Sidebar filters with icons
     st.sidebar.markdown("## 🎯 Filters")
 
+    if FIXTURE_STORE_PATH is not None:
+        # Snapshot filter - the latest refresh by default, older ones for backtesting
+        snapshot = st.sidebar.selectbox(
+            "🕰️ Data Snapshot",
+            [entry["id"] for entry in reversed(snapshots)],
+            format_func=format_snapshot,
+            help="View the fixture data as it was at an earlier refresh"
+        )
+        snapshot_entry = next(entry for entry in snapshots if entry["id"] == snapshot)
+
+        # Gameweek range read from the store - only these partitions are opened
+        snapshot_gameweeks = sorted(int(gameweek) for gameweek in snapshot_entry["gameweeks"])
+        gameweek_range = (snapshot_gameweeks[0], snapshot_gameweeks[-1]) if snapshot_gameweeks else None
+        if len(snapshot_gameweeks) > 1:
+            gameweek_range = st.sidebar.select_slider(
+                "📆 Gameweek Range",
+                snapshot_gameweeks,
+                value=gameweek_range,
+                format_func=lambda x: f"GW {x}",
+                help="Load only these gameweeks of the snapshot"
+            )
+
     # Sorare Competition filter (first level - single select)
-    sorare_competitions = sorted(df["Sorare_Competition"].dropna().unique())
+    if FIXTURE_STORE_PATH is None:
+        sorare_competitions = sorted(competition_sources(shard_index, competition_mapping))
+    else:
+        sorare_competitions = snapshot_entry["competitions"]
     
     # Set default to Contender if available, otherwise first option
-    default_sorare = "Contender" if "Contender" in sorare_competitions else sorare_competitions[0]
-    default_index = sorare_competitions.index(default_sorare)
+    default_index = sorare_competitions.index(default_sorare_competition(sorare_competitions))
     
     selected_sorare_comp = st.sidebar.selectbox(
         "🏆 Sorare Competition",
@@ -84,6 +168,53 @@ def main():
         help="Filter by Sorare competition group"
     )
     
+    # Shared across sessions by reference - never modify df in place
+    if FIXTURE_STORE_PATH is None:
+        df = load_fixture_shard(
+            DATA_PATH,
+            data_version,
+            selected_sorare_comp,
+            mapping_version=mapping_version
+        )
+    else:
+        # Read only this competition's partitions of the snapshot
+        df = load_fixture_snapshot(FIXTURE_STORE_PATH, selected_sorare_comp, snapshot, gameweek_range)
+
+    # Identifies the loaded fixture frame in the caches derived from it
+    fixture_key = (
+        data_version,
+        (snapshot, gameweek_range) if FIXTURE_STORE_PATH is not None else None,
+        selected_sorare_comp,
+        mapping_version
+    )
+
+    # Opponent -> fixtures lookup, built once per loaded frame
+    opponent_index = load_opponent_index(df, fixture_key)
+
+    # Load player data for the clubs in the selected Sorare competition
+    player_version = get_data_version(PLAYER_DATA_PATH)
+    # Identifies the fixture and player frames behind the cached player pools
+    pool_key = fixture_key + (player_version,)
+    try:
+        player_df = load_player_shard(
+            PLAYER_DATA_PATH,
+            player_version,
+            DATA_PATH,
+            data_version,
+            selected_sorare_comp,
+            mapping_version=mapping_version
+        )
+        # Don't normalize yet - will do it after filtering
+    except FileNotFoundError:
+        st.warning(f"⚠️ Player data file not found at: {PLAYER_DATA_PATH}")
+        st.info("💡 Player strength analysis will be unavailable.")
+        player_df = None
+    except Exception as e:
+        st.warning(f"⚠️ Error loading player data: {str(e)}")
+        player_df = None
+
+    mark_section("load")
+
     # Filter data by Sorare Competition
     df_sorare_filtered = df[df["Sorare_Competition"] == selected_sorare_comp]
 
@@ -141,49 +272,61 @@ def main():
     st.sidebar.markdown("---")
     st.sidebar.markdown("### ⚖️ SOI Weights")
     
-    soi_weights = {
-        "l5_form": st.sidebar.slider(
-            "L5 Form Weight",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.2,
-            step=0.05,
-            help="Weight for Last 5 games form"
-        ),
-        "l15_form": st.sidebar.slider(
-            "L15 Form Weight",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.4,
-            step=0.05,
-            help="Weight for Last 15 games form"
-        ),
-        "next_5_diff": st.sidebar.slider(
-            "Next 5 Diff Weight",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.2,
-            step=0.05,
-            help="Weight for upcoming opponent difficulty"
-        ),
-        "l5_mins": st.sidebar.slider(
-            "L5 Minutes Weight",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.1,
-            step=0.05,
-            help="Weight for Last 5 games minutes"
-        ),
-        "l15_mins": st.sidebar.slider(
-            "L15 Minutes Weight",
-            min_value=0.0,
-            max_value=1.0,
-            value=0.1,
-            step=0.05,
-            help="Weight for Last 15 games minutes"
-        )
-    }
-    
+    # Weights are fine-tuned live in the player grid; the form keeps slider
+    # moves from rerunning the script until they are saved
+    with st.sidebar.form("soi_weights"):
+        soi_weights = {
+            "l5_form": st.slider(
+                "L5 Form Weight",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.2,
+                step=0.05,
+                help="Weight for Last 5 games form"
+            ),
+            "l15_form": st.slider(
+                "L15 Form Weight",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.4,
+                step=0.05,
+                help="Weight for Last 15 games form"
+            ),
+            "next_5_diff": st.slider(
+                "Next 5 Diff Weight",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.2,
+                step=0.05,
+                help="Weight for upcoming opponent difficulty"
+            ),
+            "l5_mins": st.slider(
+                "L5 Minutes Weight",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.1,
+                step=0.05,
+                help="Weight for Last 5 games minutes"
+            ),
+            "l15_mins": st.slider(
+                "L15 Minutes Weight",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.1,
+                step=0.05,
+                help="Weight for Last 15 games minutes"
+            ),
+            "rest_days": st.slider(
+                "Rest Days Weight",
+                min_value=0.0,
+                max_value=1.0,
+                value=0.0,
+                step=0.05,
+                help="Weight for days of rest before the selected fixtures (fixture congestion drives rotation)"
+            )
+        }
+        st.form_submit_button("💾 Save Weights", use_container_width=True)
+
     # Show total weight
     total_weight = sum(soi_weights.values())
     if abs(total_weight - 1.0) > 0.01:
@@ -191,21 +334,38 @@ def main():
     else:
         st.sidebar.success(f"✅ Weights sum to {total_weight:.2f}")
 
-    df_filtered = df_filtered[df_filtered["Game Week"].isin(selected_gameweeks)]
+    df_filtered = select_fixtures(
+        df,
+        engine,
+        selected_sorare_comp,
+        selected_competitions,
+        [position],
+        selected_gameweeks
+    )
+
+    mark_section("filters")
 
     # Create pivot tables
-    value_pivot, label_pivot, opponent_pivot = create_pivot_tables(df_filtered, metric)
+    value_pivot, label_pivot, opponent_pivot, count_pivot = create_pivot_tables(df_filtered, metric, engine)
+
+    mark_section("pivots")
 
     # Prepare grid dataframe
     grid_df, gw_columns = prepare_grid_dataframe(
         value_pivot,
         label_pivot,
         opponent_pivot,
+        count_pivot,
         df_filtered,
         selected_gameweeks
     )
 
+    mark_section("grid_frame")
+
     # Create cell styling
+    from st_aggrid import AgGrid
+    from src.grid import create_cell_style_js, configure_grid
+
     cell_js = create_cell_style_js(
         DIFFICULTY_CENTER,
         DIFFICULTY_COLORS,
@@ -246,47 +406,144 @@ def main():
     # Get selected rows
     selected_rows = grid_response['selected_rows']
     
+    mark_section("team_grid")
+
+    # ============================================================
+    # EASIEST FIXTURE RUNS
+    # ============================================================
+    
+    from src.fixture_runs import (
+        calculate_window_difficulty,
+        prepare_window_display_df,
+        calculate_fixture_swings,
+        prepare_swing_display_df
+    )
+    
+    df_runs = select_fixtures(
+        df,
+        engine,
+        selected_sorare_comp,
+        selected_competitions,
+        gameweeks=selected_gameweeks
+    )
+    
+    with st.expander("📈 Easiest Fixture Runs", expanded=False):
+        window_df = calculate_window_difficulty(df_runs, metric, selected_gameweeks, FIXTURE_RUN_WINDOWS)
+        runs_display_df = prepare_window_display_df(window_df, position)
+        
+        if runs_display_df.empty:
+            st.info("ℹ️ Select more gameweeks to compare fixture runs.")
+        else:
+            st.markdown(f"*Best starting gameweek for each run length at **{position}** (higher average is easier)*")
+            st.dataframe(
+                runs_display_df,
+                hide_index=True,
+                use_container_width=True,
+                height=400
+            )
+    
+    with st.expander("🔀 Fixture Swings", expanded=False):
+        swing_df = calculate_fixture_swings(
+            df_runs,
+            metric,
+            selected_gameweeks,
+            FIXTURE_SWING_BLOCK,
+            FIXTURE_SWING_THRESHOLD
+        )
+        swing_display_df = prepare_swing_display_df(swing_df, position)
+        
+        if swing_display_df.empty:
+            st.info(f"ℹ️ No fixture swings of {FIXTURE_SWING_THRESHOLD:g}+ found for the selected gameweeks.")
+        else:
+            st.markdown(
+                f"*Teams at **{position}** whose average difficulty changes by {FIXTURE_SWING_THRESHOLD:g}+ "
+                f"between the {FIXTURE_SWING_BLOCK} gameweeks before and after a gameweek*"
+            )
+            st.dataframe(
+                swing_display_df,
+                hide_index=True,
+                use_container_width=True,
+                height=400
+            )
+    
+    with st.expander("🎯 Teams Facing Opponents", expanded=False):
+        from src.opponent_index import find_teams_facing, prepare_opponent_display_df
+        
+        selected_opponents = st.multiselect(
+            "🆚 Opponents",
+            sorted(opponent_index["opponents"]),
+            help="Find every team facing any of these opponents in the selected gameweeks",
+            key="facing_opponents"
+        )
+        
+        if not selected_opponents:
+            st.info("ℹ️ Select one or more opponents, e.g. the weakest teams in the league.")
+        else:
+            facing_df = find_teams_facing(
+                opponent_index,
+                selected_opponents,
+                gameweeks=selected_gameweeks,
+                competitions=selected_competitions,
+                positions=[position]
+            )
+            facing_display_df = prepare_opponent_display_df(facing_df, metric)
+            
+            if facing_display_df.empty:
+                st.info("ℹ️ No team faces the selected opponents in the selected gameweeks.")
+            else:
+                st.markdown(
+                    f"*Fixtures against the selected opponents at **{position}**, easiest first within each gameweek*"
+                )
+                st.dataframe(
+                    facing_display_df,
+                    hide_index=True,
+                    use_container_width=True,
+                    height=400
+                )
+    
+    mark_section("fixture_analysis")
+
     # ============================================================
     # PLAYER STRENGTH DASHBOARD (SECOND DASHBOARD)
     # ============================================================
     
     if player_df is not None:
+        from src.player_data import score_player_pool
+        from src.player_grid import (
+            PLAYER_SORT_COLUMNS,
+            create_strength_cell_style_js,
+            configure_player_grid,
+            page_player_pool,
+            prepare_player_grid_data
+        )
+        
         st.markdown("---")
         
         st.markdown("## 👥 Sorare Opportunity Index")
         st.markdown("### Players from teams playing in selected gameweeks")
         st.markdown("<hr>", unsafe_allow_html=True)
         
-        # Filter players by selected gameweeks and filters
-        players_filtered = filter_players_by_gameweeks(
-            player_df,
-            df,
-            selected_gameweeks,
-            selected_competitions,
-            position
-        )
-        
         # Further filter by selected teams if any rows are selected in the fixture grid
+        selected_teams = None
         if selected_rows is not None and len(selected_rows) > 0:
-            selected_teams = selected_rows['Name'].tolist()
+            selected_teams = tuple(selected_rows['Name'].tolist())
             st.info(f"🎯 Showing players from {len(selected_teams)} selected team(s)")
-            players_filtered = players_filtered[players_filtered['Club'].isin(selected_teams)]
         
-        # Calculate dynamic fixture difficulty based on team fixture data and selected gameweeks
-        players_filtered = calculate_dynamic_fixture_difficulty(
-            players_filtered,
+        # Filter, normalize (percentile within filters) and score the pool -
+        # cached, so paging and sorting below only slice it
+        players_filtered = score_player_pool(
+            player_df,
             df,
-            selected_gameweeks,
-            selected_competitions,
-            metric
+            pool_key,
+            tuple(selected_gameweeks),
+            tuple(selected_competitions),
+            position,
+            metric,
+            tuple(soi_weights.items()),
+            clubs=selected_teams,
+            engine=engine
         )
         
-        # Normalize strength metrics based on filtered player pool (percentile within filters)
-        players_filtered = normalize_strength_metrics(players_filtered)
-        
-        # Calculate SOI with user-defined weights
-        players_filtered = calculate_soi(players_filtered, soi_weights)
-        
         if players_filtered.empty:
             st.info("ℹ️ No players found for the selected filters and gameweeks.")
         else:
@@ -303,8 +560,37 @@ def main():
 #            
 #            st.markdown("---")
             
+            # Only one page of the pool is sent to the grid
+            sort_options = [col for col in PLAYER_SORT_COLUMNS if col in players_filtered.columns]
+            page_count = -(-len(players_filtered) // PLAYER_GRID_PAGE_SIZE)
+            col_sort, col_page = st.columns(2)
+            with col_sort:
+                sort_column = st.selectbox(
+                    "↕️ Sort Players By",
+                    sort_options,
+                    format_func=PLAYER_SORT_COLUMNS.get,
+                    help="Strongest players first",
+                    key="player_sort"
+                )
+            with col_page:
+                page = st.number_input(
+                    "📄 Page",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    key=f"player_page_{sort_column}_{page_count}"
+                )
+            first = (page - 1) * PLAYER_GRID_PAGE_SIZE
+            st.caption(
+                f"Players {first + 1}–{min(first + PLAYER_GRID_PAGE_SIZE, len(players_filtered))} "
+                f"of {len(players_filtered)}"
+                + (" - save new SOI weights in the sidebar to rescore every page" if page_count > 1 else "")
+            )
+            
             # Prepare player grid
-            player_grid_df, strength_cols = prepare_player_grid_data(players_filtered)
+            player_grid_df, strength_cols = prepare_player_grid_data(
+                page_player_pool(players_filtered, sort_column, page - 1, PLAYER_GRID_PAGE_SIZE)
+            )
             
             # Create strength cell styling
             strength_cell_js = create_strength_cell_style_js(
@@ -319,7 +605,11 @@ def main():
                 strength_cols,
                 strength_cell_js,
                 STRENGTH_COLORS,
-                STRENGTH_OPACITY
+                STRENGTH_OPACITY,
+                # Live weights only rescore the rows in the grid, so they
+                # are offered only when it holds the whole pool
+                soi_weights=soi_weights if page_count == 1 else None,
+                sort_column=sort_column
             )
             
             # Display player grid
@@ -332,11 +622,148 @@ def main():
                 update_mode="NO_UPDATE",
                 fit_columns_on_grid_load=False
             )
+        
+        # Lineup builder over the SOI of every position's pool
+        with st.expander("🏗️ Lineup Builder", expanded=False):
+            from src.lineup_builder import find_best_lineups
+            from src.player_data import calculate_dynamic_fixture_difficulty
+            
+            st.markdown(
+                "*Lineups with the highest total SOI: one player per slot, "
+                "from clubs playing in the chosen gameweek*"
+            )
+            
+            col_gw, col_club, col_top = st.columns(3)
+            with col_gw:
+                lineup_gameweek = st.selectbox(
+                    "📅 Gameweek",
+                    selected_gameweeks,
+                    format_func=lambda x: f"GW {x}",
+                    key="lineup_gameweek"
+                )
+            with col_club:
+                lineup_max_per_club = st.slider(
+                    "Max Players per Club",
+                    min_value=1,
+                    max_value=len(LINEUP_SLOTS),
+                    value=2,
+                    key="lineup_max_per_club"
+                )
+            with col_top:
+                lineup_top_n = st.number_input(
+                    "Lineups to Show",
+                    min_value=1,
+                    max_value=10,
+                    value=3,
+                    key="lineup_top_n"
+                )
+            
+            # Each position is scored within its own pool, as in the grid above
+            lineup_positions = sorted({pos for slot_positions in LINEUP_SLOTS.values() for pos in slot_positions})
+            lineup_players = pd.concat([
+                score_player_pool(
+                    player_df,
+                    df,
+                    pool_key,
+                    tuple(selected_gameweeks),
+                    tuple(selected_competitions),
+                    lineup_position,
+                    metric,
+                    tuple(soi_weights.items()),
+                    clubs=selected_teams,
+                    engine=engine
+                )
+                for lineup_position in lineup_positions
+            ], ignore_index=True)
+            gameweek_fixtures = select_fixtures(
+                df,
+                engine,
+                competitions=selected_competitions,
+                gameweeks=[lineup_gameweek]
+            )
+            
+            lineup_df = find_best_lineups(
+                lineup_players,
+                max_per_club=lineup_max_per_club,
+                clubs=gameweek_fixtures["Name"].unique(),
+                top_n=lineup_top_n
+            )
+            
+            if lineup_df.empty:
+                st.info("ℹ️ Not enough players to fill every lineup slot in this gameweek.")
+            else:
+                from src.simulation import build_score_model, simulate_players, simulate_lineups
+                
+                lineup_threshold = st.number_input(
+                    "🎯 Lineup Score Target",
+                    min_value=0,
+                    max_value=500,
+                    value=250,
+                    step=10,
+                    help="Simulated probability of the lineup scoring at least this much in the gameweek",
+                    key="lineup_threshold"
+                )
+                
+                # Simulate the gameweek against each player's fixtures in it
+                lineup_labels = sorted({label for players in lineup_df["players"] for label in players})
+                gameweek_players = calculate_dynamic_fixture_difficulty(
+                    lineup_players.loc[lineup_labels].drop(columns="Dynamic_Fixture_Difficulty"),
+                    df,
+                    [lineup_gameweek],
+                    selected_competitions,
+                    metric,
+                    engine
+                ).set_axis(lineup_labels)
+                score_model = build_score_model(gameweek_players, gameweek_fixtures)
+                lineup_outcomes = simulate_lineups(score_model, list(lineup_df["players"]), lineup_threshold)
+                
+                lineup_display_df = lineup_df.drop(columns="players").rename(columns={
+                    "rank": "Rank",
+                    "total_soi": "Total SOI"
+                }).round({"Total SOI": 2})
+                lineup_display_df.insert(2, "Expected", lineup_outcomes["expected"].round(1).to_numpy())
+                lineup_display_df.insert(3, "P10", lineup_outcomes["p10"].round(1).to_numpy())
+                lineup_display_df.insert(4, f"P(≥ {lineup_threshold})", lineup_outcomes["prob_threshold"].map("{:.0%}".format).to_numpy())
+                
+                st.dataframe(
+                    lineup_display_df,
+                    hide_index=True,
+                    use_container_width=True
+                )
+                
+                # Per-player outcomes against an even share of the target
+                player_threshold = lineup_threshold / len(LINEUP_SLOTS)
+                player_outcomes = simulate_players(score_model, player_threshold)
+                player_outcomes_df = pd.DataFrame({
+                    "Player": gameweek_players["displayName"],
+                    "Club": gameweek_players["Club"],
+                    "Position": gameweek_players["Position"],
+                    "Games": score_model["games"],
+                    "Expected": player_outcomes["expected"].round(1),
+                    "P10": player_outcomes["p10"].round(1),
+                    "P25": player_outcomes["p25"].round(1),
+                    f"P(≥ {player_threshold:g})": player_outcomes["prob_threshold"].map("{:.0%}".format)
+                }).sort_values("Expected", ascending=False)
+                
+                st.markdown("*🎲 Simulated gameweek scores of the lineup players*")
+                st.dataframe(
+                    player_outcomes_df,
+                    hide_index=True,
+                    use_container_width=True
+                )
     
+    mark_section("players")
+
     # ============================================================
     # MATCHUP COHESION DASHBOARD (THIRD DASHBOARD)
     # ============================================================
     
+    from src.matchup_cohesion import (
+        find_best_matchup_cohesions,
+        prepare_cohesion_display_df,
+        create_matchup_detail_grid
+    )
+    
     st.markdown("---")
     
     st.markdown("## 🔄 Matchup Cohesion Analysis")
@@ -374,11 +801,14 @@ def main():
     else:
         # Filter data for cohesion analysis using the cohesion-specific position filter
         # Start with data already filtered by Sorare Competition and Competitions
-        df_cohesion = df_sorare_filtered[
-            (df_sorare_filtered["Competition_Display"].isin(selected_competitions)) &
-            (df_sorare_filtered["Position"].isin(cohesion_positions)) &
-            (df_sorare_filtered["Game Week"].isin(selected_gameweeks))
-        ]
+        df_cohesion = select_fixtures(
+            df,
+            engine,
+            selected_sorare_comp,
+            selected_competitions,
+            cohesion_positions,
+            selected_gameweeks
+        )
         
         # Get all teams from the cohesion-filtered data
         available_teams = sorted(df_cohesion["Name"].unique())
@@ -572,8 +1002,45 @@ def main():
                     selection_mode="multi-row"
                 )
                 
+                # Week-by-week comparison of the primary team and selected partners
+                if cohesion_response.selection.rows:
+                    compare_teams = [primary_team] + display_df.iloc[cohesion_response.selection.rows]["Team Match"].tolist()
+                    detail_df = create_matchup_detail_grid(
+                        df_cohesion,
+                        compare_teams,
+                        selected_gameweeks,
+                        metric,
+                        cohesion_positions
+                    )
+                    
+                    # Show one "Opponent (H/A) difficulty" cell per team
+                    comparison_df = pd.DataFrame({"Gameweek": detail_df["gameweek"].map(lambda gw: f"GW {gw}")})
+                    for i, team in enumerate(compare_teams, start=1):
+                        team_difficulty = detail_df[f"team{i}_difficulty"].round(1)
+                        comparison_df[team] = (
+                            detail_df[f"team{i}_opponent"] + " (" + detail_df[f"team{i}_location"] + ") "
+                            + team_difficulty.astype(str)
+                        ).where(team_difficulty.notna(), "-")
+                    comparison_df["Best Choice"] = detail_df["best_choice"]
+                    
+                    st.markdown("### 📅 Week-by-Week Comparison")
+                    st.dataframe(
+                        comparison_df,
+                        hide_index=True,
+                        use_container_width=True
+                    )
+                
                 # SOI Filter based on selected teams
                 if player_df is not None and cohesion_response.selection.rows:
+                    from src.player_data import score_player_pool
+                    from src.player_grid import (
+                        PLAYER_SORT_COLUMNS,
+                        create_strength_cell_style_js,
+                        configure_player_grid,
+                        page_player_pool,
+                        prepare_player_grid_data
+                    )
+                    
                     selected_indices = cohesion_response.selection.rows
                     selected_teams = display_df.iloc[selected_indices]["Team Match"].tolist()
                     
@@ -584,38 +1051,55 @@ def main():
                     st.markdown("## 👥 Sorare Opportunity Index - Filtered by Selected Teams")
                     st.markdown(f"### Players from: {', '.join(all_selected_teams)}")
                     
-                    # Filter players by selected teams and cohesion positions  
-                    players_filtered = filter_players_by_gameweeks(
+                    # Filter players by selected teams and cohesion positions, then
+                    # normalize (percentile within filters) and score - cached
+                    players_filtered = score_player_pool(
                         player_df,
                         df,
-                        selected_gameweeks,
-                        selected_competitions,
-                        cohesion_positions[0] if len(cohesion_positions) == 1 else position  # Use cohesion position if single, else sidebar
-                    )
-                    
-                    # Filter by selected teams
-                    players_filtered = players_filtered[players_filtered['Club'].isin(all_selected_teams)]
-                    
-                    # Calculate dynamic fixture difficulty based on team fixture data and selected gameweeks
-                    players_filtered = calculate_dynamic_fixture_difficulty(
-                        players_filtered,
-                        df,
-                        selected_gameweeks,
-                        selected_competitions,
-                        metric
+                        pool_key,
+                        tuple(selected_gameweeks),
+                        tuple(selected_competitions),
+                        cohesion_positions[0] if len(cohesion_positions) == 1 else position,  # Use cohesion position if single, else sidebar
+                        metric,
+                        tuple(soi_weights.items()),
+                        clubs=tuple(all_selected_teams),
+                        engine=engine
                     )
                     
-                    # Normalize strength metrics based on filtered player pool (percentile within filters)
-                    players_filtered = normalize_strength_metrics(players_filtered)
-                    
-                    # Calculate SOI with user-defined weights
-                    players_filtered = calculate_soi(players_filtered, soi_weights)
-                    
                     if players_filtered.empty:
                         st.info("ℹ️ No players found for the selected teams and filters.")
                     else:
+                        # Only one page of the pool is sent to the grid
+                        sort_options = [col for col in PLAYER_SORT_COLUMNS if col in players_filtered.columns]
+                        page_count = -(-len(players_filtered) // PLAYER_GRID_PAGE_SIZE)
+                        col_sort, col_page = st.columns(2)
+                        with col_sort:
+                            sort_column = st.selectbox(
+                                "↕️ Sort Players By",
+                                sort_options,
+                                format_func=PLAYER_SORT_COLUMNS.get,
+                                help="Strongest players first",
+                                key="cohesion_player_sort"
+                            )
+                        with col_page:
+                            page = st.number_input(
+                                "📄 Page",
+                                min_value=1,
+                                max_value=page_count,
+                                value=1,
+                                key=f"cohesion_player_page_{sort_column}_{page_count}"
+                            )
+                        first = (page - 1) * PLAYER_GRID_PAGE_SIZE
+                        st.caption(
+                            f"Players {first + 1}–{min(first + PLAYER_GRID_PAGE_SIZE, len(players_filtered))} "
+                            f"of {len(players_filtered)}"
+                            + (" - save new SOI weights in the sidebar to rescore every page" if page_count > 1 else "")
+                        )
+                        
                         # Prepare player grid
-                        player_grid_df, strength_cols = prepare_player_grid_data(players_filtered)
+                        player_grid_df, strength_cols = prepare_player_grid_data(
+                            page_player_pool(players_filtered, sort_column, page - 1, PLAYER_GRID_PAGE_SIZE)
+                        )
                         
                         # Create strength cell styling
                         strength_cell_js = create_strength_cell_style_js(
@@ -630,7 +1114,9 @@ def main():
                             strength_cols,
                             strength_cell_js,
                             STRENGTH_COLORS,
-                            STRENGTH_OPACITY
+                            STRENGTH_OPACITY,
+                            soi_weights=soi_weights if page_count == 1 else None,
+                            sort_column=sort_column
                         )
                         
                         # Display player grid
@@ -643,8 +1129,67 @@ def main():
                             update_mode="NO_UPDATE",
                             fit_columns_on_grid_load=False
                         )
+            
+            # Rotation planner over the same cohesion-filtered team pool
+            with st.expander("🧩 Rotation Planner", expanded=False):
+                from src.rotation_planner import find_best_rotation_sets
+                
+                st.markdown(
+                    "*Team sets whose easiest fixture each gameweek gives the lowest total difficulty. "
+                    "Gameweeks where no team in the set plays count as the hardest difficulty.*"
+                )
+                
+                col_size, col_top = st.columns(2)
+                with col_size:
+                    rotation_size = st.slider(
+                        "Teams per Set",
+                        min_value=2,
+                        max_value=5,
+                        value=3,
+                        help="Number of teams to rotate between",
+                        key="rotation_set_size"
+                    )
+                with col_top:
+                    rotation_top_n = st.number_input(
+                        "Top N Sets",
+                        min_value=1,
+                        max_value=25,
+                        value=10,
+                        help="Number of best team sets to show",
+                        key="rotation_top_n"
+                    )
+                
+                with st.spinner("Searching team rotations..."):
+                    rotation_df = find_best_rotation_sets(
+                        df_cohesion,
+                        selected_gameweeks,
+                        metric,
+                        cohesion_positions,
+                        rotation_size,
+                        top_n=rotation_top_n
+                    )
+                
+                if rotation_df.empty:
+                    st.info("ℹ️ Not enough teams for the selected set size.")
+                else:
+                    rotation_display_df = rotation_df.rename(columns={
+                        "rank": "Rank",
+                        "teams": "Teams",
+                        "total_difficulty": "Total Difficulty",
+                        "avg_difficulty": "Avg Difficulty",
+                        "blank_gameweeks": "Blank GWs"
+                    }).round({"Total Difficulty": 1, "Avg Difficulty": 1})
+                    
+                    st.dataframe(
+                        rotation_display_df,
+                        hide_index=True,
+                        use_container_width=True,
+                        height=400
+                    )
 
     
+    mark_section("cohesion")
+
     # Footer with color legend - stacked on mobile
     st.markdown("---")
     st.markdown("### 🎨 Color Legend")
@@ -675,4 +1220,47 @@ def main():
             'margin-bottom: 0.5rem;">'
             'Weak/Hard</div>',
             unsafe_allow_html=True
-        )
\ No newline at end of file
+        )
+
+    mark_section("legend")
+
+    # Memory debug mode: stages of this session's previous rerun (the current
+    # one is still running)
+    if MEMORY_PROFILE:
+        from src.memory_profile import last_report
+
+        with st.expander("🧠 Memory Profile", expanded=False):
+            report = last_report()
+            if report is None:
+                st.info("💡 The memory profile of the previous rerun shows here from the next rerun.")
+            else:
+                st.markdown(
+                    f"**Previous rerun retained:** {report['net_bytes'] / 2 ** 20:+.2f} MiB · "
+                    f"**Session total:** {report['session_retained_bytes'] / 2 ** 20:+.2f} MiB"
+                )
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "Stage": stage["stage"],
+                            "Retained (MiB)": stage["net_bytes"] / 2 ** 20,
+                            "Peak (MiB)": stage["peak_bytes"] / 2 ** 20
+                        }
+                        for stage in report["stages"]
+                    ]),
+                    hide_index=True,
+                    use_container_width=True
+                )
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "Stage": stage["stage"],
+                            "Line": line["line"],
+                            "Retained (MiB)": line["net_bytes"] / 2 ** 20,
+                            "Blocks": line["blocks"]
+                        }
+                        for stage in report["stages"]
+                        for line in stage["top_lines"]
+                    ]),
+                    hide_index=True,
+                    use_container_width=True
+                )
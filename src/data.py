@@ -1,15 +1,184 @@
+import io
+import logging
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-from src.config import COMPETITION_NAMES, SORARE_COMPETITION_MAPPING
+from src.competitions import COMPETITION_NAME_COLUMN, apply_competition_mapping
+from src.metrics import track_cache
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows, in days, of the match counts in `calculate_congestion`
+CONGESTION_WINDOWS = (7, 14)
+CONGESTION_COLUMNS = ["Rest_Days"] + [f"Matches_{window}d" for window in CONGESTION_WINDOWS]
+
+_EPOCH = pd.Timestamp(0, tz="UTC")
+
+# File path -> prepared frame of the last load and the CSV lines behind its rows,
+# used to prepare only the changed rows when the file is refreshed
+_fixture_snapshots = {}
+
+
+@track_cache(st.cache_resource(max_entries=2))
+def load_fixture_data(file_path, version=None):
+    """
+    Load the fixture data with gameweeks and ranking display columns.
+    
+    Cached as a resource, so every session shares the same DataFrame by
+    reference instead of receiving its own copy. Callers must treat it as
+    read-only: filter, select or `assign` to derive new frames, never add
+    columns or modify values in place.
+    
+    When a previous version of the same file has been loaded, only the lines
+    that changed are parsed and prepared (see `_patch_fixture_data`); a full
+    reload is the fallback.
+    
+    Args:
+        file_path: Path to the CSV file
+        version: Cache key for the file contents (see data_refresh.file_version),
+            so a refreshed file is loaded as a new entry
+        
+    Returns:
+        Prepared DataFrame shared across sessions
+    """
+    with open(file_path, encoding="utf-8-sig") as f:
+        text = f.read()
+    lines = text.splitlines()
+    header, rows = (lines[0], lines[1:]) if lines else ("", [])
+    keys = _row_keys(rows)
+
+    snapshot = _fixture_snapshots.get(str(file_path))
+    df = None
+    if snapshot is not None and rows and snapshot["header"] == header:
+        # Rewritten with the same lines, possibly reordered: nothing to prepare
+        if np.array_equal(np.sort(keys), np.sort(snapshot["row_keys"])):
+            return snapshot["frame"]
+        df = _patch_fixture_data(snapshot, header, rows, keys)
+
+    if df is None:
+        df = load_and_prepare_data(io.StringIO(text))
+        if len(df) != len(rows):
+            # Blank lines or quoted line breaks: rows cannot be matched to lines,
+            # so this file is always reloaded in full
+            _fixture_snapshots.pop(str(file_path), None)
+            return calculate_congestion(prepare_ranking_display(calculate_gameweeks(df)))
+        df = df.assign(_row_key=keys, _source_gw=df["Game Week"])
+        df = calculate_congestion(prepare_ranking_display(calculate_gameweeks(df)))
+
+    frame = df.drop(columns=["_row_key", "_source_gw"])
+    _fixture_snapshots[str(file_path)] = {
+        "header": header,
+        "frame": frame,
+        "anchor": _gameweek_anchor(df["_source_gw"], df["Date"]),
+        "row_keys": df["_row_key"].to_numpy(),
+        "source_gw": df["_source_gw"].to_numpy()
+    }
+    return frame
+
+
+def _row_keys(rows):
+    """
+    Identify CSV lines by their hash and occurrence number.
+    
+    Repeated lines get distinct keys, so duplicated fixtures are matched one
+    to one. Python string hashes are salted per process, which is fine for
+    snapshots that never leave it.
+    
+    Args:
+        rows: List of CSV data lines
+        
+    Returns:
+        uint64 array with one key per line
+    """
+    hashes = np.fromiter(map(hash, rows), dtype=np.int64, count=len(rows)).view(np.uint64)
+    occurrence = pd.Series(hashes).groupby(hashes, sort=False).cumcount().to_numpy(np.uint64)
+    return hashes + occurrence * np.uint64(0x9E3779B97F4A7C15)
+
+
+def _patch_fixture_data(snapshot, header, rows, keys):
+    """
+    Rebuild the prepared fixture data from the previous load.
+    
+    Every prepared column depends only on its own row, except the gameweek,
+    which is numbered from the earliest fixture in the file, and the
+    congestion metrics, which depend on each team's other fixtures. Rows whose
+    line is unchanged are therefore reused as they are and only new or changed
+    lines are parsed and prepared. Gameweeks are numbered for the new rows
+    only, unless the earliest fixture changed, and congestion is recalculated
+    for the teams with added or removed rows. Rows whose line disappeared are
+    dropped.
+    
+    Args:
+        snapshot: State of the previous load (see `_fixture_snapshots`)
+        header: CSV header line, identical to the snapshot's
+        rows: CSV data lines of the new file
+        keys: Row keys of `rows` (see `_row_keys`)
+        
+    Returns:
+        Prepared DataFrame with `_row_key` and `_source_gw` columns, or None
+        if the changed lines cannot be matched to parsed rows
+    """
+    previous = snapshot["frame"]
+    positions = pd.Index(snapshot["row_keys"]).get_indexer(keys)
+    changed = positions < 0
+    reused = positions[~changed]
+
+    frames = [previous.take(reused).assign(
+        _row_key=keys[~changed],
+        _source_gw=snapshot["source_gw"][reused]
+    )]
+    if changed.any():
+        changed_rows = [rows[i] for i in np.flatnonzero(changed)]
+        new = load_and_prepare_data(io.StringIO("\n".join([header] + changed_rows)))
+        if len(new) != len(changed_rows):
+            return None
+        frames.append(prepare_ranking_display(new.assign(_row_key=keys[changed], _source_gw=new["Game Week"])))
+
+        logger.info("Prepared %d changed fixture rows for %d teams", len(new), new["Name"].nunique())
+
+    anchor = _gameweek_anchor(
+        pd.concat([frame["_source_gw"] for frame in frames]),
+        pd.concat([frame["Date"] for frame in frames])
+    )
+    if anchor == snapshot["anchor"]:
+        frames[1:] = [calculate_gameweeks(frame, anchor) for frame in frames[1:]]
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.concat(frames, ignore_index=True)
+        df = calculate_gameweeks(df.assign(**{"Game Week": df["_source_gw"]}))
+
+    # Rows of the new and reused frames have different categories, which
+    # concat turns into objects: restore the categories a full load has
+    for column, dtype in previous.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category").cat.remove_unused_categories()
+
+    dropped = np.ones(len(previous), dtype=bool)
+    dropped[reused] = False
+    teams = pd.concat([frame["Name"] for frame in frames[1:]] + [previous["Name"][dropped]]).dropna().unique()
+    affected = df["Name"].isin(teams).to_numpy()
+    if affected.any():
+        df.loc[affected, CONGESTION_COLUMNS] = calculate_congestion(df[affected])[CONGESTION_COLUMNS].to_numpy()
+    return df
+
+
+def _gameweek_anchor(source_gw, dates):
+    """
+    Earliest source gameweek and date, which gameweeks are numbered from.
+    
+    Returns:
+        Tuple of (minimum Game Week from the CSV, earliest Date)
+    """
+    return pd.to_numeric(source_gw, errors="coerce").min(), dates.min()
 
 
-@st.cache_data
 def load_and_prepare_data(file_path):
     """
     Load and prepare the opponent difficulty data from CSV.
     
     Args:
-        file_path: Path to the CSV file
+        file_path: Path to the CSV file or a text buffer with its contents
         
     Returns:
         Prepared DataFrame with cleaned data types and display names
@@ -28,13 +197,11 @@ def load_and_prepare_data(file_path):
     for col in numeric_cols:
         df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # Create display-friendly competition names
-    df["Competition_Display"] = df["Comp_Slug"].map(COMPETITION_NAMES).fillna(
-        df["name (upcomingGames.competition)"]
-    )
-    
-    # Create Sorare Competition grouping (use Competition_Display instead of raw name)
-    df["Sorare_Competition"] = df["Competition_Display"].map(SORARE_COMPETITION_MAPPING).fillna("Other")
+    # Competitions are few: keep them categorical so the display names and
+    # Sorare competition groups can be remapped per category
+    df["Comp_Slug"] = df["Comp_Slug"].astype("category")
+    df[COMPETITION_NAME_COLUMN] = df[COMPETITION_NAME_COLUMN].astype("category")
+    df = apply_competition_mapping(df)
 
     # Map location to H/A abbreviation
     df["HA"] = df["Location"].map({"Home": "H", "Away": "A"}).fillna("")
@@ -42,7 +209,7 @@ def load_and_prepare_data(file_path):
     return df
 
 
-def calculate_gameweeks(df):
+def calculate_gameweeks(df, anchor=None):
     """
     Calculate gameweek numbers based on match dates.
     
@@ -52,13 +219,15 @@ def calculate_gameweeks(df):
     
     Args:
         df: DataFrame with 'Date' column and 'Game Week' column from CSV
+        anchor: Tuple of (minimum source Game Week, earliest Date) to number
+            the gameweeks from, when the frame is part of a larger file
+            (see `_gameweek_anchor`); by default the frame's own
         
     Returns:
-        DataFrame with 'Game Week' column calculated
+        New DataFrame with 'Game Week' column calculated (the input is not modified)
     """
     if df.empty or df["Date"].isna().all():
-        df["Game Week"] = pd.NA
-        return df
+        return df.assign(**{"Game Week": pd.NA})
 
     # Check if Game Week column exists and find the minimum value
     if "Game Week" not in df.columns:
@@ -66,20 +235,18 @@ def calculate_gameweeks(df):
         st.stop()
     
     # Convert Game Week to numeric and find minimum (ignoring NaN values)
-    game_week_values = pd.to_numeric(df["Game Week"], errors="coerce")
-    valid_gameweeks = game_week_values.dropna()
+    if anchor is None:
+        anchor = _gameweek_anchor(df["Game Week"], df["Date"])
+    min_game_week, min_date = anchor
     
-    if valid_gameweeks.empty:
+    if pd.isna(min_game_week):
         st.error("❌ No valid Game Week values found in the CSV file.")
         st.stop()
     
-    min_game_week = valid_gameweeks.min()
-    
     # Calculate the starting gameweek (min - 604)
     starting_gameweek = int(min_game_week - 605)
 
     # Find the first Friday at 3 PM before the earliest match
-    min_date = df["Date"].min()
     start_boundary = min_date.normalize() + pd.Timedelta(hours=15)
 
     days_since_friday = (start_boundary.weekday() - 4) % 7
@@ -126,7 +293,7 @@ def calculate_gameweeks(df):
 
     # Convert to integer and rename to "Game Week", cleanup
     df["Game Week"] = df["gameweek"].astype(int)
-    df.drop(columns=["boundary", "gameweek"], inplace=True, errors="ignore")
+    df = df.drop(columns=["boundary", "gameweek"], errors="ignore")
 
     return df
 
@@ -142,10 +309,62 @@ def prepare_ranking_display(df):
         df: DataFrame with 'Domestic League Ranking' column
         
     Returns:
-        DataFrame with 'Rank_Sort' and 'Rank_Display' columns added
+        New DataFrame with 'Rank_Sort' and 'Rank_Display' columns added
     """
-    df["Rank_Sort"] = df["Domestic League Ranking"].fillna(9999).astype(int)
-    df["Rank_Display"] = df["Domestic League Ranking"].apply(
-        lambda x: "-" if pd.isna(x) else str(int(x))
+    return df.assign(
+        Rank_Sort=df["Domestic League Ranking"].fillna(9999).astype(int),
+        Rank_Display=df["Domestic League Ranking"].apply(
+            lambda x: "-" if pd.isna(x) else str(int(x))
+        )
     )
-    return df
+
+
+def calculate_congestion(df):
+    """
+    Calculate each team's fixture congestion before every fixture.
+    
+    Congestion is measured on the team's calendar across every competition
+    in the frame, so load the whole file (including UEFA competitions) before
+    filtering. Rows are per team, fixture and position; each team's match days
+    are deduplicated, sorted once by (team, day) and differenced, and the
+    rolling windows are counted with binary searches on the same sort.
+    
+    Args:
+        df: DataFrame with 'Name' and 'Date' columns
+        
+    Returns:
+        New DataFrame with 'Rest_Days' (days since the team's previous match,
+        missing for its first), 'Matches_7d' and 'Matches_14d' (the team's
+        matches in the 7 and 14 days ending on the fixture's day, itself
+        included) columns, missing for rows without a date or team
+    """
+    congestion = {column: np.full(len(df), np.nan) for column in CONGESTION_COLUMNS}
+    valid = (df["Name"].notna() & df["Date"].notna()).to_numpy()
+
+    if valid.any():
+        # Calendar days, so kickoff times do not split a day of rest
+        days = ((df["Date"][valid] - _EPOCH) // pd.Timedelta(days=1)).to_numpy(np.int64)
+        days = days - days.min()
+        codes, _ = pd.factorize(df["Name"][valid])
+
+        # One key per team and day, ordered by team then day; teams are spaced
+        # further apart than the longest window so searches stay within a team
+        span = int(days.max()) + 2 * max(CONGESTION_WINDOWS) + 1
+        row_keys = codes.astype(np.int64) * span + days
+        keys = np.unique(row_keys)
+
+        # A team's first match day has no previous match
+        rest = np.diff(keys, prepend=keys[0]).astype(float)
+        rest[np.r_[True, keys[1:] // span != keys[:-1] // span]] = np.nan
+
+        position = np.arange(len(keys))
+        per_key = {"Rest_Days": rest}
+        for window in CONGESTION_WINDOWS:
+            first = np.searchsorted(keys, keys - window, side="right")
+            per_key[f"Matches_{window}d"] = (position - first + 1).astype(float)
+
+        rows = np.searchsorted(keys, row_keys)
+        for column, values in per_key.items():
+            congestion[column][valid] = values[rows]
+
+    return df.assign(**congestion)
@@ -0,0 +1,131 @@
+"""
+Background refresh of the cached datasets when the data files change.
+
+One watcher thread per server process polls the data files. When a file has
+changed and stopped changing for one poll interval, the new version is loaded
+into the resource cache in the background and only then published, so
+sessions keep serving the previous version until the new one is ready.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# Paths are kept as Path objects, the type sessions pass to the cached
+# loaders, so a warmed entry has the same cache key as the sessions' calls
+_watched = {}      # path -> loader(path, version) that warms the cache
+_published = {}    # path -> version sessions should read
+_failed = {}       # path -> version that could not be loaded
+_watcher = None
+
+
+def file_version(path):
+    """
+    Identify the current contents of a file by modification time and size.
+
+    Returns:
+        Tuple of (mtime_ns, size), or None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_data_version(path):
+    """
+    Version of a data file that sessions should load.
+
+    The first call publishes the file's current version; later versions are
+    only published by the watcher once they have been loaded.
+    """
+    path = Path(path)
+    with _lock:
+        if path not in _published:
+            _published[path] = file_version(path)
+        return _published[path]
+
+
+def refresh_changed_files(pending):
+    """
+    Load and publish every watched file whose new version has settled.
+
+    Args:
+        pending: Dictionary of path -> version seen on the previous poll,
+            updated in place
+
+    Returns:
+        List of paths that were published
+    """
+    with _lock:
+        watched = dict(_watched)
+        published = dict(_published)
+        failed = dict(_failed)
+
+    refreshed = []
+    for path, loader in watched.items():
+        version = file_version(path)
+        if version is None or version in (published.get(path), failed.get(path)):
+            pending.pop(path, None)
+            continue
+
+        # Wait until the file stops changing so half-written files are skipped
+        if pending.get(path) != version:
+            pending[path] = version
+            continue
+
+        try:
+            loader(path, version)
+        except Exception:
+            logger.exception("Refreshing %s failed; keeping the previous version", path)
+            with _lock:
+                _failed[path] = version
+            pending.pop(path, None)
+            continue
+
+        with _lock:
+            _published[path] = version
+        pending.pop(path, None)
+        refreshed.append(path)
+        logger.info("Published new version of %s", path)
+
+    return refreshed
+
+
+def _watch(interval):
+    pending = {}
+    while True:
+        time.sleep(interval)
+        refresh_changed_files(pending)
+
+
+def start_data_watcher(loaders, interval):
+    """
+    Watch data files and warm the cache for new versions in the background.
+
+    Safe to call on every rerun: the watcher thread is started once per
+    process and later calls only register additional files.
+
+    Args:
+        loaders: Dictionary of path -> loader(path, version) to call when the
+            file changes, with the path as a Path
+        interval: Poll interval in seconds (0 disables watching)
+    """
+    global _watcher
+
+    if interval <= 0:
+        return
+
+    with _lock:
+        _watched.update({Path(path): loader for path, loader in loaders.items()})
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = threading.Thread(
+                target=_watch, args=(interval,), name="data-watcher", daemon=True
+            )
+            _watcher.start()
@@ -0,0 +1,227 @@
+"""
+Download of the data files from an HTTP source.
+
+When DATA_SOURCE_URL is set, one thread per server process polls the source
+for every data file with conditional requests (If-None-Match and
+If-Modified-Since), so an unchanged file costs a 304 response and no body.
+A changed file is streamed to a temporary file next to its target, checked
+against the expected columns and moved into place atomically, and only when
+its contents differ from the current file. The file watcher in
+src.data_refresh then loads and publishes the new version as usual.
+
+The validators of the last download are kept next to each file, tied to the
+version of the file they describe, so a restarted process does not download
+unchanged files again and a file replaced by hand is downloaded afresh.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import DATA_SOURCE_TIMEOUT
+from src.data_refresh import file_version
+
+logger = logging.getLogger(__name__)
+
+# Columns the dashboard cannot do without, per data file
+FIXTURE_COLUMNS = [
+    "Name", "name (upcomingGames.competition)", "Comp_Slug", "Game Week", "Date",
+    "Domestic League Ranking", "Location", "Opponent", "Position", "Score_mean", "Score_median"
+]
+PLAYER_COLUMNS = ["displayName", "Club", "Position"]
+
+# Rows parsed when validating a download
+SAMPLE_ROWS = 100
+
+CHUNK_SIZE = 1 << 20
+
+_lock = threading.Lock()
+_session = None
+_poller = None
+
+
+def _get_session():
+    """Shared session, so polls reuse pooled connections to the source."""
+    global _session
+    with _lock:
+        if _session is None:
+            adapter = HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=4,
+                max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+            )
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def _state_path(path):
+    return path.with_name(f".{path.name}.source.json")
+
+
+def _read_state(path):
+    """Validators and hash of the last download, if they still describe the file."""
+    try:
+        with open(_state_path(path)) as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state if state.get("version") == list(file_version(path) or ()) else {}
+
+
+def _file_hash(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def validate_data_file(path, columns):
+    """
+    Check that a downloaded CSV file has the expected columns.
+
+    Args:
+        path: Path to the CSV file
+        columns: Column names the file must have
+
+    Raises:
+        ValueError: If the file cannot be parsed or misses a column
+    """
+    try:
+        sample = pd.read_csv(path, nrows=SAMPLE_ROWS, encoding="utf-8-sig")
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"not a CSV file: {e}") from e
+
+    missing = [column for column in columns if column not in sample.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+
+
+def download_data_file(url, path, columns, timeout=DATA_SOURCE_TIMEOUT):
+    """
+    Download a data file if it changed at the source.
+
+    Args:
+        url: URL of the file
+        path: Local path to replace
+        columns: Column names the file must have (see `validate_data_file`)
+        timeout: Seconds to wait for the source
+
+    Returns:
+        True if the local file was replaced, False if it was unchanged
+
+    Raises:
+        requests.RequestException: If the source cannot be reached or fails
+        ValueError: If the downloaded file is invalid; the local file is kept
+    """
+    path = Path(path)
+    state = _read_state(path)
+
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    with _get_session().get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return False
+        response.raise_for_status()
+
+        # Written next to the target so the final move is an atomic rename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        hasher = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    hasher.update(chunk)
+
+            content_hash = hasher.hexdigest()
+            current_hash = state.get("sha256") or (_file_hash(path) if path.exists() else None)
+            replaced = content_hash != current_hash
+            if replaced:
+                validate_data_file(temp_name, columns)
+                os.replace(temp_name, path)
+        finally:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+
+        state = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": content_hash,
+            "version": list(file_version(path))
+        }
+
+    with open(_state_path(path), "w") as f:
+        json.dump(state, f)
+
+    if replaced:
+        logger.info("Downloaded new version of %s from %s", path, url)
+    return replaced
+
+
+def refresh_from_source(sources):
+    """
+    Download every data file that changed at the source.
+
+    Args:
+        sources: Dictionary of local path -> (URL, required columns)
+
+    Returns:
+        List of paths that were replaced
+    """
+    replaced = []
+    for path, (url, columns) in sources.items():
+        try:
+            if download_data_file(url, path, columns):
+                replaced.append(path)
+        except Exception:
+            logger.exception("Downloading %s from %s failed; keeping the current file", path, url)
+    return replaced
+
+
+def _poll(sources, interval):
+    while True:
+        time.sleep(interval)
+        refresh_from_source(sources)
+
+
+def start_data_source(sources, interval):
+    """
+    Download the data files from their source and keep them up to date.
+
+    Safe to call on every rerun: the first call downloads the files that are
+    missing locally before returning, so a fresh server has data to load, and
+    starts the polling thread; later calls do nothing.
+
+    Args:
+        sources: Dictionary of local path -> (URL, required columns)
+        interval: Poll interval in seconds (0 disables polling)
+    """
+    global _poller
+
+    with _lock:
+        if _poller is not None:
+            return
+        _poller = threading.Thread(
+            target=_poll, args=(sources, interval), name="data-source", daemon=True
+        )
+
+    refresh_from_source({path: source for path, source in sources.items() if not Path(path).exists()})
+    if interval > 0:
+        _poller.start()
@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+
+def build_difficulty_matrix(df, metric, gameweeks, index=("Name", "Position")):
+    """
+    Build a team-by-gameweek difficulty matrix from fixture data.
+
+    Each cell holds the mean difficulty of every fixture the team plays in
+    that gameweek, so double gameweeks are averaged and blanks are NaN.
+
+    Args:
+        df: DataFrame with fixture data (output of calculate_gameweeks)
+        metric: Score_mean or Score_median
+        gameweeks: Ordered list of gameweeks forming the column axis
+        index: Columns identifying a row of the matrix
+
+    Returns:
+        DataFrame indexed by `index` with one column per gameweek
+    """
+    gameweeks = sorted(gameweeks)
+    fixtures = df[df["Game Week"].isin(gameweeks)]
+
+    return (
+        fixtures.groupby(list(index) + ["Game Week"])[metric]
+        .mean()
+        .unstack("Game Week")
+        .reindex(columns=gameweeks)
+    )
+
+
+def _prefix_sums(matrix):
+    """
+    Prefix sums of difficulty and gameweeks played along the gameweek axis.
+
+    A leading zero column is added so the sum over gameweeks [s, e) is
+    csum[:, e] - csum[:, s].
+    """
+    values = matrix.to_numpy(dtype=float)
+    played = ~np.isnan(values)
+
+    value_csum = np.concatenate(
+        [np.zeros((len(values), 1)), np.cumsum(np.where(played, values, 0.0), axis=1)], axis=1
+    )
+    count_csum = np.concatenate(
+        [np.zeros((len(values), 1), dtype=int), np.cumsum(played, axis=1)], axis=1
+    )
+    return value_csum, count_csum
+
+
+def calculate_window_difficulty(df, metric, gameweeks, windows, min_coverage=0.5):
+    """
+    Calculate sliding-window average difficulty for every team and position.
+
+    Uses cumulative sums over the gameweek axis so every window length and
+    starting gameweek is evaluated in one vectorized pass. Gameweeks a team
+    does not play are skipped when averaging, and runs where the team plays
+    in fewer than `min_coverage` of the gameweeks are not considered. As in
+    the fixture grid, a higher difficulty score is an easier fixture, so the
+    easiest run is the one with the highest average.
+
+    Args:
+        df: DataFrame with fixture data (output of calculate_gameweeks)
+        metric: Score_mean or Score_median
+        gameweeks: List of gameweeks forming the horizon
+        windows: List of window lengths in gameweeks (e.g. [3, 5, 8])
+        min_coverage: Minimum share of gameweeks in a run the team must play
+
+    Returns:
+        DataFrame with one row per team, position and window containing the
+        best (easiest) starting gameweek, its average difficulty and the
+        number of gameweeks played in that run
+    """
+    matrix = build_difficulty_matrix(df, metric, gameweeks)
+    gw_axis = np.asarray(matrix.columns)
+    n_gw = len(gw_axis)
+    windows = np.array([w for w in sorted(set(windows)) if 0 < w <= n_gw], dtype=int)
+
+    if matrix.empty or len(windows) == 0:
+        return pd.DataFrame(columns=[
+            "Name", "Position", "Window", "Start_GW", "End_GW", "Window_Avg", "Played_GWs"
+        ])
+
+    value_csum, count_csum = _prefix_sums(matrix)
+
+    # Window x start grid; ends beyond the horizon are clipped and masked
+    starts = np.arange(n_gw)
+    ends = starts[None, :] + windows[:, None]
+    valid = ends <= n_gw
+    ends = np.minimum(ends, n_gw)
+
+    sums = value_csum[:, ends] - value_csum[:, starts][:, None, :]
+    counts = count_csum[:, ends] - count_csum[:, starts][:, None, :]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covered = valid[None] & (counts > 0) & (counts >= min_coverage * windows[None, :, None])
+        averages = np.where(covered, sums / counts, -np.inf)
+
+    # Best starting gameweek per team, position and window
+    best = averages.argmax(axis=2)
+    best_avg = np.take_along_axis(averages, best[..., None], axis=2)[..., 0]
+    best_count = np.take_along_axis(counts, best[..., None], axis=2)[..., 0]
+
+    rows, window_idx = np.indices(best.shape)
+    best, best_avg, best_count = best.ravel(), best_avg.ravel(), best_count.ravel()
+    run_windows = windows[window_idx.ravel()]
+    missing = np.isinf(best_avg)
+
+    keys = matrix.index.to_frame(index=False).iloc[rows.ravel()].reset_index(drop=True)
+    result = keys.assign(
+        Window=run_windows,
+        Start_GW=np.where(missing, np.nan, gw_axis[best]),
+        End_GW=np.where(missing, np.nan, gw_axis[best + run_windows - 1]),
+        Window_Avg=np.where(missing, np.nan, best_avg),
+        Played_GWs=np.where(missing, np.nan, best_count)
+    )
+
+    return result.sort_values(["Window", "Window_Avg"], ascending=[True, False]).reset_index(drop=True)
+
+
+def prepare_window_display_df(window_df, position):
+    """
+    Prepare the best fixture runs for display, one row per team.
+
+    Args:
+        window_df: Output of calculate_window_difficulty
+        position: Position to display
+
+    Returns:
+        DataFrame with a start gameweek and average column per window length,
+        sorted by the easiest run of the shortest window
+    """
+    position_df = window_df[window_df["Position"] == position]
+    if position_df.empty:
+        return pd.DataFrame()
+
+    wide = position_df.pivot(index="Name", columns="Window", values=["Start_GW", "Window_Avg"])
+    windows = sorted(position_df["Window"].unique())
+
+    display_df = pd.DataFrame(index=wide.index)
+    for window in windows:
+        display_df[f"{window} GW Start"] = wide[("Start_GW", window)].map(
+            lambda gw: "-" if pd.isna(gw) else f"GW {int(gw)}"
+        )
+        display_df[f"{window} GW Avg"] = wide[("Window_Avg", window)].round(1)
+
+    display_df = display_df.sort_values(f"{windows[0]} GW Avg", ascending=False)
+    display_df = display_df.reset_index().rename(columns={"Name": "Team"})
+
+    return display_df
+
+
+def calculate_fixture_swings(df, metric, gameweeks, block, threshold):
+    """
+    Detect sharp changes in fixture difficulty between consecutive gameweek blocks.
+
+    For every team, position and gameweek boundary, the average difficulty of
+    the `block` gameweeks before the boundary is compared with the `block`
+    gameweeks from it onwards, all from one set of prefix sums. The largest
+    swing per team and position is kept.
+
+    Args:
+        df: DataFrame with fixture data (output of calculate_gameweeks)
+        metric: Score_mean or Score_median
+        gameweeks: List of gameweeks forming the horizon
+        block: Number of gameweeks on each side of the boundary
+        threshold: Minimum absolute change in difficulty to flag a swing
+
+    Returns:
+        DataFrame with one row per team and position containing the swing
+        gameweek, the average difficulty before and after it, the swing
+        (positive = fixtures getting easier, a higher difficulty score being
+        an easier fixture as in the fixture grid) and a flag for swings over the
+        threshold
+    """
+    columns = ["Name", "Position", "Swing_GW", "Before_Avg", "After_Avg", "Swing", "Is_Swing"]
+    matrix = build_difficulty_matrix(df, metric, gameweeks)
+    gw_axis = np.asarray(matrix.columns)
+    n_gw = len(gw_axis)
+
+    if matrix.empty or block < 1 or n_gw < 2 * block:
+        return pd.DataFrame(columns=columns)
+
+    value_csum, count_csum = _prefix_sums(matrix)
+
+    # Boundaries with a full block on each side
+    boundaries = np.arange(block, n_gw - block + 1)
+    before_sum = value_csum[:, boundaries] - value_csum[:, boundaries - block]
+    after_sum = value_csum[:, boundaries + block] - value_csum[:, boundaries]
+    before_count = count_csum[:, boundaries] - count_csum[:, boundaries - block]
+    after_count = count_csum[:, boundaries + block] - count_csum[:, boundaries]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        before_avg = np.where(before_count > 0, before_sum / before_count, np.nan)
+        after_avg = np.where(after_count > 0, after_sum / after_count, np.nan)
+    swings = after_avg - before_avg
+
+    # Largest absolute swing per team and position
+    has_swing = ~np.isnan(swings).all(axis=1)
+    best = np.where(np.isnan(swings), -np.inf, np.abs(swings)).argmax(axis=1)
+    rows = np.arange(len(swings))
+
+    result = matrix.index.to_frame(index=False).assign(
+        Swing_GW=np.where(has_swing, gw_axis[boundaries[best]], np.nan),
+        Before_Avg=np.where(has_swing, before_avg[rows, best], np.nan),
+        After_Avg=np.where(has_swing, after_avg[rows, best], np.nan),
+        Swing=swings[rows, best]
+    )
+    result["Is_Swing"] = result["Swing"].abs() >= threshold
+
+    return result.sort_values("Swing", ascending=False).reset_index(drop=True)[columns]
+
+
+def prepare_swing_display_df(swing_df, position):
+    """
+    Prepare flagged fixture swings for display.
+
+    Args:
+        swing_df: Output of calculate_fixture_swings
+        position: Position to display
+
+    Returns:
+        DataFrame of flagged swings sorted from the biggest turn towards
+        easier fixtures to the biggest turn towards harder ones
+    """
+    display_df = swing_df[(swing_df["Position"] == position) & swing_df["Is_Swing"]]
+    if display_df.empty:
+        return pd.DataFrame()
+
+    display_df = display_df.sort_values("Swing", ascending=False, kind="stable")
+    display_df = display_df[["Name", "Swing_GW", "Before_Avg", "After_Avg", "Swing"]].copy()
+    display_df.columns = ["Team", "From GW", "Before Avg", "After Avg", "Swing"]
+
+    display_df["From GW"] = display_df["From GW"].map(lambda gw: f"GW {int(gw)}")
+    display_df["Direction"] = np.where(display_df["Swing"] > 0, "Easier", "Harder")
+    for col in ["Before Avg", "After Avg", "Swing"]:
+        display_df[col] = display_df[col].round(1)
+
+    return display_df
@@ -0,0 +1,227 @@
+"""
+Partitioned history of the fixture difficulty data.
+
+Every refresh of the data file is archived as a snapshot in a Hive-style
+Parquet store, partitioned by season, Sorare competition and gameweek:
+
+    <store>/Season=2025-26/Sorare_Competition=Contender/Game Week=659/<snapshot>.parquet
+
+A manifest lists the snapshots and the gameweeks each one covers, so a view
+(one Sorare competition in one snapshot) is read from exactly the files it
+needs without listing the store. The manifest is parsed again only when it
+changes, so loading the current view stays constant-time however much
+history the store holds.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+
+from src.data import load_fixture_data
+from src.data_refresh import file_version
+from src.metrics import track_cache
+
+MANIFEST_NAME = "manifest.json"
+
+PARTITIONING = ds.partitioning(
+    pa.schema([
+        ("Season", pa.string()),
+        ("Sorare_Competition", pa.string()),
+        ("Game Week", pa.int64())
+    ]),
+    flavor="hive"
+)
+PARTITION_COLUMNS = PARTITIONING.schema.names
+
+_lock = threading.Lock()
+_manifests = {}   # store path -> (manifest file version, parsed manifest)
+
+
+def season_label(dates):
+    """
+    Season label for each date, with seasons running July to June.
+
+    Args:
+        dates: Series of datetimes
+
+    Returns:
+        Series of labels such as "2025-26"
+    """
+    start_year = dates.dt.year - (dates.dt.month < 7).astype(int)
+    return start_year.astype(str) + "-" + ((start_year + 1) % 100).astype(str).str.zfill(2)
+
+
+def snapshot_id(version):
+    """
+    Snapshot id for a data file version (see data_refresh.file_version).
+
+    Its UTC modification time down to the nanosecond, so files written
+    within the same second get distinct ids that still sort by time.
+    """
+    seconds, nanoseconds = divmod(version[0], 10 ** 9)
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y%m%dT%H%M%S") + f"{nanoseconds:09d}"
+
+
+def format_snapshot(snapshot):
+    """Display label for a snapshot id (ids of older stores have no nanoseconds)."""
+    return datetime.strptime(snapshot[:15], "%Y%m%dT%H%M%S").strftime("%b %d, %Y %H:%M UTC")
+
+
+def read_manifest(store_path):
+    """
+    Read the store manifest, parsed again only when the file changes.
+
+    The parsed manifest is shared by every caller, so it must be treated as
+    read-only.
+
+    Returns:
+        Dictionary with a "snapshots" list ordered oldest first; each entry has
+        the snapshot "id", its "columns", "competitions", "rows" and a
+        "gameweeks" mapping of gameweek to season
+    """
+    path = Path(store_path) / MANIFEST_NAME
+    version = file_version(path)
+    if version is None:
+        return {"snapshots": []}
+
+    cached = _manifests.get(str(path))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"snapshots": []}
+    _manifests[str(path)] = (version, manifest)
+    return manifest
+
+
+def _write_manifest(store_path, manifest):
+    # Readers only open files listed in the manifest, so replacing it
+    # atomically is what publishes a snapshot
+    path = Path(store_path) / MANIFEST_NAME
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(temp_path, path)
+
+
+def _partition_dir(store_path, season, sorare_competition, gameweek):
+    return (
+        Path(store_path)
+        / f"Season={quote(season, safe='')}"
+        / f"Sorare_Competition={quote(sorare_competition, safe='')}"
+        / f"Game Week={gameweek}"
+    )
+
+
+def write_snapshot(df, store_path, snapshot):
+    """
+    Archive prepared fixture data as a snapshot of the store.
+
+    A snapshot is a complete picture of the gameweeks it covers, so loading a
+    snapshot never needs to merge in older ones.
+
+    Args:
+        df: Prepared fixture DataFrame (see data.load_fixture_data)
+        store_path: Root directory of the store
+        snapshot: Snapshot id (see `snapshot_id`)
+
+    Returns:
+        True if the snapshot was written, False if it was already archived
+    """
+    with _lock:
+        manifest = read_manifest(store_path)
+        if any(entry["id"] == snapshot for entry in manifest["snapshots"]):
+            return False
+
+        # One season per gameweek, taken from its first fixture
+        df = df.dropna(subset=["Date"])
+        df = df.assign(Season=season_label(df.groupby("Game Week")["Date"].transform("min")))
+
+        for (season, sorare_competition, gameweek), part in df.groupby(PARTITION_COLUMNS, sort=False):
+            directory = _partition_dir(store_path, season, sorare_competition, gameweek)
+            directory.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(part.drop(columns=PARTITION_COLUMNS), preserve_index=False)
+            pq.write_table(table, directory / f"{snapshot}.parquet")
+
+        gameweek_seasons = df.drop_duplicates("Game Week").set_index("Game Week")["Season"].sort_index()
+        entry = {
+            "id": snapshot,
+            "columns": [col for col in df.columns if col != "Season"],
+            "competitions": sorted(df["Sorare_Competition"].unique()),
+            "rows": len(df),
+            "gameweeks": {str(gameweek): season for gameweek, season in gameweek_seasons.items()}
+        }
+        # The parsed manifest is shared (see `read_manifest`): write a new one
+        snapshots = sorted(manifest["snapshots"] + [entry], key=lambda entry: entry["id"])
+        _write_manifest(store_path, {**manifest, "snapshots": snapshots})
+
+    return True
+
+
+def archive_fixture_file(file_path, version, store_path):
+    """
+    Archive a version of the fixture data file unless it is already stored.
+
+    The dashboard's data watcher calls it for every refresh, so each
+    version is archived as it is loaded.
+
+    Args:
+        file_path: Path to the fixture CSV file
+        version: Version of the file (see data_refresh.file_version)
+        store_path: Root directory of the store
+
+    Returns:
+        Snapshot id of the file version
+    """
+    snapshot = snapshot_id(version)
+    if not any(entry["id"] == snapshot for entry in read_manifest(store_path)["snapshots"]):
+        write_snapshot(load_fixture_data(file_path, version), store_path, snapshot)
+    return snapshot
+
+
+@track_cache(st.cache_resource(max_entries=8))
+def load_fixture_snapshot(store_path, sorare_competition, snapshot, gameweeks=None):
+    """
+    Load one Sorare competition as it was in a snapshot.
+
+    Only the partition files of that competition within the gameweek range are
+    opened; nothing else in the store is listed or read. Shared across sessions
+    like data.load_fixture_data, so callers must treat it as read-only.
+
+    Args:
+        store_path: Root directory of the store
+        sorare_competition: Sorare competition to load
+        snapshot: Snapshot id (see `read_manifest`)
+        gameweeks: Optional (first, last) gameweek range; defaults to every
+            gameweek the snapshot covers
+
+    Returns:
+        Prepared fixture DataFrame with the columns of data.load_fixture_data
+    """
+    entry = next(entry for entry in read_manifest(store_path)["snapshots"] if entry["id"] == snapshot)
+    first, last = gameweeks if gameweeks is not None else (float("-inf"), float("inf"))
+
+    files = []
+    for gameweek, season in entry["gameweeks"].items():
+        if first <= int(gameweek) <= last:
+            path = _partition_dir(store_path, season, sorare_competition, gameweek) / f"{snapshot}.parquet"
+            if path.exists():
+                files.append(str(path))
+
+    if not files:
+        return pd.DataFrame(columns=entry["columns"])
+
+    dataset = ds.dataset(files, format="parquet", partitioning=PARTITIONING, partition_base_dir=str(store_path))
+    df = dataset.to_table().to_pandas()
+    return df.drop(columns="Season")[entry["columns"]]
@@ -54,6 +54,12 @@ def create_cell_style_js(center, color_scheme, opacity):
 
         style.background = `rgb(${{r}},${{g}},${{b}})`;
         style.color = (r*299+g*587+b*114)/1000 > 128 ? "#212529" : "#fff";
+
+        // Outline double gameweeks
+        if (params.data[params.colDef.field + "__count"] > 1) {{
+            style.fontWeight = "700";
+            style.boxShadow = "inset 0 0 0 2px #1e293b";
+        }}
         return style;
     }}
     """)
@@ -112,6 +118,40 @@ def configure_grid(grid_df, gw_columns, cell_style_js):
         )
         gb.configure_column(f"{col}__val", hide=True)
         gb.configure_column(f"{col}__tip", hide=True)
+        gb.configure_column(f"{col}__count", hide=True)
+
+    gb.configure_column(
+        "DGW",
+        headerName="DGW",
+        headerTooltip="Number of double gameweeks in the selection",
+        width=70,
+        minWidth=60,
+        maxWidth=90,
+        cellStyle={'textAlign': 'center', 'fontWeight': '600'}
+    )
+
+    congestion_formatter = JsCode("""
+    function(params) {
+        return params.value == null || isNaN(params.value) ? '-' : Math.round(params.value);
+    }
+    """)
+    congestion_columns = [
+        ("Rest", "Rest", "Fewest days of rest before a fixture in the selection"),
+        ("Matches_7d", "7d", "Most matches in 7 days up to a fixture in the selection, across all competitions"),
+        ("Matches_14d", "14d", "Most matches in 14 days up to a fixture in the selection, across all competitions")
+    ]
+    for col, header_name, tooltip in congestion_columns:
+        if col in grid_df.columns:
+            gb.configure_column(
+                col,
+                headerName=header_name,
+                headerTooltip=tooltip,
+                valueFormatter=congestion_formatter,
+                width=70,
+                minWidth=60,
+                maxWidth=90,
+                cellStyle={'textAlign': 'center'}
+            )
 
     # Grid-level options optimized for mobile
     gb.configure_grid_options(
@@ -0,0 +1,145 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from src.config import LINEUP_SLOTS
+
+
+def find_best_lineups(players, slots=LINEUP_SLOTS, max_per_club=2, clubs=None, top_n=3, max_nodes=200000):
+    """
+    Find the lineups with the highest total SOI under position and club limits.
+
+    Every slot takes one player of a position eligible for it, no player is
+    picked twice and no club supplies more than `max_per_club` players.
+
+    Each slot only keeps the candidates that can appear in a top lineup, then
+    slots are filled depth-first with branch and bound, most restrictive slot
+    first and each slot's candidates in descending SOI. A branch's upper bound
+    is its SOI so far plus the best candidate of every slot still open,
+    ignoring conflicts, so the bound is exact: once a candidate cannot lift
+    the bound above the current top lineups, neither can any candidate after
+    it and the rest of the slot is skipped. The true top lineups are returned
+    unless `max_nodes` is hit.
+
+    Args:
+        players: Scored player DataFrame across positions (see
+            player_data.calculate_soi) with displayName, Club and Position
+        slots: Dictionary of slot name -> list of eligible positions
+        max_per_club: Maximum players from one club
+        clubs: Optional pool of clubs to pick from (e.g. clubs playing in a
+            gameweek)
+        top_n: Number of best lineups to return
+        max_nodes: Search budget; the best lineups found so far are returned when exceeded
+
+    Returns:
+        DataFrame with one row per lineup: rank, total SOI, the player
+        picked for each slot ("Player (Club)" in one column per slot) and
+        the `players` index labels in slot order
+    """
+    eligible_positions = {position for positions in slots.values() for position in positions}
+    pool = players[players["Position"].isin(eligible_positions) & players["SOI_Score"].notna()]
+    if clubs is not None:
+        pool = pool[pool["Club"].isin(clubs)]
+    labels = pool.index
+    pool = pool.reset_index(drop=True)
+
+    scores = pool["SOI_Score"].to_numpy(dtype=float)
+    club_codes, _ = pd.factorize(pool["Club"])
+    positions = pool["Position"].to_numpy()
+    by_score = np.argsort(-scores, kind="stable")
+
+    # A player with at least top_n + len(slots) - 1 better clubmates for the
+    # same slot is never needed: in any lineup, enough of them are unpicked to
+    # swap in for top_n lineups at least as good under the same club limits
+    keep_per_club = top_n + len(slots) - 1
+    candidates = {}
+    for slot, slot_positions in slots.items():
+        slot_players = by_score[np.isin(positions[by_score], slot_positions)]
+        club_rank = pd.Series(club_codes[slot_players]).groupby(club_codes[slot_players]).cumcount().to_numpy()
+        candidates[slot] = slot_players[club_rank < keep_per_club]
+
+    # Fewest eligible positions, then fewest candidates first, so flexible
+    # slots are filled around the dedicated ones
+    order = sorted(slots, key=lambda slot: (len(slots[slot]), len(candidates[slot])))
+    if any(len(candidates[slot]) == 0 for slot in order):
+        return pd.DataFrame()
+
+    # Plain (player, club, SOI) tuples: the search runs in Python
+    slot_candidates = [
+        list(zip(candidates[slot].tolist(), club_codes[candidates[slot]].tolist(), scores[candidates[slot]].tolist()))
+        for slot in order
+    ]
+
+    # Min-heap on total SOI keeps the worst of the current top lineups on top;
+    # the same players picked into swapped slots are one lineup
+    best_lineups = []
+    found = set()
+    worst = -np.inf
+    nodes = 0
+
+    club_counts = [0] * (club_codes.max() + 1)
+
+    def open_slots_bound(k, chosen):
+        # Best candidate of each slot from k onwards whose club still has room
+        bound = 0.0
+        for slot_players in slot_candidates[k:]:
+            for player, club, score in slot_players:
+                if club_counts[club] < max_per_club and player not in chosen:
+                    bound += score
+                    break
+            else:
+                return -np.inf
+        return bound
+
+    def search(k, chosen, total):
+        nonlocal nodes, worst
+        nodes += 1
+
+        if k == len(order):
+            players_key = tuple(sorted(chosen))
+            if players_key in found:
+                return
+            entry = (total, tuple(chosen))
+            if len(best_lineups) < top_n:
+                heapq.heappush(best_lineups, entry)
+            else:
+                found.discard(tuple(sorted(heapq.heapreplace(best_lineups, entry)[1])))
+            found.add(players_key)
+            if len(best_lineups) >= top_n:
+                worst = best_lineups[0][0]
+            return
+
+        rest = open_slots_bound(k + 1, chosen)
+        for player, club, score in slot_candidates[k]:
+            if total + score + rest <= worst:
+                break
+            if nodes >= max_nodes:
+                return
+            if club_counts[club] >= max_per_club or player in chosen:
+                continue
+            club_counts[club] += 1
+            chosen.append(player)
+            # Filling the club's last place can rule out the open slots' best candidates
+            if club_counts[club] < max_per_club or total + score + open_slots_bound(k + 1, chosen) > worst:
+                search(k + 1, chosen, total + score)
+            chosen.pop()
+            club_counts[club] -= 1
+
+    search(0, [], 0.0)
+
+    rows = []
+    for total, chosen in sorted(best_lineups, key=lambda entry: (-entry[0], entry[1])):
+        row = {"total_soi": total}
+        picks = dict(zip(order, chosen))
+        row.update({
+            slot: f"{pool.at[picks[slot], 'displayName']} ({pool.at[picks[slot], 'Club']})"
+            for slot in slots
+        })
+        row["players"] = [labels[picks[slot]] for slot in slots]
+        rows.append(row)
+
+    results_df = pd.DataFrame(rows)
+    results_df.insert(0, "rank", range(1, len(results_df) + 1))
+
+    return results_df
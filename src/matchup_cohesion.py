@@ -160,76 +160,68 @@ def find_best_matchup_cohesions(df, df_full_cohesion, primary_team, gameweeks, m
     return results_df
 
 
-def create_matchup_detail_grid(df, primary_team, partner_team, gameweeks, metric, positions):
+def create_matchup_detail_grid(df, teams, gameweeks, metric, positions):
     """
-    Create a detailed week-by-week comparison of two teams' fixtures.
+    Create a detailed week-by-week comparison of any number of teams' fixtures.
+    
+    The data is filtered once and pivoted on gameweek for all teams, and the
+    best choice per gameweek is picked with an array comparison.
     
     Args:
         df: Filtered dataframe with opponent difficulty data
-        primary_team: First team
-        partner_team: Second team
+        teams: List of teams to compare (primary team first)
         gameweeks: List of gameweeks to analyze
         metric: Score_mean or Score_median
         positions: List of positions to analyze
         
     Returns:
-        DataFrame with gameweek-by-gameweek comparison
+        DataFrame with gameweek-by-gameweek comparison, with team<i>_opponent,
+        team<i>_location and team<i>_difficulty columns for each team (1-based,
+        in the order given), plus all_home (every team plays at home),
+        best_choice and best_difficulty. Teams tied for the lowest difficulty
+        go to the last of them in the order given, so with two teams the
+        partner team is picked on a tie.
     """
-    detail_rows = []
-    
-    for gw in sorted(gameweeks):
-        team1_data = df[(df["Name"] == primary_team) & 
-                        (df["Game Week"] == gw) & 
-                        (df["Position"].isin(positions))]
-        team2_data = df[(df["Name"] == partner_team) & 
-                        (df["Game Week"] == gw) & 
-                        (df["Position"].isin(positions))]
-        
-        row = {"gameweek": gw}
-        
-        if not team1_data.empty:
-            # Take first match if multiple positions
-            row["team1_opponent"] = team1_data["Opponent"].iloc[0]
-            row["team1_location"] = team1_data["HA"].iloc[0]
-            row["team1_difficulty"] = team1_data[metric].mean()  # Average across positions
-        else:
-            row["team1_opponent"] = "-"
-            row["team1_location"] = "-"
-            row["team1_difficulty"] = None
-            
-        if not team2_data.empty:
-            row["team2_opponent"] = team2_data["Opponent"].iloc[0]
-            row["team2_location"] = team2_data["HA"].iloc[0]
-            row["team2_difficulty"] = team2_data[metric].mean()  # Average across positions
-        else:
-            row["team2_opponent"] = "-"
-            row["team2_location"] = "-"
-            row["team2_difficulty"] = None
-        
-        # Determine if both home
-        row["both_home"] = (row["team1_location"] == "H" and row["team2_location"] == "H")
-        
-        # Calculate the best choice for this gameweek
-        if row["team1_difficulty"] is not None and row["team2_difficulty"] is not None:
-            if row["team1_difficulty"] < row["team2_difficulty"]:
-                row["best_choice"] = primary_team
-                row["best_difficulty"] = row["team1_difficulty"]
-            else:
-                row["best_choice"] = partner_team
-                row["best_difficulty"] = row["team2_difficulty"]
-        elif row["team1_difficulty"] is not None:
-            row["best_choice"] = primary_team
-            row["best_difficulty"] = row["team1_difficulty"]
-        elif row["team2_difficulty"] is not None:
-            row["best_choice"] = partner_team
-            row["best_difficulty"] = row["team2_difficulty"]
-        else:
-            row["best_choice"] = "-"
-            row["best_difficulty"] = None
-            
-        detail_rows.append(row)
-    
-    return pd.DataFrame(detail_rows)
+    gameweeks = sorted(gameweeks)
+    teams = list(teams)
+    
+    team_data = df[(df["Name"].isin(teams)) & 
+                   (df["Game Week"].isin(gameweeks)) & 
+                   (df["Position"].isin(positions))]
+    
+    # One row per team and gameweek: first match for opponent/location,
+    # difficulty averaged across positions
+    cells = team_data.groupby(["Game Week", "Name"], sort=False).agg(
+        opponent=("Opponent", "first"),
+        location=("HA", "first"),
+        difficulty=(metric, "mean")
+    )
+    
+    columns = pd.MultiIndex.from_product([["opponent", "location", "difficulty"], teams])
+    wide = cells.unstack("Name").reindex(index=gameweeks, columns=columns)
+    
+    difficulty = wide["difficulty"].to_numpy(dtype=float)
+    locations = wide["location"].fillna("-")
+    
+    detail_df = pd.DataFrame({"gameweek": gameweeks})
+    for i, team in enumerate(teams, start=1):
+        detail_df[f"team{i}_opponent"] = wide[("opponent", team)].fillna("-").to_numpy()
+        detail_df[f"team{i}_location"] = locations[team].to_numpy()
+        detail_df[f"team{i}_difficulty"] = difficulty[:, i - 1]
+    
+    detail_df["all_home"] = (locations == "H").all(axis=1).to_numpy()
+    
+    # Best choice is the team with the lowest difficulty in each gameweek;
+    # argmin over the reversed team axis hands ties to the last team
+    has_fixture = ~np.isnan(difficulty).all(axis=1)
+    reversed_idx = np.where(np.isnan(difficulty), np.inf, difficulty)[:, ::-1].argmin(axis=1)
+    best_idx = len(teams) - 1 - reversed_idx
+    detail_df["best_choice"] = np.where(has_fixture, np.array(teams, dtype=object)[best_idx], "-")
+    detail_df["best_difficulty"] = np.where(
+        has_fixture, difficulty[np.arange(len(gameweeks)), best_idx], np.nan
+    )
+    
+    return detail_df
 
 
 def prepare_cohesion_display_df(cohesion_df):
@@ -0,0 +1,215 @@
+"""
+Opt-in memory profiling of the dashboard stages with tracemalloc.
+
+When MEMORY_PROFILE is set, `profile_memory` snapshots the traced
+allocations at the start of each rerun and at every section mark (see
+src.metrics.mark_section), and compares consecutive snapshots. Each stage
+reports:
+
+- the net memory it retained: allocations still alive at its end, such as
+  cached frames or state kept in the session
+- its peak above the memory traced at its start, which catches
+  intermediates (copies, pivots) freed before the stage ends
+- the source lines that retained the most memory (see `_source_line`)
+
+Reports are logged and kept per session, together with the memory retained
+by all of a session's reruns, so growth can be traced to a session and a
+stage. Snapshots cost time proportional to the number of live allocations
+and tracemalloc traces every thread of the process, so profile one session
+at a time and never in production.
+"""
+
+import linecache
+import logging
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+from src.config import MEMORY_PROFILE_FRAMES, MEMORY_PROFILE_TOP_LINES
+from src.metrics import add_section_listener
+
+logger = logging.getLogger(__name__)
+
+# Allocations of the profiler itself and of imports are left out of reports
+# (by the file of their innermost frame)
+_EXCLUDED_FILES = {
+    tracemalloc.__file__,
+    __file__,
+    linecache.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>"
+}
+
+# Allocations are charged to the innermost frame under this directory
+_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+_lock = threading.Lock()
+_reports = {}            # session id -> report of its last rerun
+_session_retained = {}   # session id -> net bytes retained by all its reruns
+_rerun = threading.local()
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else "-"
+
+
+def _source_line(traceback):
+    """
+    Line an allocation is charged to.
+
+    The innermost traced frame in this package, so allocations inside pandas
+    are charged to the dashboard line calling it (e.g. a `.copy()` or a
+    pivot) when MEMORY_PROFILE_FRAMES reaches it; the innermost frame
+    otherwise.
+
+    Returns:
+        "file:line", or None for allocations left out of reports
+    """
+    if traceback[-1].filename in _EXCLUDED_FILES:
+        return None
+    for frame in reversed(traceback):
+        if frame.filename.startswith(_SOURCE_DIR):
+            break
+    else:
+        frame = traceback[-1]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def _line_sizes():
+    """
+    Traced memory by source line (see `_source_line`).
+
+    Snapshots are reduced at once rather than kept between stages: their
+    own objects are traced, so a kept snapshot would inflate the next one.
+
+    Returns:
+        Dictionary of source line -> (bytes, blocks)
+    """
+    sizes = {}
+    for stat in tracemalloc.take_snapshot().statistics("traceback"):
+        line = _source_line(stat.traceback)
+        if line is None:
+            continue
+        size, blocks = sizes.get(line, (0, 0))
+        sizes[line] = (size + stat.size, blocks + stat.count)
+    return sizes
+
+
+def _end_stage(stage):
+    """Compare the memory traced at the end of a stage with its start."""
+    state = getattr(_rerun, "state", None)
+    if state is None:
+        return
+
+    # Read before the snapshot, which is traced too
+    _, peak = tracemalloc.get_traced_memory()
+    sizes = _line_sizes()
+
+    previous = state["sizes"]
+    diffs = {
+        line: (size - previous.get(line, (0, 0))[0], blocks - previous.get(line, (0, 0))[1])
+        for line, (size, blocks) in sizes.items()
+    }
+    diffs.update({line: (-size, -blocks) for line, (size, blocks) in previous.items() if line not in sizes})
+    top = sorted(diffs.items(), key=lambda item: item[1][0], reverse=True)[:MEMORY_PROFILE_TOP_LINES]
+
+    state["stages"].append({
+        "stage": stage,
+        "net_bytes": sum(size for size, _ in diffs.values()),
+        "peak_bytes": max(peak - state["traced"], 0),
+        "top_lines": [
+            {"line": line, "net_bytes": size, "blocks": blocks}
+            for line, (size, blocks) in top if size > 0
+        ]
+    })
+
+    # Measured once the comparison is freed, so the next stage is not charged for it
+    del previous, diffs, top
+    state["sizes"] = sizes
+    state["traced"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+
+@contextmanager
+def profile_memory():
+    """
+    Profile the memory of each stage of a rerun.
+
+    Starts tracemalloc on first use. Stages end at the section marks made
+    within the rerun; a rerun ended early, e.g. by st.stop, reports the
+    allocations after its last mark as the "rest" stage.
+    """
+    session_id = _session_id()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(MEMORY_PROFILE_FRAMES)
+    add_section_listener(_end_stage)
+
+    tracemalloc.reset_peak()
+    _rerun.state = {"sizes": _line_sizes(), "traced": tracemalloc.get_traced_memory()[0], "stages": []}
+    try:
+        yield
+    except BaseException:
+        _end_stage("rest")
+        raise
+    finally:
+        stages = _rerun.state["stages"]
+        _rerun.state = None
+
+        net = sum(stage["net_bytes"] for stage in stages)
+        with _lock:
+            retained = _session_retained[session_id] = _session_retained.get(session_id, 0) + net
+            _reports[session_id] = {"net_bytes": net, "session_retained_bytes": retained, "stages": stages}
+        logger.info(format_report(_reports[session_id], session_id))
+
+
+def last_report(session_id=None):
+    """
+    Memory profile of the last completed rerun of a session.
+
+    Args:
+        session_id: Session to look up (the current session by default)
+
+    Returns:
+        Dictionary with the rerun's "net_bytes", the "session_retained_bytes"
+        of all the session's reruns and the "stages" in order, each with its
+        "net_bytes", "peak_bytes" and "top_lines"; None if the session has
+        no profiled rerun yet
+    """
+    with _lock:
+        return _reports.get(session_id or _session_id())
+
+
+def _mib(size):
+    return size / 2 ** 20
+
+
+def format_report(report, session_id="-"):
+    """
+    Format a rerun's memory profile as text.
+
+    Args:
+        report: Profile of a rerun (see `last_report`)
+        session_id: Session the rerun belongs to
+
+    Returns:
+        Multi-line report
+    """
+    lines = [
+        f"Memory profile of session {session_id}: rerun retained {_mib(report['net_bytes']):+.2f} MiB, "
+        f"session {_mib(report['session_retained_bytes']):+.2f} MiB"
+    ]
+    for stage in report["stages"]:
+        lines.append(
+            f"  {stage['stage']}: retained {_mib(stage['net_bytes']):+.2f} MiB, "
+            f"peak {_mib(stage['peak_bytes']):.2f} MiB"
+        )
+        lines.extend(
+            f"    {line['line']}: {_mib(line['net_bytes']):+.2f} MiB in {line['blocks']:+d} blocks"
+            for line in stage["top_lines"]
+        )
+    return "\n".join(lines)
@@ -0,0 +1,323 @@
+"""
+Operational metrics of the dashboard in the Prometheus text format.
+
+Tracked per server process:
+
+- reruns and their latency, by outcome, and the latency of each dashboard
+  section (`track_rerun` and `mark_section`)
+- calls, misses and evictions of every cached function, and the time and
+  result rows of each computation, which for the loaders are the dataset
+  load times and row counts (`track_cache`)
+- the resident memory of the process
+
+`start_metrics_exporter` serves them on a local /metrics endpoint and/or
+rewrites them to a file (e.g. for node_exporter's textfile collector).
+Metrics are kept in plain dictionaries under one lock; recording one is a
+dictionary update, so instrumented code pays next to nothing.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Argument keys remembered per cached function to detect evictions: the most
+# recently computed ones, many times more than any cache holds
+COMPUTED_KEY_HISTORY = 256
+
+METRICS = {
+    "dashboard_reruns_total": ("counter", "Script reruns by outcome"),
+    "dashboard_rerun_seconds": ("histogram", "Script rerun latency"),
+    "dashboard_section_seconds": ("histogram", "Latency of each dashboard section within a rerun"),
+    "dashboard_cache_calls_total": ("counter", "Calls of each cached function"),
+    "dashboard_cache_hits_total": ("counter", "Calls of each cached function served from the cache"),
+    "dashboard_cache_misses_total": ("counter", "Calls of each cached function that computed their result"),
+    "dashboard_cache_evictions_total": (
+        "counter",
+        "Results of each cached function computed again after being evicted (max_entries, ttl or clear)"
+    ),
+    "dashboard_cache_compute_seconds": ("histogram", "Time each cached function takes to compute a result"),
+    "dashboard_cache_result_rows": ("gauge", "Rows of the last DataFrame computed by each cached function"),
+    "process_resident_memory_bytes": ("gauge", "Resident memory of the server process")
+}
+
+_lock = threading.Lock()
+_counters = defaultdict(float)     # (name, labels) -> value
+_gauges = {}                       # (name, labels) -> value
+_histograms = {}                   # (name, labels) -> [bucket counts, sum, count]
+_computed_keys = defaultdict(OrderedDict)  # cached function -> recent argument keys, oldest first
+_rerun = threading.local()
+_exporters = set()
+_section_listeners = []
+
+
+def _labels(**labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    """Increase a counter."""
+    with _lock:
+        _counters[(name, _labels(**labels))] += value
+
+
+def set_gauge(name, value, **labels):
+    """Set a gauge."""
+    with _lock:
+        _gauges[(name, _labels(**labels))] = value
+
+
+def observe(name, seconds, **labels):
+    """Record a latency in a histogram."""
+    with _lock:
+        histogram = _histograms.setdefault((name, _labels(**labels)), [[0] * len(LATENCY_BUCKETS), 0.0, 0])
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                histogram[0][i] += 1
+        histogram[1] += seconds
+        histogram[2] += 1
+
+
+@contextmanager
+def track_rerun():
+    """
+    Record a script rerun and the sections marked during it.
+
+    The outcome label tells completed reruns from ones ended by st.stop,
+    interrupted by a newer rerun or failed.
+    """
+    _rerun.start = _rerun.section_start = time.perf_counter()
+    outcome = "completed"
+    try:
+        yield
+    except BaseException as e:
+        outcome = {"StopException": "stopped", "RerunException": "interrupted"}.get(type(e).__name__, "error")
+        raise
+    finally:
+        observe("dashboard_rerun_seconds", time.perf_counter() - _rerun.start)
+        inc("dashboard_reruns_total", outcome=outcome)
+        _rerun.start = _rerun.section_start = None
+
+
+def mark_section(section):
+    """
+    Record the latency of a dashboard section ending here.
+
+    The section is timed from the previous mark (or the start of the rerun).
+    Does nothing outside `track_rerun`.
+    """
+    start = getattr(_rerun, "section_start", None)
+    if start is None:
+        return
+    observe("dashboard_section_seconds", time.perf_counter() - start, section=section)
+    for listener in _section_listeners:
+        listener(section)
+    # Listeners' own time is not charged to the next section
+    _rerun.section_start = time.perf_counter()
+
+
+def add_section_listener(listener):
+    """
+    Call a function with the name of every section marked from now on.
+
+    Args:
+        listener: Function of the section name; added once however often
+            it is passed
+    """
+    with _lock:
+        if listener not in _section_listeners:
+            _section_listeners.append(listener)
+
+
+def track_cache(cache_decorator):
+    """
+    Apply a Streamlit cache decorator and record the cached function's metrics.
+
+    Use in place of the cache decorator, e.g.
+    `@track_cache(st.cache_resource(max_entries=2))`. As with the plain
+    decorator, `__wrapped__` is the undecorated function.
+
+    Evictions are counted when a result is computed again for arguments it
+    was computed for within the last COMPUTED_KEY_HISTORY computations;
+    arguments with a leading underscore are not hashed by the cache and are
+    left out here too.
+
+    Args:
+        cache_decorator: A configured st.cache_resource or st.cache_data
+
+    Returns:
+        Decorator for the function to cache
+    """
+    def decorate(func):
+        name = func.__name__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = repr([value for param, value in bound.arguments.items() if not param.startswith("_")])
+            with _lock:
+                computed = _computed_keys[name]
+                evicted = key in computed
+                computed[key] = None
+                computed.move_to_end(key)
+                if len(computed) > COMPUTED_KEY_HISTORY:
+                    computed.popitem(last=False)
+            inc("dashboard_cache_misses_total", function=name)
+            if evicted:
+                inc("dashboard_cache_evictions_total", function=name)
+
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            observe("dashboard_cache_compute_seconds", time.perf_counter() - start, function=name)
+            if hasattr(result, "shape"):
+                set_gauge("dashboard_cache_result_rows", result.shape[0], function=name)
+            return result
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            inc("dashboard_cache_calls_total", function=name)
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+
+    return decorate
+
+
+def _resident_memory():
+    """Resident memory in bytes, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def render_metrics():
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        Metrics text
+    """
+    rss = _resident_memory()
+    if rss is not None:
+        set_gauge("process_resident_memory_bytes", rss)
+
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {key: (list(buckets), total, count) for key, (buckets, total, count) in _histograms.items()}
+
+    # Hits are the calls that did not compute
+    for (name, labels), calls in list(counters.items()):
+        if name == "dashboard_cache_calls_total":
+            misses = counters.get(("dashboard_cache_misses_total", labels), 0)
+            counters[("dashboard_cache_hits_total", labels)] = max(calls - misses, 0)
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "histogram":
+            for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        else:
+            values = counters if kind == "counter" else gauges
+            for (metric, labels), value in sorted(values.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_metrics_file(file_path):
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(render_metrics())
+    os.replace(temp_path, file_path)
+
+
+def _write_periodically(file_path, interval):
+    while True:
+        try:
+            _write_metrics_file(file_path)
+        except OSError:
+            logger.exception("Writing metrics to %s failed", file_path)
+        time.sleep(interval)
+
+
+def start_metrics_exporter(port=None, file_path=None, interval=15, host="127.0.0.1"):
+    """
+    Export the metrics on a local HTTP endpoint and/or to a file.
+
+    Safe to call on every rerun: each exporter is started once per process.
+
+    Args:
+        port: Port serving the metrics at /metrics on `host` (None disables)
+        file_path: File rewritten atomically every `interval` seconds (None
+            disables)
+        interval: Seconds between file writes
+        host: Interface the endpoint listens on
+    """
+    with _lock:
+        start_server = port is not None and "http" not in _exporters
+        start_writer = file_path is not None and "file" not in _exporters
+        _exporters.update(["http"] if start_server else [])
+        _exporters.update(["file"] if start_writer else [])
+
+    if start_server:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_metrics().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError:
+            # e.g. another server process already serves the port
+            logger.exception("Serving metrics on %s:%s failed", host, port)
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+    if start_writer:
+        threading.Thread(
+            target=_write_periodically, args=(file_path, interval), name="metrics-file", daemon=True
+        ).start()
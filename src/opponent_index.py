@@ -0,0 +1,129 @@
+"""
+Inverted index from opponents to the fixtures played against them.
+
+The fixture data is laid out by team: answering "which teams face opponent Y"
+from it means scanning every fixture. The index is built once per loaded
+fixture frame and maps each opponent to the positions of its fixtures in a
+compact, gameweek-ordered table, so looking up any set of opponents only
+touches the fixtures against them.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.config import SHARD_CACHE_ENTRIES, SHARD_CACHE_TTL
+from src.metrics import track_cache
+
+INDEX_COLUMNS = [
+    "Name", "Game Week", "Date", "Position", "HA", "Opponent",
+    "Competition_Display", "Score_mean", "Score_median"
+]
+
+
+def build_opponent_index(df):
+    """
+    Build the opponent index of a fixture DataFrame.
+
+    Args:
+        df: Prepared fixture DataFrame (see data.load_fixture_data)
+
+    Returns:
+        Dictionary with the indexed "fixtures" (ordered by gameweek, date and
+        team) and "opponents" mapping each opponent to the sorted row
+        positions of its fixtures
+    """
+    fixtures = (
+        df[INDEX_COLUMNS]
+        .dropna(subset=["Opponent"])
+        .sort_values(["Game Week", "Date", "Name"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+    # Group row positions by opponent in one sort; positions stay ascending
+    # within each opponent, so lookups keep the table order
+    codes, opponents = pd.factorize(fixtures["Opponent"])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(opponents) + 1))
+
+    return {
+        "fixtures": fixtures,
+        "opponents": {
+            opponent: order[bounds[i]:bounds[i + 1]] for i, opponent in enumerate(opponents)
+        }
+    }
+
+
+@track_cache(st.cache_resource(max_entries=SHARD_CACHE_ENTRIES, ttl=SHARD_CACHE_TTL))
+def load_opponent_index(_df, data_key):
+    """
+    Opponent index of a loaded fixture frame, built once per frame.
+
+    The frame is not hashed: `data_key` must change whenever it does. Shared
+    across sessions by reference, so callers must treat it as read-only.
+
+    Args:
+        _df: Prepared fixture DataFrame
+        data_key: Hashable identity of the frame (e.g. its file version and
+            Sorare competition)
+
+    Returns:
+        Opponent index (see `build_opponent_index`)
+    """
+    return build_opponent_index(_df)
+
+
+def find_teams_facing(index, opponents, gameweeks=None, competitions=None, positions=None):
+    """
+    Fixtures against any of the given opponents.
+
+    Args:
+        index: Opponent index (see `build_opponent_index`)
+        opponents: List of opponent names
+        gameweeks: Optional list of gameweeks
+        competitions: Optional list of competition display names
+        positions: Optional list of positions
+
+    Returns:
+        DataFrame of the matching fixtures ordered by gameweek, date and team
+    """
+    rows = [index["opponents"][opponent] for opponent in opponents if opponent in index["opponents"]]
+    if not rows:
+        return index["fixtures"].iloc[:0]
+
+    fixtures = index["fixtures"].take(np.sort(np.concatenate(rows)))
+
+    mask = np.ones(len(fixtures), dtype=bool)
+    if gameweeks is not None:
+        mask &= fixtures["Game Week"].isin(gameweeks).to_numpy()
+    if competitions is not None:
+        mask &= fixtures["Competition_Display"].isin(competitions).to_numpy()
+    if positions is not None:
+        mask &= fixtures["Position"].isin(positions).to_numpy()
+    return fixtures[mask]
+
+
+def prepare_opponent_display_df(fixtures, metric):
+    """
+    Prepare fixtures against the selected opponents for display.
+
+    Args:
+        fixtures: Output of find_teams_facing
+        metric: Score_mean or Score_median
+
+    Returns:
+        DataFrame with one row per fixture, ordered by gameweek and then from
+        the easiest fixture to the hardest: as in the fixture grid, a higher
+        difficulty score is an easier fixture
+    """
+    if fixtures.empty:
+        return pd.DataFrame()
+
+    display_df = fixtures.sort_values(["Game Week", metric], ascending=[True, False], kind="stable")
+    display_df = display_df[["Game Week", "Name", "HA", "Opponent", "Competition_Display", metric]].copy()
+    display_df.columns = ["GW", "Team", "H/A", "Opponent", "Competition", "Difficulty"]
+
+    display_df["GW"] = display_df["GW"].map(lambda gw: f"GW {int(gw)}")
+    display_df["Difficulty"] = display_df["Difficulty"].round(1)
+
+    return display_df
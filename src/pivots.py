@@ -1,43 +1,113 @@
-def create_pivot_tables(df, metric):
+import numpy as np
+import pandas as pd
+
+
+def _join_fixture_parts(parts):
+    """
+    Join per-fixture strings column by column with " + ", skipping blanks.
+    
+    Args:
+        parts: DataFrame with one column per fixture in a gameweek
+        
+    Returns:
+        Series of joined strings
+    """
+    parts = parts.fillna("").astype(str)
+    joined = parts.iloc[:, 0]
+    for col in parts.columns[1:]:
+        part = parts[col]
+        separator = np.where((joined != "") & (part != ""), " + ", "")
+        joined = joined + separator + part
+    return joined
+
+
+def create_pivot_tables(df, metric, engine="pandas"):
     """
-    Create pivot tables for values, labels, and opponents.
+    Create pivot tables for values, labels, opponents and fixture counts.
+    
+    All fixtures a team plays in a gameweek are kept: values hold the mean
+    difficulty, labels and opponents join every fixture in date order
+    (e.g. "42.1 (H) + 51.0 (A)"), and counts flag double gameweeks.
     
     Args:
         df: Filtered DataFrame with match data
         metric: The difficulty metric to use ('Score_mean' or 'Score_median')
+        engine: Query engine for the aggregation (see query_engine.resolve_query_engine)
         
     Returns:
-        Tuple of (value_pivot, label_pivot, opponent_pivot) DataFrames
+        Tuple of (value_pivot, label_pivot, opponent_pivot, count_pivot) DataFrames
     """
-    # Create cell labels with score and home/away indicator
-    df["CellLabel"] = df.apply(
-        lambda r: f"{round(r[metric],1)} ({r['HA']})" if r[metric] == r[metric] else "",
-        axis=1
-    )
+    if engine == "duckdb":
+        from src.query_engine import fixture_cells
+        cells = fixture_cells(df, metric)
+        cells["label"] = _join_cell_labels(df, metric, cells.pop("fixtures"))
+        return _pivot_cells(cells)
 
-    pivot_index = ["Rank_Sort", "Name"]
+    return _pivot_cells(_aggregate_cells(df, metric))
 
-    # Create separate pivots for values, labels, and opponents
-    value_pivot = df.pivot_table(
-        values=metric, 
-        index=pivot_index, 
-        columns="Game Week",  # Changed from "Gameweek"
-        aggfunc="first"
-    )
+
+def _fixture_labels(df, metric):
+    """Label every fixture with its score and home/away indicator, blank without a score."""
+    return (df[metric].round(1).astype(str) + " (" + df["HA"] + ")").where(df[metric].notna(), "")
+
+
+def _join_cell_labels(df, metric, fixtures):
+    """
+    Join the fixture labels of each cell aggregated by another engine.
     
-    label_pivot = df.pivot_table(
-        values="CellLabel", 
-        index=pivot_index, 
-        columns="Game Week",  # Changed from "Gameweek"
-        aggfunc="first"
-    ).fillna("")
+    Args:
+        df: Fixture DataFrame the cells were aggregated from
+        metric: The difficulty metric to use ('Score_mean' or 'Score_median')
+        fixtures: Series of lists of row positions in df, in date order
+        
+    Returns:
+        Series of joined labels with the index of fixtures
+    """
+    positions = fixtures.reset_index(drop=True).explode()
+    labels = pd.Series(
+        _fixture_labels(df, metric).to_numpy()[positions.to_numpy(dtype=np.int64)],
+        index=[positions.index, positions.groupby(level=0).cumcount()]
+    )
+    parts = labels.unstack().reindex(range(len(fixtures)))
+    return pd.Series(_join_fixture_parts(parts).to_numpy(), index=fixtures.index)
+
+
+def _aggregate_cells(df, metric):
+    """
+    Aggregate fixtures into one cell per team and gameweek with pandas.
     
-    opponent_pivot = df.pivot_table(
-        values="Opponent", 
-        index=pivot_index, 
-        columns="Game Week",  # Changed from "Gameweek"
-        aggfunc="first"
-    ).fillna("")
+    Returns:
+        DataFrame indexed by (Rank_Sort, Name, Game Week) with value, count,
+        label and opponent columns
+    """
+    pivot_index = ["Rank_Sort", "Name"]
+
+    # Build cell labels with score and home/away indicator in one vectorized pass
+    fixtures = df.sort_values("Date").assign(CellLabel=lambda d: _fixture_labels(d, metric))
+
+    # Aggregate every fixture per team and gameweek
+    cell_keys = pivot_index + ["Game Week"]
+    fixtures["FixtureNo"] = fixtures.groupby(cell_keys).cumcount()
+    grouped = fixtures.groupby(cell_keys)
+
+    # Spread fixtures into one column each so labels join without per-group Python calls
+    parts = fixtures.set_index(cell_keys + ["FixtureNo"])[["CellLabel", "Opponent"]].unstack("FixtureNo")
+
+    cells = pd.DataFrame({
+        "value": grouped[metric].mean(),
+        "count": grouped.size(),
+        "label": _join_fixture_parts(parts["CellLabel"]),
+        "opponent": _join_fixture_parts(parts["Opponent"])
+    })
+    return cells
+
+
+def _pivot_cells(cells):
+    """Spread aggregated cells into value, label, opponent and count pivots with an Avg column."""
+    value_pivot = cells["value"].unstack("Game Week")
+    label_pivot = cells["label"].unstack("Game Week").fillna("")
+    opponent_pivot = cells["opponent"].unstack("Game Week").fillna("")
+    count_pivot = cells["count"].unstack("Game Week").fillna(0).astype(int)
 
     # Calculate row averages
     row_avg = value_pivot.mean(axis=1)
@@ -46,11 +116,12 @@ def create_pivot_tables(df, metric):
     value_pivot["Avg"] = row_avg
     label_pivot["Avg"] = row_avg.round(1).astype(str)
     opponent_pivot["Avg"] = ""
+    count_pivot["Avg"] = count_pivot.sum(axis=1)
 
-    return value_pivot, label_pivot, opponent_pivot
+    return value_pivot, label_pivot, opponent_pivot, count_pivot
 
 
-def prepare_grid_dataframe(value_pivot, label_pivot, opponent_pivot, rank_df, gameweeks):
+def prepare_grid_dataframe(value_pivot, label_pivot, opponent_pivot, count_pivot, rank_df, gameweeks):
     """
     Prepare the final DataFrame for AG Grid display.
     
@@ -58,7 +129,9 @@ def prepare_grid_dataframe(value_pivot, label_pivot, opponent_pivot, rank_df, ga
         value_pivot: Pivot table with difficulty values
         label_pivot: Pivot table with formatted labels
         opponent_pivot: Pivot table with opponent names
-        rank_df: DataFrame with ranking information
+        count_pivot: Pivot table with fixture counts per gameweek
+        rank_df: Filtered fixture DataFrame with ranking information (and
+            congestion metrics, when loaded with them)
         gameweeks: List of selected gameweeks
         
     Returns:
@@ -69,18 +142,14 @@ def prepare_grid_dataframe(value_pivot, label_pivot, opponent_pivot, rank_df, ga
     gw_columns = [f"GW {gw}" for gw in gameweeks]
     mapping = dict(zip(gameweeks, gw_columns))
 
-    # Rename columns in all pivots
-    value_pivot.rename(columns=mapping, inplace=True)
-    label_pivot.rename(columns=mapping, inplace=True)
-    opponent_pivot.rename(columns=mapping, inplace=True)
-
     # Define column order
     ordered = gw_columns + ["Avg"]
 
-    # Reorder columns
-    value_pivot = value_pivot[ordered]
-    label_pivot = label_pivot[ordered]
-    opponent_pivot = opponent_pivot[ordered]
+    # Rename and reorder columns without modifying the input pivots
+    value_pivot = value_pivot.rename(columns=mapping)[ordered]
+    label_pivot = label_pivot.rename(columns=mapping)[ordered]
+    opponent_pivot = opponent_pivot.rename(columns=mapping)[ordered]
+    count_pivot = count_pivot.rename(columns=mapping)[ordered]
 
     # Start with label pivot as the base grid DataFrame
     grid_df = label_pivot.reset_index()
@@ -92,9 +161,23 @@ def prepare_grid_dataframe(value_pivot, label_pivot, opponent_pivot, rank_df, ga
         how="left"
     ).rename(columns={"Rank_Display": "Rank"})
 
-    # Add hidden columns for values and tooltips
+    # Flag teams with double gameweeks in the selection
+    grid_df["DGW"] = (count_pivot[gw_columns] > 1).sum(axis=1).values
+
+    # Shortest rest and busiest 7 and 14 days before the selected fixtures
+    # (computed at load, see data.calculate_congestion)
+    if "Rest_Days" in rank_df.columns:
+        congestion = rank_df.groupby(["Rank_Sort", "Name"]).agg(
+            Rest=("Rest_Days", "min"),
+            Matches_7d=("Matches_7d", "max"),
+            Matches_14d=("Matches_14d", "max")
+        )
+        grid_df = grid_df.merge(congestion.reset_index(), on=["Rank_Sort", "Name"], how="left")
+
+    # Add hidden columns for values, tooltips and fixture counts
     for col in ordered:
         grid_df[f"{col}__val"] = value_pivot.reset_index()[col]
         grid_df[f"{col}__tip"] = opponent_pivot.reset_index()[col]
+        grid_df[f"{col}__count"] = count_pivot.reset_index()[col]
 
     return grid_df, gw_columns
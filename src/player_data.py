@@ -1,15 +1,21 @@
 import pandas as pd
 import streamlit as st
-from src.config import STRENGTH_METRICS, DIFFICULTY_CENTER
+from src.config import STRENGTH_METRICS, DIFFICULTY_CENTER, PLAYER_POOL_CACHE_ENTRIES, SHARD_CACHE_TTL
+from src.metrics import track_cache
+from src.query_engine import select_fixtures, team_position_difficulty
 
 
-@st.cache_data
-def load_player_data(file_path):
+@track_cache(st.cache_resource(max_entries=2))
+def load_player_data(file_path, version=None):
     """
     Load and prepare player metrics data from CSV.
     
+    Cached as a resource and shared across sessions by reference; callers
+    must treat the returned DataFrame as read-only.
+    
     Args:
         file_path: Path to the player metrics CSV file
+        version: Cache key for the file contents (see data_refresh.file_version)
         
     Returns:
         Prepared DataFrame with player metrics
@@ -30,7 +36,8 @@ def load_player_data(file_path):
     return df
 
 
-def calculate_dynamic_fixture_difficulty(player_df, fixture_df, selected_gameweeks, selected_competitions, metric):
+def calculate_dynamic_fixture_difficulty(player_df, fixture_df, selected_gameweeks, selected_competitions, metric,
+                                         engine="pandas"):
     """
     Calculate upcoming fixture difficulty for each player based on their team's fixtures
     in the selected gameweeks, using data from the team fixture difficulty dashboard.
@@ -41,25 +48,25 @@ def calculate_dynamic_fixture_difficulty(player_df, fixture_df, selected_gamewee
         selected_gameweeks: List of selected gameweek numbers
         selected_competitions: List of selected competition names
         metric: Score_mean or Score_median
+        engine: Query engine for the fixture aggregation (see query_engine.resolve_query_engine)
         
     Returns:
         DataFrame with Dynamic_Fixture_Difficulty column added
     """
     player_df = player_df.copy()
     
-    # Filter fixtures to selected gameweeks and competitions
-    fixtures_filtered = fixture_df[
-        (fixture_df["Game Week"].isin(selected_gameweeks)) &
-        (fixture_df["Competition_Display"].isin(selected_competitions))
-    ]
-    
-    # Calculate average difficulty for each team-position combination
-    team_position_difficulty = fixtures_filtered.groupby(["Name", "Position"])[metric].mean().reset_index()
-    team_position_difficulty.columns = ["Club", "Position", "Dynamic_Fixture_Difficulty"]
+    # Average difficulty for each team-position combination over the selected fixtures
+    team_difficulty = team_position_difficulty(
+        fixture_df,
+        engine,
+        selected_gameweeks,
+        selected_competitions,
+        metric
+    )
     
     # Merge with player data
     player_df = player_df.merge(
-        team_position_difficulty,
+        team_difficulty,
         on=["Club", "Position"],
         how="left"
     )
@@ -67,6 +74,46 @@ def calculate_dynamic_fixture_difficulty(player_df, fixture_df, selected_gamewee
     return player_df
 
 
+def calculate_fixture_congestion(player_df, fixture_df, selected_gameweeks, selected_competitions, engine="pandas"):
+    """
+    Add each player's club congestion over the selected fixtures.
+    
+    Args:
+        player_df: DataFrame with player data
+        fixture_df: DataFrame with fixture data and congestion metrics (see
+            data.calculate_congestion)
+        selected_gameweeks: List of selected gameweek numbers
+        selected_competitions: List of selected competition names
+        engine: Query engine for the fixture selection
+        
+    Returns:
+        DataFrame with Rest_Days (average days of rest before the club's
+        fixtures) and Matches_14d (most matches in 14 days) columns added, or
+        the input when the fixtures have no congestion metrics
+    """
+    if "Rest_Days" not in fixture_df.columns:
+        return player_df
+    
+    fixtures_filtered = select_fixtures(
+        fixture_df,
+        engine,
+        competitions=selected_competitions,
+        gameweeks=selected_gameweeks
+    )
+    
+    # Metrics are per club, repeated on every position's rows
+    congestion = fixtures_filtered.groupby("Name").agg(
+        Rest_Days=("Rest_Days", "mean"),
+        Matches_14d=("Matches_14d", "max")
+    )
+    
+    return player_df.merge(
+        congestion.rename_axis("Club").reset_index(),
+        on="Club",
+        how="left"
+    )
+
+
 def normalize_strength_metrics(df):
     """
     Normalize strength metrics using percentile rankings (0-1 scale).
@@ -148,6 +195,18 @@ def normalize_strength_metrics(df):
             df["L15_Mins_Strength"] = float('nan')
             df["L15_Mins_Display"] = float('nan')
     
+    # Rest Days - percentile ranking (more rest = higher percentile = lower rotation risk)
+    if "Rest_Days" in df.columns:
+        valid_values = df["Rest_Days"].dropna()
+        if len(valid_values) > 0:
+            df["Rest_Strength"] = df["Rest_Days"].rank(pct=True, method='average')
+            df["Rest_Strength"] = df["Rest_Strength"].replace([float('inf'), float('-inf')], float('nan'))
+            # Display the days of rest themselves
+            df["Rest_Display"] = df["Rest_Days"].round(1)
+        else:
+            df["Rest_Strength"] = float('nan')
+            df["Rest_Display"] = float('nan')
+    
     return df
 
 
@@ -183,6 +242,10 @@ def calculate_soi(df, weights):
     if "L15_Mins_Strength" in df.columns:
         df["SOI_Score"] += df["L15_Mins_Strength"].fillna(0) * weights["l15_mins"]
     
+    # Optional input: weights without it leave SOI unchanged
+    if "Rest_Strength" in df.columns:
+        df["SOI_Score"] += df["Rest_Strength"].fillna(0) * weights.get("rest_days", 0)
+    
     # Clip to 0-1 range
     df["SOI_Score"] = df["SOI_Score"].clip(0, 1)
     
@@ -218,3 +281,63 @@ def filter_players_by_gameweeks(player_df, fixture_df, selected_gameweeks, selec
     ].copy()
     
     return players_filtered
+
+
+@track_cache(st.cache_resource(max_entries=PLAYER_POOL_CACHE_ENTRIES, ttl=SHARD_CACHE_TTL))
+def score_player_pool(_player_df, _fixture_df, data_key, selected_gameweeks, selected_competitions, position,
+                      metric, weights, clubs=None, engine="pandas"):
+    """
+    Filter, normalize and score the player pool behind a player grid.
+
+    Cached so paging and sorting the grid only slices the scored pool. The
+    frames are not hashed: `data_key` must change whenever they do. Shared
+    across sessions by reference, so callers must treat it as read-only.
+
+    Args:
+        _player_df: DataFrame with player data
+        _fixture_df: DataFrame with fixture data
+        data_key: Hashable identity of both frames (e.g. their file versions
+            and Sorare competition)
+        selected_gameweeks: Tuple of selected gameweek numbers
+        selected_competitions: Tuple of selected competition names
+        position: Selected position
+        metric: Score_mean or Score_median
+        weights: Tuple of (metric, weight) pairs for `calculate_soi`
+        clubs: Optional tuple of clubs to keep
+        engine: Query engine for the fixture aggregation
+
+    Returns:
+        DataFrame with normalized strength metrics and SOI_Score
+    """
+    players = filter_players_by_gameweeks(
+        _player_df,
+        _fixture_df,
+        list(selected_gameweeks),
+        list(selected_competitions),
+        position
+    )
+
+    if clubs is not None:
+        players = players[players["Club"].isin(clubs)]
+
+    players = calculate_dynamic_fixture_difficulty(
+        players,
+        _fixture_df,
+        list(selected_gameweeks),
+        list(selected_competitions),
+        metric,
+        engine
+    )
+
+    players = calculate_fixture_congestion(
+        players,
+        _fixture_df,
+        list(selected_gameweeks),
+        list(selected_competitions),
+        engine
+    )
+
+    # Percentiles within the filtered pool
+    players = normalize_strength_metrics(players)
+
+    return calculate_soi(players, dict(weights))
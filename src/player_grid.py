@@ -1,6 +1,30 @@
+import numpy as np
 from st_aggrid import GridOptionsBuilder, JsCode
 
 
+# SOI weight keys with the grid column holding each normalized strength and
+# the label shown on the grid's weight controls
+SOI_WEIGHT_COLUMNS = {
+    "l5_form": ("L5_Form_Display__strength", "L5 Form"),
+    "l15_form": ("L15_Form_Display__strength", "L15 Form"),
+    "next_5_diff": ("Next_5_Diff_Display__strength", "Next 5"),
+    "l5_mins": ("L5_Mins_Display__strength", "L5 Mins"),
+    "l15_mins": ("L15_Mins_Display__strength", "L15 Mins"),
+    "rest_days": ("Rest_Display__strength", "Rest")
+}
+
+# Columns the player pool can be paged by, strongest first
+PLAYER_SORT_COLUMNS = {
+    "SOI_Score": "SOI",
+    "L5_Form_Strength": "L5 Form",
+    "L15_Form_Strength": "L15 Form",
+    "Next_5_Diff_Strength": "Next 5 Fixtures",
+    "L5_Mins_Strength": "L5 Mins",
+    "L15_Mins_Strength": "L15 Mins",
+    "Rest_Strength": "Rest Days"
+}
+
+
 # ============================================================
 # CELL STYLING HELPERS
 # ============================================================
@@ -118,13 +142,33 @@ def create_mins_value_formatter_js():
 
 
 def create_soi_value_getter_js():
+    # Same weighted sum as player_data.calculate_soi, using the weights in the
+    # grid context so the browser can rescore without a rerun
+    return JsCode("""
+    function(params) {
+        const weights = params.context && params.context.soiWeights;
+        if (!weights) {
+            return params.data.SOI_Score;
+        }
+
+        let score = 0;
+        for (const w of weights) {
+            const v = params.data[w.field];
+            score += (v == null || isNaN(v) ? 0 : v) * w.weight;
+        }
+        return Math.max(0, Math.min(1, score));
+    }
+    """)
+
+
+def create_soi_value_formatter_js():
     return JsCode("""
     function(params) {
-        if (params.data.SOI_Score == null || isNaN(params.data.SOI_Score)) {
+        if (params.value == null || isNaN(params.value)) {
             return '-';
         }
 
-        const value = params.data.SOI_Score;
+        const value = params.value;
         const percentage = Math.round(value * 100);
 
         const barWidth = Math.round(value * 20);
@@ -141,7 +185,7 @@ def create_soi_value_getter_js():
 def create_soi_cell_style_js():
     return JsCode("""
     function(params) {
-        if (params.value == null || params.value === '-') {
+        if (params.value == null || isNaN(params.value)) {
             return {
                 display: 'flex',
                 justifyContent: 'flex-start',
@@ -152,7 +196,7 @@ def create_soi_cell_style_js():
             };
         }
 
-        const value = params.data.SOI_Score;
+        const value = params.value;
 
         let color;
         if (value >= 0.7) {
@@ -178,12 +222,96 @@ def create_soi_cell_style_js():
     """)
 
 
+def create_soi_weight_panel_js():
+    return JsCode("""
+    function(params) {
+        const weights = params.context && params.context.soiWeights;
+        const root = document.querySelector('.ag-root-wrapper');
+        if (!weights || !root) {
+            return;
+        }
+
+        // The grid can be recreated inside the same frame on rerun
+        const previous = document.getElementById('soi-weight-panel');
+        if (previous) {
+            previous.remove();
+        }
+
+        const panel = document.createElement('div');
+        panel.id = 'soi-weight-panel';
+        Object.assign(panel.style, {
+            display: 'flex',
+            flexWrap: 'wrap',
+            alignItems: 'center',
+            gap: '4px 16px',
+            padding: '6px 8px',
+            fontFamily: 'sans-serif',
+            fontSize: '0.8rem',
+            color: '#495057'
+        });
+
+        const total = document.createElement('span');
+        total.style.fontWeight = '600';
+
+        function showTotal() {
+            const sum = weights.reduce((acc, w) => acc + w.weight, 0);
+            total.textContent = 'Σ ' + sum.toFixed(2);
+            total.style.color = Math.abs(sum - 1) > 0.01 ? '#d97706' : '#16a34a';
+        }
+
+        for (const w of weights) {
+            const label = document.createElement('label');
+            label.style.whiteSpace = 'nowrap';
+
+            const value = document.createElement('span');
+            value.textContent = w.weight.toFixed(2);
+            value.style.display = 'inline-block';
+            value.style.width = '2.5em';
+
+            const input = document.createElement('input');
+            Object.assign(input, {type: 'range', min: 0, max: 1, step: 0.05, value: w.weight});
+            input.style.width = '90px';
+            input.style.verticalAlign = 'middle';
+            input.addEventListener('input', () => {
+                w.weight = parseFloat(input.value);
+                value.textContent = w.weight.toFixed(2);
+                showTotal();
+                // Rescore and re-sort in the browser - no rerun
+                params.api.refreshCells({columns: ['SOI_Score'], force: true});
+                params.api.refreshClientSideRowModel('sort');
+            });
+
+            label.append(w.label + ' ', input, ' ', value);
+            panel.appendChild(label);
+        }
+
+        showTotal();
+        panel.appendChild(total);
+        root.parentElement.insertBefore(panel, root);
+
+        // Keep the grid inside the frame height below the panel
+        root.style.height = `calc(100% - ${panel.offsetHeight}px)`;
+    }
+    """)
+
+
 # ============================================================
 # GRID CONFIGURATION
 # ============================================================
 
-def configure_player_grid(grid_df, strength_columns, cell_style_js, strength_colors, strength_opacity):
-
+def configure_player_grid(grid_df, strength_columns, cell_style_js, strength_colors, strength_opacity,
+                          soi_weights=None, sort_column="SOI_Score"):
+    """
+    Build the player grid options.
+
+    With `soi_weights`, the grid shows weight controls above the rows and
+    rescores SOI in the browser as they move; the weights passed in are only
+    the starting point. Rows are re-sorted by SOI client-side only when the
+    page is sorted by SOI (`sort_column`), otherwise they keep page order.
+    Only pass `soi_weights` when the grid holds the whole pool: a page picked
+    with the saved weights (see `page_player_pool`) cannot bring in the
+    players new weights would rank onto it.
+    """
     gb = GridOptionsBuilder.from_dataframe(grid_df)
 
     gb.configure_column(
@@ -214,10 +342,12 @@ def configure_player_grid(grid_df, strength_columns, cell_style_js, strength_col
                 col_name,
                 headerName=display_name,
                 valueGetter=create_soi_value_getter_js(),
+                valueFormatter=create_soi_value_formatter_js(),
                 cellStyle=create_soi_cell_style_js(),
                 width=240,
                 headerClass="ag-center-header",
-                sortable=True
+                sortable=True,
+                sort="desc" if sort_column == "SOI_Score" else None
             )
 
         elif col_name == "Next_5_Diff_Display":
@@ -271,6 +401,18 @@ def configure_player_grid(grid_df, strength_columns, cell_style_js, strength_col
         filter=False
     )
 
+    if soi_weights is not None and "SOI_Score" in grid_df.columns:
+        gb.configure_grid_options(
+            context={
+                "soiWeights": [
+                    {"key": key, "field": field, "label": label, "weight": soi_weights[key]}
+                    for key, (field, label) in SOI_WEIGHT_COLUMNS.items()
+                    if field in grid_df.columns
+                ]
+            },
+            onGridReady=create_soi_weight_panel_js()
+        )
+
     return gb.build()
 
 
@@ -289,6 +431,7 @@ def prepare_player_grid_data(df):
         ("Next_5_Diff_Display", "Next 5 Fixtures", "Upcoming fixture difficulty"),
         ("L5_Mins_Display", "L5 Mins", "Last 5 games minutes / 450"),
         ("L15_Mins_Display", "L15 Mins", "Last 15 games minutes / 1350"),
+        ("Rest_Display", "Rest Days", "Average days of rest before the selected fixtures, across all competitions"),
         ("SOI_Score", "SOI", "Strength of Investment")
     ]
 
@@ -315,7 +458,40 @@ def prepare_player_grid_data(df):
             grid_df[f"{col}__strength"] = df[strength_col]
             grid_df[f"{col}__tooltip"] = col_info["tooltip"]
 
-    if "SOI_Score" in grid_df.columns:
-        grid_df = grid_df.sort_values("SOI_Score", ascending=False)
-
     return grid_df, strength_columns
+
+
+def page_player_pool(df, sort_column, page, page_size):
+    """
+    Select one page of the player pool, strongest first by `sort_column`.
+
+    Only the rows up to the end of the page are ordered: a partial partition
+    picks them in linear time, so the first pages of a large pool are cheap.
+    Ties keep pool order and missing values sort last, giving the same rows
+    as a full stable sort.
+
+    Args:
+        df: Scored player DataFrame
+        sort_column: Column to sort by (see PLAYER_SORT_COLUMNS)
+        page: Zero-based page number
+        page_size: Players per page
+
+    Returns:
+        DataFrame with the players of the page, in order
+    """
+    keys = -df[sort_column].to_numpy(dtype=float, na_value=np.nan)
+    keys[np.isnan(keys)] = np.inf
+
+    stop = min((page + 1) * page_size, len(keys))
+    if stop <= 0:
+        return df.iloc[:0]
+
+    # Value of the last row on the page: everything below it is on this or an
+    # earlier page, and ties are taken in pool order
+    threshold = np.partition(keys, stop - 1)[stop - 1]
+    before = np.flatnonzero(keys < threshold)
+    ties = np.flatnonzero(keys == threshold)[:stop - len(before)]
+
+    top = np.concatenate([before, ties])
+    top = top[np.lexsort((top, keys[top]))]
+    return df.iloc[top[page * page_size:stop]]
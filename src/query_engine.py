@@ -0,0 +1,213 @@
+"""
+Filter and aggregation queries over the shared fixture data.
+
+The dashboard's fixture selections, grid cells and team difficulty averages
+run either on pandas (the default) or, with QUERY_ENGINE set to "duckdb", as
+single SQL statements executed by an in-process DuckDB over an Arrow copy of
+the frame. The copy is made once per frame and kept while the frame is alive,
+so the cached frames every session queries are converted once rather than
+on every query, and selections return the matching row positions rather
+than converting the rows back to pandas. DuckDB is optional: without it
+every query falls back to pandas.
+"""
+
+import importlib.util
+import logging
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+QUERY_ENGINES = ("pandas", "duckdb")
+
+_lock = threading.Lock()
+_connection = None
+_arrow_tables = {}   # id of a live frame -> its Arrow table
+
+# Column of the Arrow tables holding each row's position in its frame
+POSITION_COLUMN = "_position"
+
+
+def resolve_query_engine(engine):
+    """
+    Validate the configured query engine, falling back to pandas.
+
+    Args:
+        engine: "pandas" or "duckdb"
+
+    Returns:
+        The engine to use: "duckdb" only if requested and installed
+    """
+    if engine not in QUERY_ENGINES:
+        logger.warning("Unknown query engine %r; using pandas", engine)
+        return "pandas"
+    if engine == "duckdb" and importlib.util.find_spec("duckdb") is None:
+        logger.warning("QUERY_ENGINE is 'duckdb' but duckdb is not installed; using pandas")
+        return "pandas"
+    return engine
+
+
+def _arrow_table(df):
+    """
+    Arrow table of a frame, converted on the frame's first query.
+
+    Frames are shared read-only (see data.load_fixture_data), so the table
+    stays valid for the frame's lifetime and is dropped with it. Rows carry
+    their position in the frame (POSITION_COLUMN).
+    """
+    key = id(df)
+    with _lock:
+        table = _arrow_tables.get(key)
+    if table is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.append_column(POSITION_COLUMN, pa.array(np.arange(len(df))))
+        with _lock:
+            _arrow_tables[key] = table
+        weakref.finalize(df, _arrow_tables.pop, key, None)
+    return table
+
+
+def _query(df, sql, params):
+    """
+    Run a SQL statement with the frame registered as the `fixtures` view.
+
+    Each call uses its own cursor, so sessions can query concurrently.
+    """
+    global _connection
+
+    with _lock:
+        if _connection is None:
+            # Optional dependency, imported on first use (see resolve_query_engine)
+            import duckdb
+            _connection = duckdb.connect()
+        cursor = _connection.cursor()
+
+    try:
+        cursor.register("fixtures", _arrow_table(df))
+        return cursor.execute(sql, params).df()
+    finally:
+        cursor.close()
+
+
+def _conditions(sorare_competition=None, competitions=None, positions=None, gameweeks=None):
+    """Build SQL conditions and their parameters for the given fixture filters."""
+    conditions = []
+    params = []
+    if sorare_competition is not None:
+        conditions.append("Sorare_Competition = ?")
+        params.append(sorare_competition)
+    for column, values in [
+        ("Competition_Display", competitions),
+        ("Position", positions),
+        ("Game Week", gameweeks)
+    ]:
+        if values is not None:
+            conditions.append(f'list_contains(?, "{column}")')
+            params.append([int(v) for v in values] if column == "Game Week" else list(values))
+    return conditions, params
+
+
+def select_fixtures(df, engine, sorare_competition=None, competitions=None, positions=None, gameweeks=None):
+    """
+    Select fixtures matching every given filter in one pass.
+
+    Args:
+        df: Fixture DataFrame
+        engine: Query engine (see `resolve_query_engine`)
+        sorare_competition: Optional Sorare competition
+        competitions: Optional list of competition display names
+        positions: Optional list of positions
+        gameweeks: Optional list of gameweeks
+
+    Returns:
+        DataFrame with the matching fixtures, in the same order and with the
+        same index and dtypes on either engine
+    """
+    if engine == "duckdb":
+        conditions, params = _conditions(sorare_competition, competitions, positions, gameweeks)
+        rows = _query(df, f"""
+            SELECT {POSITION_COLUMN} FROM fixtures
+            WHERE {' AND '.join(conditions) or 'TRUE'}
+            ORDER BY {POSITION_COLUMN}
+        """, params)
+        return df.iloc[rows[POSITION_COLUMN].to_numpy()]
+
+    mask = pd.Series(True, index=df.index)
+    if sorare_competition is not None:
+        mask &= df["Sorare_Competition"] == sorare_competition
+    if competitions is not None:
+        mask &= df["Competition_Display"].isin(competitions)
+    if positions is not None:
+        mask &= df["Position"].isin(positions)
+    if gameweeks is not None:
+        mask &= df["Game Week"].isin(gameweeks)
+    return df[mask]
+
+
+def fixture_cells(df, metric):
+    """
+    Aggregate fixtures into grid cells with DuckDB.
+
+    Same result as the pandas aggregation in pivots.create_pivot_tables: the
+    mean difficulty, fixture count and opponents of every fixture joined with
+    " + " in date order. Labels are left to pivots, which formats scores the
+    same way for both engines, so cells list the row positions of their
+    fixtures in date order instead.
+
+    Args:
+        df: Filtered fixture DataFrame
+        metric: The difficulty metric to use ('Score_mean' or 'Score_median')
+
+    Returns:
+        DataFrame indexed by (Rank_Sort, Name, Game Week) with value, count,
+        fixtures (list of row positions in df) and opponent columns
+    """
+    cells = _query(df, f'''
+        SELECT
+            Rank_Sort,
+            Name,
+            "Game Week",
+            avg("{metric}") AS value,
+            count(*) AS count,
+            list({POSITION_COLUMN} ORDER BY Date) AS fixtures,
+            coalesce(string_agg(nullif(Opponent, ''), ' + ' ORDER BY Date), '') AS opponent
+        FROM fixtures
+        GROUP BY Rank_Sort, Name, "Game Week"
+        ORDER BY Rank_Sort, Name, "Game Week"
+    ''', [])
+    return cells.set_index(["Rank_Sort", "Name", "Game Week"])
+
+
+def team_position_difficulty(df, engine, gameweeks, competitions, metric):
+    """
+    Average difficulty per team and position over the selected fixtures.
+
+    Args:
+        df: Fixture DataFrame
+        engine: Query engine (see `resolve_query_engine`)
+        gameweeks: List of selected gameweeks
+        competitions: List of selected competition display names
+        metric: Score_mean or Score_median
+
+    Returns:
+        DataFrame with Club, Position and Dynamic_Fixture_Difficulty columns
+    """
+    if engine == "duckdb":
+        conditions, params = _conditions(competitions=competitions, gameweeks=gameweeks)
+        # Like pandas groupby, fixtures without a team or position are left out
+        conditions += ["Name IS NOT NULL", "Position IS NOT NULL"]
+        return _query(df, f'''
+            SELECT Name AS Club, Position, avg("{metric}") AS Dynamic_Fixture_Difficulty
+            FROM fixtures
+            WHERE {" AND ".join(conditions)}
+            GROUP BY Name, Position
+        ''', params)
+
+    fixtures_filtered = select_fixtures(df, engine, competitions=competitions, gameweeks=gameweeks)
+    difficulty = fixtures_filtered.groupby(["Name", "Position"])[metric].mean().reset_index()
+    difficulty.columns = ["Club", "Position", "Dynamic_Fixture_Difficulty"]
+    return difficulty
@@ -0,0 +1,116 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from src.fixture_runs import build_difficulty_matrix
+
+
+def find_best_rotation_sets(df, gameweeks, metric, positions, set_size, teams=None, top_n=10, max_nodes=200000):
+    """
+    Find the team sets whose best pick per gameweek gives the easiest schedule.
+
+    The cost of a set is the minimum difficulty among its teams in each
+    gameweek, summed over the selected gameweeks. Gameweeks where none of the
+    teams play cost the hardest difficulty seen in the data.
+
+    Sets are searched depth-first with branch and bound: candidates are
+    ranked by marginal gain (lazy greedy), each branch only adds teams ranked
+    after its own pick, and a branch is pruned when its cost minus the largest
+    gains still available cannot beat the current top sets. Gains never grow
+    as teams are added, so the bound is exact and the search returns the true
+    top sets unless `max_nodes` is hit.
+
+    Args:
+        df: Filtered dataframe with opponent difficulty data
+        gameweeks: List of gameweeks to analyze
+        metric: Score_mean or Score_median
+        positions: List of positions to analyze
+        set_size: Number of teams per set (2-5)
+        teams: Optional pool of candidate teams (defaults to all teams in df)
+        top_n: Number of best sets to return
+        max_nodes: Search budget; the best sets found so far are returned when exceeded
+
+    Returns:
+        DataFrame with one row per set: rank, teams, total and average
+        difficulty, and the chosen team for each gameweek ("GW <n>" columns)
+    """
+    matrix = build_difficulty_matrix(
+        df[df["Position"].isin(positions)], metric, gameweeks, index=("Name",)
+    )
+    if teams is not None:
+        matrix = matrix[matrix.index.isin(teams)]
+
+    if len(matrix) < set_size or matrix.empty:
+        return pd.DataFrame()
+
+    costs = matrix.to_numpy(dtype=float)
+    blank_cost = np.nanmax(costs)
+    costs = np.where(np.isnan(costs), blank_cost, costs)
+
+    names = matrix.index.to_numpy()
+    n_teams = len(costs)
+
+    # Min-heap on negated cost keeps the worst of the current top sets on top
+    best_sets = []
+    nodes = 0
+
+    def worst_cost():
+        return -best_sets[0][0] if len(best_sets) >= top_n else np.inf
+
+    def search(pool, chosen, current_min):
+        nonlocal nodes
+        nodes += 1
+        current_cost = current_min.sum()
+        remaining = set_size - len(chosen)
+
+        if remaining == 0:
+            entry = (-current_cost, tuple(sorted(chosen)))
+            if len(best_sets) < top_n:
+                heapq.heappush(best_sets, entry)
+            elif current_cost < worst_cost():
+                heapq.heapreplace(best_sets, entry)
+            return
+
+        # Marginal gain of every candidate in one vectorized pass over the gameweek axis
+        gains = np.maximum(current_min[None, :] - costs[pool], 0.0).sum(axis=1)
+        ranked = np.argsort(-gains, kind="stable")
+        pool, gains = pool[ranked], gains[ranked]
+
+        # Each child only picks from candidates ranked after it, whose gains
+        # can only shrink, so the next (remaining - 1) gains bound the rest
+        for i in range(len(pool) - remaining + 1):
+            bound = current_cost - gains[i:i + remaining].sum()
+            if bound >= worst_cost():
+                break
+            if nodes >= max_nodes:
+                return
+            team = pool[i]
+            search(pool[i + 1:], chosen + [team], np.minimum(current_min, costs[team]))
+
+    search(np.arange(n_teams), [], np.full(costs.shape[1], blank_cost))
+
+    gw_columns = [f"GW {gw}" for gw in matrix.columns]
+    rows = []
+    for neg_cost, chosen in sorted(best_sets, key=lambda entry: (-entry[0], entry[1])):
+        set_costs = costs[list(chosen)]
+        picks = names[list(chosen)][set_costs.argmin(axis=0)]
+        raw = matrix.loc[names[list(chosen)]].to_numpy(dtype=float)
+        no_fixture = np.isnan(raw).all(axis=0)
+
+        row = {
+            "teams": ", ".join(names[list(chosen)]),
+            "total_difficulty": -neg_cost,
+            "avg_difficulty": -neg_cost / len(gw_columns),
+            "blank_gameweeks": int(no_fixture.sum())
+        }
+        row.update({
+            col: "-" if blank else pick
+            for col, pick, blank in zip(gw_columns, picks, no_fixture)
+        })
+        rows.append(row)
+
+    results_df = pd.DataFrame(rows)
+    results_df.insert(0, "rank", range(1, len(results_df) + 1))
+
+    return results_df
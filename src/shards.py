@@ -0,0 +1,373 @@
+"""
+Per-competition shards of the fixture and player data.
+
+Sessions almost always work inside one Sorare competition. The first load
+of a data file version splits the fixtures into one Arrow file per
+competition source (a competition slug and name, such as a league or the
+UEFA fixtures of one league's clubs) and the players into one Arrow file per
+league of their club, under SHARD_CACHE_DIR. A Sorare competition is the set
+of sources the competition mappings assign to it (see src.competitions), so
+the shards do not depend on the mappings: regrouping competitions only
+changes which shards a Sorare competition reads. From then on a Sorare
+competition is materialized only when a session selects it, memory-mapped
+from disk, cached on its own and evicted when unused, so a fresh server
+process reads the shard index and the shards its sessions select rather
+than the whole file.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import streamlit as st
+
+from src.competitions import (
+    COMPETITION_NAME_COLUMN,
+    apply_competition_mapping,
+    default_sorare_competition,
+    load_competition_mapping
+)
+from src.config import (
+    COMPETITION_MAPPING_PATH,
+    DATA_PATH,
+    PLAYER_DATA_PATH,
+    SHARD_CACHE_DIR,
+    SHARD_CACHE_ENTRIES,
+    SHARD_CACHE_TTL
+)
+from src.data import load_fixture_data
+from src.data_refresh import get_data_version
+from src.metrics import track_cache
+
+INDEX_NAME = "index.json"
+
+# Shard directories kept per data file, matching the loaders' cache entries
+KEEP_VERSIONS = 2
+
+# Part of every shard directory name, so shards of an older layout are never read
+SHARD_LAYOUT = "sources"
+
+# Position of each row in its data file, kept in the shards so a competition
+# read from several shards is in file order
+ROW_COLUMN = "_row"
+
+
+def _shard_dir(file_path, *versions):
+    """
+    Directory holding the shards of one version of a data file.
+
+    Returns:
+        Tuple of (directory, prefix shared by every version of the file)
+    """
+    path = Path(file_path)
+    source = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:8]
+    prefix = f"{path.stem}-{source}-"
+    # A missing file has no version; loading it raises FileNotFoundError
+    version_key = "-".join(str(part) for version in versions for part in (version or ("missing",)))
+    return Path(SHARD_CACHE_DIR) / f"{prefix}{version_key}-{SHARD_LAYOUT}", prefix
+
+
+def _read_index(directory):
+    try:
+        with open(directory / INDEX_NAME) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_shards(directory, prefix, shards, index):
+    """
+    Write the shards of a data file version and publish them atomically.
+
+    Shards are written to a temporary directory that is renamed into place, so
+    processes sharing SHARD_CACHE_DIR never read a partial version. Older
+    versions of the same file are pruned afterwards.
+
+    Args:
+        directory: Target directory (see `_shard_dir`)
+        prefix: Directory name prefix shared by every version of the file
+        shards: Dictionary of file name -> DataFrame
+        index: Dictionary stored with the shards; the shards' "columns" are added
+    """
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    temp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=directory.parent))
+
+    columns = []
+    for file_name, shard in shards.items():
+        # Uncompressed so shards can be memory-mapped when read
+        feather.write_feather(shard.reset_index(drop=True), temp_dir / file_name, compression="uncompressed")
+        columns = list(shard.columns)
+
+    with open(temp_dir / INDEX_NAME, "w") as f:
+        json.dump({**index, "columns": columns}, f)
+
+    try:
+        os.rename(temp_dir, directory)
+    except OSError:
+        # Another process published this version first
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    _prune(directory.parent, prefix)
+
+
+def _prune(parent, prefix):
+    versions = []
+    for path in parent.iterdir():
+        if path.name.startswith(prefix):
+            try:
+                versions.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+    for _, path in sorted(versions, reverse=True)[KEEP_VERSIONS:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _read_shards(index, files):
+    """
+    Read shards of an index into one frame in data file order.
+
+    Returns:
+        DataFrame of the shards' rows without the row position column
+    """
+    directory = Path(index["directory"])
+    frames = [feather.read_feather(directory / file_name, memory_map=True) for file_name in files]
+    if not frames:
+        return pd.DataFrame(columns=index["columns"]).drop(columns=ROW_COLUMN, errors="ignore")
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    if len(frames) > 1:
+        df = df.take(np.argsort(df[ROW_COLUMN].to_numpy(), kind="stable")).reset_index(drop=True)
+    return df.drop(columns=ROW_COLUMN)
+
+
+def competition_sources(index, mapping):
+    """
+    Group the competition sources of a fixture shard index by Sorare competition.
+
+    Costs one mapping lookup per source, however many fixtures they hold.
+
+    Args:
+        index: Fixture shard index (see `load_fixture_shard_index`)
+        mapping: Competition mappings (see competitions.load_competition_mapping)
+
+    Returns:
+        Dictionary of Sorare competition -> list of its source entries
+    """
+    sources = pd.DataFrame({
+        "Comp_Slug": [source["slug"] for source in index["sources"]],
+        COMPETITION_NAME_COLUMN: [source["name"] for source in index["sources"]]
+    })
+    groups = apply_competition_mapping(sources, mapping)["Sorare_Competition"]
+
+    grouped = {}
+    for source, group in zip(index["sources"], groups):
+        grouped.setdefault(group, []).append(source)
+    return grouped
+
+
+@track_cache(st.cache_resource(max_entries=2))
+def load_fixture_shard_index(file_path, version=None):
+    """
+    Shard the fixture data by competition source, or reuse existing shards.
+
+    Only the first load of a file version parses the whole file; later loads,
+    including from other processes, read the index written next to the shards.
+
+    Args:
+        file_path: Path to the fixture CSV file
+        version: Version of the file (see data_refresh.file_version)
+
+    Returns:
+        Dictionary with the shard "directory", the "sources" (each with its
+        competition "slug" and "name", shard "file", "rows" and the "clubs"
+        playing in it) and the "leagues" of the clubs: the slug most of each
+        club's fixtures have
+    """
+    directory, prefix = _shard_dir(file_path, version)
+    index = _read_index(directory)
+    if index is None:
+        df = load_fixture_data(file_path, version)
+        df = df.assign(**{ROW_COLUMN: np.arange(len(df))})
+        keys = ["Comp_Slug", COMPETITION_NAME_COLUMN]
+
+        shards, sources = {}, []
+        for (slug, name), shard in df.groupby(keys, sort=True, observed=True, dropna=False):
+            slug, name = (None if pd.isna(part) else str(part) for part in (slug, name))
+            file_name = f"{quote(slug or '', safe='')}~{quote(name or '', safe='')}.arrow"
+            shards[file_name] = shard
+            sources.append({
+                "slug": slug,
+                "name": name,
+                "file": file_name,
+                "rows": len(shard),
+                "clubs": sorted(shard["Name"].dropna().unique())
+            })
+
+        fixture_counts = df.groupby(["Name", "Comp_Slug"], observed=True).size().sort_values(ascending=False, kind="stable")
+        leagues = fixture_counts.reset_index().drop_duplicates("Name")
+
+        _write_shards(directory, prefix, shards, {
+            "sources": sources,
+            "leagues": dict(zip(leagues["Name"], leagues["Comp_Slug"].astype(str)))
+        })
+        index = _read_index(directory)
+    return {**index, "directory": str(directory)}
+
+
+@track_cache(st.cache_resource(max_entries=SHARD_CACHE_ENTRIES, ttl=SHARD_CACHE_TTL))
+def load_fixture_shard(file_path, version, sorare_competition, mapping_path=COMPETITION_MAPPING_PATH,
+                       mapping_version=None):
+    """
+    Materialize the fixture data of one Sorare competition.
+
+    Cached per competition and shared across sessions by reference, so
+    callers must treat it as read-only.
+
+    Args:
+        file_path: Path to the fixture CSV file
+        version: Version of the file (see data_refresh.file_version)
+        sorare_competition: Sorare competition to load
+        mapping_path: Path to the competition mapping file
+        mapping_version: Version of the mapping file
+
+    Returns:
+        Prepared fixture DataFrame with the columns of data.load_fixture_data,
+        its competitions mapped with the given mapping version
+    """
+    index = load_fixture_shard_index(file_path, version)
+    mapping = load_competition_mapping(mapping_path, mapping_version)
+    # Empty if no source maps to the competition any more, e.g. after the
+    # mappings were edited while a session kept its selection
+    sources = competition_sources(index, mapping).get(sorare_competition, [])
+    return apply_competition_mapping(_read_shards(index, [source["file"] for source in sources]), mapping)
+
+
+@track_cache(st.cache_resource(max_entries=2))
+def load_player_shard_index(player_path, player_version, file_path, version):
+    """
+    Shard the player data by the league of each player's club.
+
+    Leagues come from the fixture shard index, so player shards are keyed by
+    both file versions. A Sorare competition reads the leagues of the clubs
+    playing in it, so a club playing in several Sorare competitions (e.g. a
+    domestic league and the UEFA competitions) is read by each of them.
+
+    Args:
+        player_path: Path to the player CSV file
+        player_version: Version of the player file
+        file_path: Path to the fixture CSV file
+        version: Version of the fixture file
+
+    Returns:
+        Dictionary with the shard "directory" and the "leagues" with their
+        shard file and row count
+    """
+    from src.player_data import load_player_data
+
+    fixture_index = load_fixture_shard_index(file_path, version)
+    directory, prefix = _shard_dir(player_path, player_version, version)
+    index = _read_index(directory)
+    if index is None:
+        players = load_player_data(player_path, player_version)
+        players = players.assign(**{ROW_COLUMN: np.arange(len(players))})
+        leagues = players["Club"].map(fixture_index["leagues"])
+
+        shards, league_files = {}, {}
+        for league, shard in players.groupby(leagues, sort=True):
+            file_name = f"{quote(league, safe='')}.arrow"
+            shards[file_name] = shard
+            league_files[league] = {"file": file_name, "rows": len(shard)}
+
+        _write_shards(directory, prefix, shards, {"leagues": league_files})
+        index = _read_index(directory)
+    return {**index, "directory": str(directory)}
+
+
+@track_cache(st.cache_resource(max_entries=SHARD_CACHE_ENTRIES, ttl=SHARD_CACHE_TTL))
+def load_player_shard(player_path, player_version, file_path, version, sorare_competition,
+                      mapping_path=COMPETITION_MAPPING_PATH, mapping_version=None):
+    """
+    Materialize the players of the clubs in one Sorare competition.
+
+    Cached per competition and shared across sessions by reference, so
+    callers must treat it as read-only.
+
+    Args:
+        player_path: Path to the player CSV file
+        player_version: Version of the player file
+        file_path: Path to the fixture CSV file
+        version: Version of the fixture file
+        sorare_competition: Sorare competition to load
+        mapping_path: Path to the competition mapping file
+        mapping_version: Version of the mapping file
+
+    Returns:
+        Player DataFrame with the columns of player_data.load_player_data
+    """
+    fixture_index = load_fixture_shard_index(file_path, version)
+    index = load_player_shard_index(player_path, player_version, file_path, version)
+    mapping = load_competition_mapping(mapping_path, mapping_version)
+
+    # No clubs if no source maps to the competition any more (see load_fixture_shard)
+    sources = competition_sources(fixture_index, mapping).get(sorare_competition, [])
+    clubs = {club for source in sources for club in source["clubs"]}
+    leagues = sorted({fixture_index["leagues"][club] for club in clubs} & set(index["leagues"]))
+    players = _read_shards(index, [index["leagues"][league]["file"] for league in leagues])
+    return players[players["Club"].isin(clubs)].reset_index(drop=True)
+
+
+def _warm_default_shards(file_path, version, player_path, player_version):
+    """
+    Load the shards of the Sorare competition a session starts with.
+
+    Called with the same arguments as the dashboard, under the published
+    mapping file version, so they are the entries its first session reads.
+    """
+    mapping_version = get_data_version(COMPETITION_MAPPING_PATH)
+    mapping = load_competition_mapping(COMPETITION_MAPPING_PATH, mapping_version)
+    sorare_competitions = sorted(competition_sources(load_fixture_shard_index(file_path, version), mapping))
+    if not sorare_competitions:
+        return
+
+    sorare_competition = default_sorare_competition(sorare_competitions)
+    load_fixture_shard(file_path, version, sorare_competition, mapping_version=mapping_version)
+    if player_version is not None:
+        load_player_shard(
+            player_path, player_version, file_path, version, sorare_competition, mapping_version=mapping_version
+        )
+
+
+def refresh_fixture_shards(file_path, version, player_path=PLAYER_DATA_PATH):
+    """
+    Warm the shards sessions read for a new fixture file version.
+
+    Used as the data watcher's loader (see src.data_refresh): loads the
+    fixture shard index, the player shard index of the published player
+    file version and the default Sorare competition's fixture and player
+    shards, so the first session after the refresh hits the cache. The
+    views computed from the shards are still built by that session.
+    """
+    load_fixture_shard_index(file_path, version)
+    player_version = get_data_version(player_path)
+    if player_version is not None:
+        load_player_shard_index(player_path, player_version, file_path, version)
+    _warm_default_shards(file_path, version, player_path, player_version)
+
+
+def refresh_player_shards(player_path, player_version, file_path=DATA_PATH):
+    """
+    Warm the player shards sessions read for a new player file version.
+
+    Used as the data watcher's loader, against the published fixture file
+    version (see `refresh_fixture_shards`).
+    """
+    version = get_data_version(file_path)
+    load_player_shard_index(player_path, player_version, file_path, version)
+    _warm_default_shards(file_path, version, player_path, player_version)
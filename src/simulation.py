@@ -0,0 +1,177 @@
+"""
+Monte Carlo simulation of player and lineup scores for a gameweek.
+
+Each player's score in a game is drawn from a normal distribution around
+their recent form (a blend of the L5 and L15 averages) scaled by the fixture
+difficulty, and clipped to the 0-100 score range. Form that differs between
+L5 and L15 widens the spread, and a player only scores in a game with the
+probability implied by their recent minutes. Players with several fixtures
+in the gameweek score in each of them.
+
+Trials are drawn as (players x games x trials) arrays, never one trial at a
+time. Large pools are split into chunks with their own random streams, so
+results for a seed do not depend on how many workers run the chunks.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    DIFFICULTY_CENTER,
+    SIMULATION_FORM_WEIGHT,
+    SIMULATION_SCORE_CV,
+    SIMULATION_SEED,
+    SIMULATION_TRIALS
+)
+
+MAX_SCORE = 100
+MINUTES_PER_GAME = 90
+
+# Players per chunk (and per random stream); fixed so results only depend on the seed
+CHUNK_SIZE = 64
+
+
+def build_score_model(players, fixtures=None):
+    """
+    Score distribution parameters for each player.
+
+    Args:
+        players: Player DataFrame with L5/L15 score averages and minutes, and
+            the Dynamic_Fixture_Difficulty of the simulated gameweek (see
+            player_data.calculate_dynamic_fixture_difficulty)
+        fixtures: Optional fixtures of the simulated gameweek, used to count
+            each player's games (none for clubs without a fixture); defaults
+            to one game each
+
+    Returns:
+        DataFrame aligned with `players` with the mean and sd of a game
+        score, the probability of playing a game and the number of games
+    """
+    l5 = players["Last_5_Score_Running_Avg"]
+    l15 = players["Last_15_Score_Running_Avg"]
+    form = (SIMULATION_FORM_WEIGHT * l5 + (1 - SIMULATION_FORM_WEIGHT) * l15).fillna(l15).fillna(l5).fillna(0)
+
+    # Opponents conceding more than the neutral score raise the expected score
+    fixture = (players["Dynamic_Fixture_Difficulty"] / DIFFICULTY_CENTER).fillna(1)
+    mean = form * fixture
+
+    sd = np.sqrt((SIMULATION_SCORE_CV * mean) ** 2 + (l5 - l15).fillna(0) ** 2)
+
+    play = (players["Last_5_Mins_Played_Running_Sum"] / (5 * MINUTES_PER_GAME)).clip(0, 1).fillna(1)
+
+    games = 1
+    if fixtures is not None:
+        counts = fixtures.groupby(["Name", "Position"]).size()
+        games = pd.Series(
+            pd.MultiIndex.from_frame(players[["Club", "Position"]]).map(counts).fillna(0).astype(int),
+            index=players.index
+        )
+
+    return pd.DataFrame({
+        "mean": mean,
+        "sd": sd,
+        "play": play,
+        "games": games
+    }, index=players.index)
+
+
+def _draw_scores(model, n_trials, rng):
+    """
+    Draw gameweek scores for every player in the model.
+
+    Returns:
+        Array of shape (players, n_trials)
+    """
+    mean = model["mean"].to_numpy(dtype=float)
+    sd = model["sd"].to_numpy(dtype=float)
+    play = model["play"].to_numpy(dtype=float)
+    games = model["games"].to_numpy(dtype=int)
+    max_games = max(int(games.max(initial=0)), 1)
+
+    # Trials last so each player's trials are contiguous for the percentiles;
+    # single precision halves the memory traffic and scores need no more
+    shape = (len(mean), max_games, n_trials)
+    scores = rng.standard_normal(shape, dtype=np.float32)
+    scores *= sd[:, None, None].astype(np.float32)
+    scores += mean[:, None, None].astype(np.float32)
+    np.clip(scores, 0, MAX_SCORE, out=scores)
+    scores *= rng.random(shape, dtype=np.float32) < play[:, None, None]
+    scores *= (np.arange(max_games) < games[:, None])[:, :, None]
+    return scores.sum(axis=1)
+
+
+def _summarize(totals, threshold):
+    """Expected score, downside percentiles and probability of reaching `threshold` per row."""
+    p10, p25 = np.percentile(totals, [10, 25], axis=1)
+    return {
+        "expected": totals.mean(axis=1, dtype=np.float64),
+        "p10": p10,
+        "p25": p25,
+        "prob_threshold": (totals >= threshold).mean(axis=1)
+    }
+
+
+def simulate_players(model, threshold, n_trials=SIMULATION_TRIALS, seed=SIMULATION_SEED, workers=None):
+    """
+    Simulate gameweek scores for every player.
+
+    Args:
+        model: Output of build_score_model
+        threshold: Score to beat
+        n_trials: Number of simulated gameweeks
+        seed: Random seed
+        workers: Threads running the chunks (defaults to the CPU count);
+            NumPy releases the GIL while drawing, so chunks run in parallel
+
+    Returns:
+        DataFrame aligned with `model` with expected, p10, p25 and
+        prob_threshold columns
+    """
+    chunks = [model.iloc[start:start + CHUNK_SIZE] for start in range(0, len(model), CHUNK_SIZE)]
+    streams = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    def run(chunk, stream):
+        return _summarize(_draw_scores(chunk, n_trials, np.random.default_rng(stream)), threshold)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        results = list(executor.map(run, chunks, streams))
+
+    if not results:
+        return pd.DataFrame(columns=["expected", "p10", "p25", "prob_threshold"], index=model.index)
+
+    return pd.DataFrame({
+        column: np.concatenate([result[column] for result in results])
+        for column in results[0]
+    }, index=model.index)
+
+
+def simulate_lineups(model, lineups, threshold, n_trials=SIMULATION_TRIALS, seed=SIMULATION_SEED):
+    """
+    Simulate the total gameweek score of each lineup.
+
+    All lineups are drawn in one batch, with independent draws per lineup.
+
+    Args:
+        model: Output of build_score_model
+        lineups: List of lineups, each a list of `model` index labels
+        threshold: Total score to beat
+        n_trials: Number of simulated gameweeks
+        seed: Random seed
+
+    Returns:
+        DataFrame with one row per lineup and expected, p10, p25 and
+        prob_threshold columns
+    """
+    if not lineups:
+        return pd.DataFrame(columns=["expected", "p10", "p25", "prob_threshold"])
+
+    sizes = [len(lineup) for lineup in lineups]
+    slots = model.loc[[player for lineup in lineups for player in lineup]]
+    scores = _draw_scores(slots, n_trials, np.random.default_rng(seed))
+
+    # Sum each lineup's rows: (slots, trials) -> (lineups, trials)
+    totals = np.add.reduceat(scores, np.cumsum([0] + sizes[:-1]), axis=0)
+    return pd.DataFrame(_summarize(totals, threshold))